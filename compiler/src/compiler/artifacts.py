@@ -0,0 +1,73 @@
+import os
+from typing import Any, Callable
+
+from compiler import serialization
+from compiler.errors import ArtifactError, SerializationError
+from compiler.writer import write_file
+
+# Stages with an output worth persisting, the earlier ones produce lazy streams
+ARTIFACT_STAGES = ('parser', 'semantic_analyzer', 'inter_code_gen', 'code_gen')
+ARTIFACT_SUFFIX = '.artifact'
+ARTIFACT_MAGIC = b'ECOTEART'
+ARTIFACT_FORMAT_VERSION = 2
+
+
+def dump_artifact(stage: str, value: Any) -> bytes:
+    """
+    Serializes the output of a pipeline stage.
+
+    The artifact starts with a header naming its format version and the stage it
+    comes from, followed by the stage output in the format of `compiler.serialization`.
+    """
+    if stage not in ARTIFACT_STAGES:
+        raise ArtifactError(f'Stage {stage} has no artifact, expected one of {ARTIFACT_STAGES}')
+    stage_name = stage.encode()
+    header = ARTIFACT_MAGIC + bytes([ARTIFACT_FORMAT_VERSION, len(stage_name)]) + stage_name
+    return header + serialization.dumps(value)
+
+
+def parse_artifact(data: bytes, stage: str) -> Any:
+    """
+    Deserializes an artifact, verifying that it holds the output of the expected stage.
+    """
+    offset = len(ARTIFACT_MAGIC)
+    if data[:offset] != ARTIFACT_MAGIC or len(data) < offset + 2:
+        raise ArtifactError('Not a compiler artifact')
+    version, name_length = data[offset], data[offset + 1]
+    if version != ARTIFACT_FORMAT_VERSION:
+        raise ArtifactError(f'Unsupported artifact format version: {version}')
+    offset += 2
+    found_stage = data[offset : offset + name_length].decode()
+    if found_stage != stage:
+        raise ArtifactError(f'Artifact holds the output of {found_stage}, expected {stage}')
+    try:
+        return serialization.loads(data[offset + name_length :])
+    except SerializationError as e:
+        raise ArtifactError(f'Artifact of {stage} is corrupted: {e}') from e
+
+
+def artifact_path(artifacts_dir: str, stage: str) -> str:
+    return os.path.join(artifacts_dir, stage + ARTIFACT_SUFFIX)
+
+
+def save_artifact(path: str, stage: str, value: Any) -> None:
+    write_file(path, dump_artifact(stage, value), atomic=True)
+
+
+def load_artifact(path: str, stage: str) -> Any:
+    with open(path, 'rb') as file:
+        return parse_artifact(file.read(), stage)
+
+
+def saving_artifact(stage: str, function: Callable, artifacts_dir: str) -> Callable:
+    """
+    Wraps a pipeline stage so its output is also saved to `artifacts_dir`.
+    """
+
+    def saved(x):
+        result = function(x)
+        os.makedirs(artifacts_dir, exist_ok=True)
+        save_artifact(artifact_path(artifacts_dir, stage), stage, result)
+        return result
+
+    return saved
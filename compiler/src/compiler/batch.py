@@ -0,0 +1,171 @@
+import glob
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+from compiler.default import compiler
+from compiler.models import BatchResult, BatchSummary, WriterOutput
+
+# Files picked up from the directories given as batch inputs
+BATCH_PATTERN = '*.xml'
+
+
+def has_wildcard(path: str) -> bool:
+    return any(char in path for char in '*?[')
+
+
+def is_batch_input(path: str) -> bool:
+    """
+    Checks whether the input names many files, a directory or a glob pattern, rather than a single file.
+    """
+    return os.path.isdir(path) or has_wildcard(path)
+
+
+def expand_inputs(inputs: list[str]) -> list[str]:
+    """
+    Expands directories (searched recursively for BATCH_PATTERN) and glob patterns into
+    a sorted list of files. Plain paths are kept as they are.
+    """
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            files.extend(str(file) for file in sorted(Path(path).rglob(BATCH_PATTERN)) if file.is_file())
+        elif is_batch_input(path):
+            files.extend(file for file in sorted(glob.glob(path, recursive=True)) if os.path.isfile(file))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def input_root(inputs: list[str]) -> str:
+    """
+    Returns the directory the inputs are given from, whatever files they currently match: a
+    directory itself, the directory of a file, or the directories of a glob pattern before its
+    first wildcard, e.g. `corpus` for `corpus/**/*.xml`.
+    """
+    roots = []
+    for path in inputs:
+        if os.path.isdir(path):
+            roots.append(path)
+        elif is_batch_input(path):
+            parts = Path(path).parts
+            fixed = next(i for i, part in enumerate(parts) if has_wildcard(part))
+            roots.append(os.path.join(*parts[:fixed]) if fixed else os.curdir)
+        else:
+            roots.append(os.path.dirname(path) or os.curdir)
+    return os.path.commonpath([os.path.abspath(root) for root in roots])
+
+
+def output_dirs(files: list[str], output_dir: str, root: str | None = None) -> dict[str, str]:
+    """
+    Assigns every file its own output directory, mirroring the layout of the inputs
+    below `root`, by default their common directory, e.g. `animals/cats.xml` is compiled
+    to `<output_dir>/animals/cats`.
+
+    Raises:
+        ValueError: When two files would be compiled into the same directory, e.g. `a.xml` and `a.json`.
+    """
+    if not files:
+        return {}
+    absolute = [os.path.abspath(file) for file in files]
+    if root is None:
+        root = os.path.commonpath([os.path.dirname(file) for file in absolute])
+    else:
+        root = os.path.abspath(root)
+    destinations = {}
+    inputs_by_destination = {}
+    for file, path in zip(files, absolute):
+        destination = os.path.join(output_dir, os.path.splitext(os.path.relpath(path, root))[0])
+        if destination in inputs_by_destination:
+            raise ValueError(
+                f'{inputs_by_destination[destination]} and {file} would both be compiled into {destination}'
+            )
+        inputs_by_destination[destination] = file
+        destinations[file] = destination
+    return destinations
+
+
+def compile_file(input_file: str, output_dir: str, options: dict) -> BatchResult:
+    """
+    Compiles a single file of the batch, reporting the error instead of raising it.
+    """
+    start = time.perf_counter()
+    try:
+        output = compiler(input_file, output_dir, raise_errors=True, **options)
+    except Exception as e:
+        return BatchResult(
+            input_file, output_dir, error=f'{type(e).__name__} - {e}', duration=time.perf_counter() - start
+        )
+    if not isinstance(output, WriterOutput):
+        # Results of the earlier stages are not sent back from the worker processes
+        output = None
+    return BatchResult(input_file, output_dir, output, duration=time.perf_counter() - start)
+
+
+def batch_compiler(
+    inputs: list[str],
+    output_dir: str,
+    max_func: str = 'writer',
+    jobs: int = 1,
+    on_result: Callable[[BatchResult], None] | None = None,
+    **compiler_options,
+) -> BatchSummary:
+    """
+    Compiles many XML files, each into its own directory below `output_dir`.
+
+    Args:
+        inputs (list[str]): Files, directories and glob patterns to compile.
+        output_dir (str): The directory holding the output directories of all files.
+        max_func (str): The last stage to run.
+        jobs (int): Number of worker processes, files are compiled in this process when 1.
+        on_result (Callable): Called with the result of every file as soon as it is compiled.
+        compiler_options: Options of `compiler.default.compiler`.
+
+    Returns:
+        BatchSummary: Results of all files, in order of completion.
+    """
+    if jobs < 1:
+        raise ValueError(f'Number of jobs must be positive, got {jobs}')
+    if compiler_options.get('start_from') is not None:
+        raise ValueError('Batch compilation cannot start from saved artifacts')
+    if jobs > 1 and compiler_options.get('schema_lock') is not None:
+        raise ValueError('Concurrent batch compilation cannot share a schema lock, compile a project instead')
+    if compiler_options.get('sink', 'filesystem') != 'filesystem':
+        # Every file gets its own output directory, archives and memory would lose them
+        raise ValueError('Batch compilation only writes to the filesystem sink')
+
+    start = time.perf_counter()
+    destinations = output_dirs(expand_inputs(inputs), output_dir)
+    artifacts_dir = compiler_options.pop('artifacts_dir', None)
+
+    def options_for(input_file: str) -> dict:
+        options = dict(compiler_options, max_func=max_func)
+        if artifacts_dir is not None:
+            relative_dir = os.path.relpath(destinations[input_file], output_dir)
+            options['artifacts_dir'] = os.path.join(artifacts_dir, relative_dir)
+        return options
+
+    summary = BatchSummary()
+
+    def report(result: BatchResult) -> None:
+        summary.results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    if jobs == 1:
+        for input_file, destination in destinations.items():
+            report(compile_file(input_file, destination, options_for(input_file)))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(compile_file, input_file, destination, options_for(input_file))
+                for input_file, destination in destinations.items()
+            ]
+            for future in as_completed(futures):
+                report(future.result())
+
+    summary.duration = time.perf_counter() - start
+    return summary
@@ -0,0 +1,44 @@
+import argparse
+import json
+
+from compiler.benchmarks.generator import SHAPES
+from compiler.benchmarks.suite import BENCHMARKS, DEFAULT_REPEAT, compare_reports, run_suite
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(
+        prog='python -m compiler.benchmarks', description='Benchmarks the stages of the compiler on synthetic documents'
+    )
+    arguments.add_argument('--shape', action='append', choices=list(SHAPES), help='Shapes to run, all by default')
+    arguments.add_argument('--benchmark', action='append', choices=BENCHMARKS, help='Benchmarks to run, all by default')
+    arguments.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Runs of every benchmark')
+    arguments.add_argument('--label', help='Name of the results, e.g. the commit they were run on')
+    arguments.add_argument('--output', help='JSON file to write the results to')
+    arguments.add_argument('--compare', help='JSON results of an earlier run to compare the median times with')
+    options = arguments.parse_args()
+
+    shapes = {name: SHAPES[name] for name in options.shape or SHAPES}
+    report = run_suite(shapes, tuple(options.benchmark or BENCHMARKS), options.repeat, options.label)
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if options.compare:
+        with open(options.compare) as file:
+            baseline = json.load(file)
+        print(f'{"benchmark":<20}{"shape":<18}{"baseline":>12}{"median":>12}{"ratio":>8}')
+        for row in compare_reports(baseline, report):
+            print(
+                f'{row["benchmark"]:<20}{row["shape"]:<18}{row["baseline"]:>12.6f}{row["median"]:>12.6f}'
+                f'{row["ratio"]:>8.2f}'
+            )
+        return
+    print(f'{"benchmark":<20}{"shape":<18}{"size":>10}{"best":>12}{"median":>12}')
+    for row in report['results']:
+        print(
+            f'{row["benchmark"]:<20}{row["shape"]:<18}{row["input_size"]:>10}{row["best"]:>12.6f}{row["median"]:>12.6f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+import glob
+import os
+import random
+import time
+from dataclasses import replace
+from typing import Callable, Iterable
+
+from compiler.benchmarks.generator import SHAPES, generate_document
+from compiler.benchmarks.models import DocumentShape
+from compiler.code_gen import code_gen
+from compiler.incremental_parser import IncrementalParser, parse_with_offsets
+from compiler.inter_code_gen import inter_code_gen
+from compiler.models import BaseToken, SemanticAnalyzerOutput, TransitionCounters, XmlElement
+from compiler.parser import parser
+from compiler.scanner import scanner, scanner_with_offsets
+from compiler.semantic_analyzer import project_semantic_analyzer, semantic_analyzer
+
+# Alternative engines of every stage, next to the reference ones. Every combination
+# of a scanner and a parser is a front end, and the fused front ends parse the text
+# directly. Every front end is combined with every semantic analyzer.
+SCANNERS: dict[str, Callable[[str], Iterable[BaseToken]]] = {
+    'reference': scanner,
+    'offsets': lambda text: (token for token, _ in scanner_with_offsets(text)),
+    'counting': lambda text: scanner(text, counters=TransitionCounters()),
+}
+PARSERS: dict[str, Callable[[Iterable[BaseToken]], XmlElement]] = {
+    'reference': parser,
+    'counting': lambda tokens: parser(tokens, counters=TransitionCounters()),
+}
+FUSED_FRONT_ENDS: dict[str, Callable[[str], XmlElement]] = {
+    'offsets': lambda text: parse_with_offsets(text)[0],
+    'incremental': lambda text: IncrementalParser().parse(text),
+}
+SEMANTIC_ANALYZERS: dict[str, Callable[[XmlElement], SemanticAnalyzerOutput]] = {
+    'reference': semantic_analyzer,
+    'project': lambda ast: project_semantic_analyzer([ast])[0],
+}
+REFERENCE_ENGINE = 'reference+reference/reference'
+
+# Characters inserted by the mutations, the ones the grammar gives a meaning to
+MUTATION_CHARACTERS = '<>/="a1 \n'
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'examples')
+
+
+def front_ends() -> dict[str, Callable[[str], XmlElement]]:
+    engines = {
+        f'{scanner_name}+{parser_name}': (lambda text, scan=scan, parse=parse: parse(scan(text)))
+        for scanner_name, scan in SCANNERS.items()
+        for parser_name, parse in PARSERS.items()
+    }
+    engines.update(FUSED_FRONT_ENDS)
+    return engines
+
+
+def engines() -> dict[str, Callable[[str], dict[str, str]]]:
+    """
+    Every combination of the engines, named `<front end>/<semantic analyzer>`, each
+    compiling a text into the files generated from it.
+    """
+
+    def engine(front_end, analyze):
+        return lambda text: code_gen(inter_code_gen(analyze(front_end(text))))
+
+    return {
+        f'{front_end_name}/{analyzer_name}': engine(front_end, analyze)
+        for front_end_name, front_end in front_ends().items()
+        for analyzer_name, analyze in SEMANTIC_ANALYZERS.items()
+    }
+
+
+def run_engine(engine: Callable[[str], dict[str, str]], text: str) -> dict[str, str] | str:
+    """
+    Returns:
+        dict[str, str] | str: The generated files, or the name of the error class raised.
+    """
+    try:
+        return engine(text)
+    except Exception as e:
+        return type(e).__name__
+
+
+def mutations(text: str, count: int, seed: int = 0) -> list[str]:
+    """
+    Edits the text at random, always the same way for the same seed: inserts, deletes
+    or duplicates a few characters. Most of the mutations are invalid documents.
+    """
+    generator = random.Random(seed)
+    mutated = []
+    for _ in range(count):
+        position = generator.randrange(len(text) + 1)
+        edit = generator.randrange(3)
+        if edit == 0:
+            mutated.append(text[:position] + generator.choice(MUTATION_CHARACTERS) + text[position:])
+        elif edit == 1:
+            mutated.append(text[:position] + text[position + 1 :])
+        else:
+            end = min(len(text), position + generator.randint(1, 20))
+            mutated.append(text[:end] + text[position:end] + text[end:])
+    return mutated
+
+
+def small_shape(shape: DocumentShape) -> DocumentShape:
+    """
+    A small document of the shape, still stressing the same dimension a little.
+    """
+    return replace(
+        shape,
+        children=min(shape.children, 12),
+        depth=min(shape.depth, 4),
+        attributes=min(shape.attributes, 12),
+        types=min(shape.types, 8),
+        string_length=min(shape.string_length, 40),
+        list_size=min(shape.list_size, 4),
+    )
+
+
+def corpus(mutations_per_document: int = 10, seed: int = 0) -> dict[str, str]:
+    """
+    The documents of the examples directory, small documents of every generated
+    shape, and mutations of all of them.
+    """
+    documents = {}
+    for path in sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.xml'))):
+        with open(path) as file:
+            documents[os.path.basename(path)] = file.read()
+    for shape_name, shape in SHAPES.items():
+        documents[shape_name] = generate_document(small_shape(shape), seed=seed)
+    for name, text in list(documents.items()):
+        for index, mutated in enumerate(mutations(text, mutations_per_document, seed)):
+            documents[f'{name}~{index}'] = mutated
+    return documents
+
+
+def differences(documents: dict[str, str]) -> list[str]:
+    """
+    Runs every engine on every document.
+
+    Returns:
+        list[str]: A description of every document on which an engine produced other
+        files, or raised another error class, than the reference engine.
+    """
+    all_engines = engines()
+    reference = all_engines.pop(REFERENCE_ENGINE)
+    found = []
+    for name, text in documents.items():
+        expected = run_engine(reference, text)
+        for engine_name, engine in all_engines.items():
+            output = run_engine(engine, text)
+            if output != expected:
+                got = output if isinstance(output, str) else 'other files'
+                wanted = expected if isinstance(expected, str) else 'other files'
+                found.append(f'{engine_name} on {name}: {got} instead of {wanted}')
+    return found
+
+
+def throughput(documents: dict[str, str], repeat: int = 3) -> dict[str, float]:
+    """
+    Measures every engine on the documents that compile.
+
+    Returns:
+        dict[str, float]: Characters compiled per second by every engine, the best of `repeat` runs.
+    """
+    all_engines = engines()
+    valid = [
+        text for text in documents.values() if not isinstance(run_engine(all_engines[REFERENCE_ENGINE], text), str)
+    ]
+    size = sum(len(text) for text in valid)
+    results = {}
+    for engine_name, engine in all_engines.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for text in valid:
+                engine(text)
+            best = min(best, time.perf_counter() - start)
+        results[engine_name] = size / best
+    return results
+
+
+def main() -> None:
+    documents = corpus()
+    found = differences(documents)
+    print(f'{len(documents)} documents, {len(engines())} engines, {len(found)} differences')
+    for difference in found:
+        print(difference)
+    results = throughput(documents)
+    reference = results[REFERENCE_ENGINE]
+    print(f'{"engine":<36}{"chars/s":>14}{"relative":>10}')
+    for engine_name, chars_per_second in sorted(results.items(), key=lambda item: -item[1]):
+        print(f'{engine_name:<36}{chars_per_second:>14,.0f}{chars_per_second / reference:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
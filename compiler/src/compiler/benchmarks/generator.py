@@ -0,0 +1,96 @@
+import random
+import string
+from dataclasses import replace
+
+from compiler.benchmarks.models import DocumentShape
+
+# Characters of the generated attribute values, quotes and newlines are not allowed in strings
+VALUE_CHARACTERS = string.ascii_letters + string.digits + ' '
+# Attribute node holding the nested declaration of a declaration
+NESTED_NAME = 'inner'
+# Deeper declarations are not indented further, so the size of a document stays linear in its depth
+MAX_INDENT = 16
+
+# Documents stressing one dimension of the input each
+SHAPES = {
+    'default': DocumentShape(),
+    'wide': DocumentShape(children=2000, depth=1, attributes=2, types=4),
+    'deep': DocumentShape(children=10, depth=100, attributes=2, types=4),
+    'many_types': DocumentShape(children=500, attributes=2, types=250),
+    'long_strings': DocumentShape(children=100, attributes=4, types=2, string_length=2000),
+    'many_attributes': DocumentShape(children=100, attributes=200, types=2),
+    'lists': DocumentShape(children=100, types=4, list_size=20),
+}
+
+
+class DocumentGenerator:
+    """
+    Generates valid XML input of a given shape, always the same one for the same shape.
+
+    Every type has its own attribute names, so the generated types never merge. A
+    declaration nested in a declaration of type `t` has type `t + 1`, and the elements
+    are named after their position, so every name is unique.
+    """
+
+    def __init__(self, shape: DocumentShape) -> None:
+        if shape.types < 1:
+            raise ValueError(f'Documents need at least one type, got {shape.types}')
+        if shape.depth < 1:
+            raise ValueError(f'Depth must be positive, got {shape.depth}')
+        self.shape = shape
+        self.random = random.Random(shape.seed)
+        self.elements = 0
+        self.lines: list[str] = []
+
+    def value(self) -> str:
+        return ''.join(self.random.choices(VALUE_CHARACTERS, k=self.shape.string_length))
+
+    def name(self, prefix: str) -> str:
+        self.elements += 1
+        return f'{prefix}{self.elements}'
+
+    def declaration(self, type_index: int, depth: int, indent: str) -> None:
+        attributes = ' '.join(
+            f'T{type_index}_A{attribute}="{self.value()}"' for attribute in range(self.shape.attributes)
+        )
+        name = self.name('e')
+        if depth == 1:
+            self.lines.append(f'{indent}<{name} {attributes}/>')
+            return
+        self.lines.append(f'{indent}<{name} {attributes}>')
+        self.lines.append(f'{indent}  <{NESTED_NAME}>')
+        self.declaration((type_index + 1) % self.shape.types, depth - 1, (indent + '    ')[:MAX_INDENT])
+        self.lines.append(f'{indent}  </{NESTED_NAME}>')
+        self.lines.append(f'{indent}</{name}>')
+
+    def generate(self) -> str:
+        self.random.seed(self.shape.seed)
+        self.elements = 0
+        self.lines = ['<root>']
+        for child in range(self.shape.children):
+            type_index = child % self.shape.types
+            if self.shape.list_size and child % 2:
+                name = self.name('list')
+                self.lines.append(f'  <{name}>')
+                for _ in range(self.shape.list_size):
+                    self.declaration(type_index, self.shape.depth, '    ')
+                self.lines.append(f'  </{name}>')
+            else:
+                self.declaration(type_index, self.shape.depth, '  ')
+        self.lines.append('</root>')
+        return '\n'.join(self.lines) + '\n'
+
+
+def generate_document(shape: DocumentShape | None = None, **knobs) -> str:
+    """
+    Generates a synthetic document, e.g. `generate_document(children=1000, depth=3)`.
+
+    Args:
+        shape (DocumentShape | None): The shape of the document, the default one when not given.
+        knobs: Fields of DocumentShape overriding the ones of `shape`.
+
+    Returns:
+        str: The XML document.
+    """
+    shape = replace(shape or DocumentShape(), **knobs)
+    return DocumentGenerator(shape).generate()
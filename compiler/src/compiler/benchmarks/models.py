@@ -0,0 +1,65 @@
+import math
+import statistics
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class DocumentShape:
+    """
+    Knobs of the synthetic documents generated by `compiler.benchmarks.generator`
+    """
+
+    # Children of the root, a list counts as a single child
+    children: int = 100
+    # Declarations nested in every child of the root, through attribute nodes
+    depth: int = 1
+    attributes: int = 3
+    types: int = 5
+    string_length: int = 8
+    # Declarations in every list, 0 for no lists. Every other child of the root is a list
+    list_size: int = 0
+    seed: int = 0
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timings of repeated runs of a benchmark on a single document
+    """
+
+    benchmark: str
+    shape: str
+    # Characters of the document
+    input_size: int
+    times: list[float] = field(default_factory=list)
+
+    @property
+    def best(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+
+@dataclass
+class ScalingResult:
+    """
+    Times of a stage on documents of a shape growing in size, see `compiler.benchmarks.scaling`
+    """
+
+    shape: str
+    stage: str
+    # Characters of every document
+    sizes: list[int] = field(default_factory=list)
+    times: list[float] = field(default_factory=list)
+
+    @property
+    def exponent(self) -> float:
+        """
+        The growth exponent k of the best fit of time ~ size^k, 1 for linear and 2 for quadratic stages.
+        """
+        xs = [math.log(size) for size in self.sizes]
+        ys = [math.log(time) for time in self.times]
+        x_mean, y_mean = statistics.fmean(xs), statistics.fmean(ys)
+        return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sum((x - x_mean) ** 2 for x in xs)
@@ -0,0 +1,84 @@
+import tempfile
+from dataclasses import replace
+
+from compiler.benchmarks.generator import generate_document
+from compiler.benchmarks.models import DocumentShape, ScalingResult
+from compiler.benchmarks.suite import STAGE_BENCHMARKS, benchmark_document
+
+# Smallest document of every shape, and the knobs doubled to double its size
+SCALING_SHAPES: dict[str, tuple[DocumentShape, tuple[str, ...]]] = {
+    'wide': (DocumentShape(children=250, attributes=2, types=4), ('children',)),
+    'deep': (DocumentShape(children=4, depth=25, attributes=2, types=4), ('depth',)),
+    'many_types': (DocumentShape(children=60, attributes=2, types=60), ('children', 'types')),
+    'long_strings': (DocumentShape(children=20, attributes=2, types=2, string_length=250), ('string_length',)),
+    'many_attributes': (DocumentShape(children=20, attributes=25, types=2), ('attributes',)),
+}
+# The time of the writer depends on the file system far more than on the size of its input
+SCALING_STAGES = tuple(stage for stage in STAGE_BENCHMARKS if stage != 'writer')
+DEFAULT_STEPS = 4
+DEFAULT_REPEAT = 3
+# Stages are expected to be linear, the measurements being noisy leave some margin
+DEFAULT_MAX_EXPONENT = 1.4
+# Known superlinear stages, bounded by their measured exponent plus a margin
+MAX_EXPONENTS = {
+    # Every element name is looked up in the list of all the names found before it, about 1.6
+    ('wide', 'semantic_analyzer'): 1.8,
+    # Every element is also compared with all the types found before it, about 1.7
+    ('many_types', 'semantic_analyzer'): 1.9,
+}
+
+
+def scaled_shape(shape: DocumentShape, knobs: tuple[str, ...], factor: int) -> DocumentShape:
+    return replace(shape, **{knob: getattr(shape, knob) * factor for knob in knobs})
+
+
+def measure_scaling(
+    shape_name: str,
+    steps: int = DEFAULT_STEPS,
+    repeat: int = DEFAULT_REPEAT,
+    stages: tuple[str, ...] = SCALING_STAGES,
+) -> list[ScalingResult]:
+    """
+    Times the stages on documents of the shape doubling in size `steps` times.
+
+    Returns:
+        list[ScalingResult]: One result per stage, with the best time of every size.
+    """
+    shape, knobs = SCALING_SHAPES[shape_name]
+    results = {stage: ScalingResult(shape_name, stage) for stage in stages}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for step in range(steps):
+            text = generate_document(scaled_shape(shape, knobs, 2**step))
+            for benchmark in benchmark_document(text, f'{shape_name}-{step}', stages, repeat, work_dir):
+                results[benchmark.benchmark].sizes.append(benchmark.input_size)
+                results[benchmark.benchmark].times.append(benchmark.best)
+    return list(results.values())
+
+
+def max_exponent(shape_name: str, stage: str) -> float:
+    return MAX_EXPONENTS.get((shape_name, stage), DEFAULT_MAX_EXPONENT)
+
+
+def scaling_violations(results: list[ScalingResult]) -> list[str]:
+    """
+    Returns:
+        list[str]: A description of every result growing faster than its bound allows.
+    """
+    return [
+        f'{result.stage} grows as size^{result.exponent:.2f} on {result.shape} documents, '
+        f'above the bound of {max_exponent(result.shape, result.stage)}'
+        for result in results
+        if result.exponent > max_exponent(result.shape, result.stage)
+    ]
+
+
+def main() -> None:
+    print(f'{"shape":<18}{"stage":<20}{"exponent":>10}{"bound":>8}')
+    for shape_name in SCALING_SHAPES:
+        for result in measure_scaling(shape_name):
+            bound = max_exponent(shape_name, result.stage)
+            print(f'{shape_name:<18}{result.stage:<20}{result.exponent:>10.2f}{bound:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+REPOSITORY_DIR = os.path.abspath(os.path.join(SRC_DIR, '..', '..'))
+MAIN_SCRIPT = os.path.join(REPOSITORY_DIR, 'main.py')
+STARTUP_EXAMPLE = os.path.join(REPOSITORY_DIR, 'examples', 'example1.xml')
+DEFAULT_REPEAT = 5
+# Seconds a plain compilation of a small file may take, from starting the interpreter to exiting.
+# Importing pydantic alone takes about as long, it is kept out of the plain command lines.
+STARTUP_BUDGET = 0.25
+# Modules a plain compilation must not import
+HEAVY_MODULES = (
+    'pydantic',
+    'pydantic_settings',
+    'concurrent.futures',
+    'importlib.metadata',
+    'statistics',
+    'tarfile',
+    'zipfile',
+    'cProfile',
+    'compiler.artifacts',
+    'compiler.incremental',
+    'compiler.instrumentation',
+    'compiler.profiling',
+    'compiler.project',
+    'compiler.serialization',
+    'compiler.watch',
+)
+
+# Runs main.py, then prints the names of the imported modules on the last line
+LIST_MODULES = """
+import runpy, sys
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name='__main__')
+finally:
+    print(' '.join(sorted(sys.modules)))
+"""
+
+
+def python_environment() -> dict[str, str]:
+    return dict(os.environ, PYTHONPATH=SRC_DIR)
+
+
+def startup_time(arguments: list[str] | None = None, repeat: int = DEFAULT_REPEAT) -> float:
+    """
+    Times `python main.py` in a new interpreter, by default compiling a small example.
+
+    Returns:
+        float: The median time of `repeat` runs, in seconds.
+    """
+    times = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        command = [sys.executable, MAIN_SCRIPT, *(arguments or [STARTUP_EXAMPLE, '--output_dir', work_dir])]
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(command, env=python_environment(), capture_output=True, check=True)
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def imported_modules(arguments: list[str] | None = None) -> set[str]:
+    """
+    Returns:
+        set[str]: The modules imported by `python main.py`, by default compiling a small example.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        command = [sys.executable, '-c', LIST_MODULES, MAIN_SCRIPT]
+        command += arguments or [STARTUP_EXAMPLE, '--output_dir', work_dir]
+        output = subprocess.run(command, env=python_environment(), capture_output=True, text=True, check=True)
+    return set(output.stdout.splitlines()[-1].split())
+
+
+def heavy_imports(modules: set[str]) -> list[str]:
+    return sorted(
+        module
+        for module in modules
+        if any(module == heavy or module.startswith(f'{heavy}.') for heavy in HEAVY_MODULES)
+    )
+
+
+def main() -> None:
+    median = startup_time()
+    print(f'startup {median:.3f}s, budget {STARTUP_BUDGET:.3f}s')
+    for module in heavy_imports(imported_modules()):
+        print(f'imported {module}')
+
+
+if __name__ == '__main__':
+    main()
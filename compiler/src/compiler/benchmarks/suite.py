@@ -0,0 +1,180 @@
+import gc
+import os
+import platform
+import tempfile
+import time
+from typing import Any, Callable
+
+from compiler.benchmarks.generator import SHAPES, generate_document
+from compiler.benchmarks.models import BenchmarkResult, DocumentShape
+from compiler.code_gen import code_gen
+from compiler.default import compiler
+from compiler.inter_code_gen import inter_code_gen
+from compiler.parser import parser
+from compiler.scanner import scanner
+from compiler.semantic_analyzer import semantic_analyzer
+from compiler.writer import writer
+
+STAGE_BENCHMARKS = ('scanner', 'parser', 'semantic_analyzer', 'inter_code_gen', 'code_gen', 'writer')
+END_TO_END = 'end_to_end'
+BENCHMARKS = (*STAGE_BENCHMARKS, END_TO_END)
+DEFAULT_REPEAT = 5
+
+
+def stage_inputs(text: str) -> dict[str, Any]:
+    """
+    Runs the pipeline once, and returns the input of every stage. The stages do not
+    modify their input, so it is shared by all the runs of a benchmark.
+    """
+    tokens = list(scanner(text))
+    ast = parser(tokens)
+    semantic_output = semantic_analyzer(ast)
+    intermediate_code = inter_code_gen(semantic_output)
+    return {
+        'scanner': text,
+        'parser': tokens,
+        'semantic_analyzer': ast,
+        'inter_code_gen': semantic_output,
+        'code_gen': intermediate_code,
+        'writer': code_gen(intermediate_code),
+    }
+
+
+def time_runs(function: Callable, arguments: Callable[[], tuple], repeat: int) -> list[float]:
+    """
+    Times `repeat` calls of the function, like timeit with the garbage collector
+    disabled. The arguments of every call are prepared before its timing starts.
+    """
+    times = []
+    for _ in range(repeat):
+        args = arguments()
+        gc.collect()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function(*args)
+            times.append(time.perf_counter() - start)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return times
+
+
+def benchmark_document(
+    text: str,
+    shape_name: str,
+    benchmarks: tuple[str, ...] = BENCHMARKS,
+    repeat: int = DEFAULT_REPEAT,
+    work_dir: str | None = None,
+) -> list[BenchmarkResult]:
+    """
+    Benchmarks every stage on its own, each with the output of the previous stage as
+    its input, and the whole compilation of the document from a file.
+
+    Args:
+        text (str): The document.
+        shape_name (str): Name of the document in the results.
+        benchmarks (tuple[str, ...]): Names from BENCHMARKS to run.
+        repeat (int): Runs of every benchmark.
+        work_dir (str | None): Directory for the input file and the outputs, a temporary one when not given.
+
+    Returns:
+        list[BenchmarkResult]: One result per benchmark.
+    """
+    unknown = set(benchmarks) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f'Unknown benchmarks {sorted(unknown)}, expected some of {BENCHMARKS}')
+    if work_dir is None:
+        with tempfile.TemporaryDirectory() as temporary_dir:
+            return benchmark_document(text, shape_name, benchmarks, repeat, temporary_dir)
+
+    inputs = stage_inputs(text)
+    runs = 0
+
+    def output_dir() -> str:
+        # Every run writes to a new directory, so no file is skipped as unchanged
+        nonlocal runs
+        runs += 1
+        return os.path.join(work_dir, f'{shape_name}-{runs}')
+
+    input_file = os.path.join(work_dir, f'{shape_name}.xml')
+    with open(input_file, 'w') as file:
+        file.write(text)
+
+    functions = {
+        'scanner': (lambda chars: list(scanner(chars)), lambda: (inputs['scanner'],)),
+        'parser': (parser, lambda: (inputs['parser'],)),
+        'semantic_analyzer': (semantic_analyzer, lambda: (inputs['semantic_analyzer'],)),
+        'inter_code_gen': (inter_code_gen, lambda: (inputs['inter_code_gen'],)),
+        'code_gen': (code_gen, lambda: (inputs['code_gen'],)),
+        'writer': (writer, lambda: (inputs['writer'], output_dir())),
+        END_TO_END: (
+            lambda *args: compiler(*args, max_func='writer', raise_errors=True),
+            lambda: (input_file, output_dir()),
+        ),
+    }
+    return [
+        BenchmarkResult(name, shape_name, len(text), time_runs(*functions[name], repeat))
+        for name in BENCHMARKS
+        if name in benchmarks
+    ]
+
+
+def run_suite(
+    shapes: dict[str, DocumentShape] | None = None,
+    benchmarks: tuple[str, ...] = BENCHMARKS,
+    repeat: int = DEFAULT_REPEAT,
+    label: str | None = None,
+) -> dict:
+    """
+    Benchmarks the documents of the given shapes, all of SHAPES by default.
+
+    Returns:
+        dict: The report, ready to be dumped as JSON and compared with `compare_reports`.
+    """
+    results = []
+    for shape_name, shape in (shapes or SHAPES).items():
+        results.extend(benchmark_document(generate_document(shape), shape_name, benchmarks, repeat))
+    return {
+        'label': label,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': [
+            {
+                'benchmark': result.benchmark,
+                'shape': result.shape,
+                'input_size': result.input_size,
+                'best': result.best,
+                'median': result.median,
+                'times': result.times,
+            }
+            for result in results
+        ],
+    }
+
+
+def compare_reports(baseline: dict, report: dict) -> list[dict]:
+    """
+    Compares the median times of the benchmarks run in both reports.
+
+    Returns:
+        list[dict]: For every benchmark and shape, both medians and their ratio, above 1 when slower than the baseline.
+    """
+    baseline_medians = {(result['benchmark'], result['shape']): result['median'] for result in baseline['results']}
+    comparison = []
+    for result in report['results']:
+        baseline_median = baseline_medians.get((result['benchmark'], result['shape']))
+        if baseline_median is None:
+            continue
+        comparison.append(
+            {
+                'benchmark': result['benchmark'],
+                'shape': result['shape'],
+                'baseline': baseline_median,
+                'median': result['median'],
+                'ratio': result['median'] / baseline_median if baseline_median else float('inf'),
+            }
+        )
+    return comparison
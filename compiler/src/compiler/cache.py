@@ -0,0 +1,118 @@
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from compiler.writer import write_file
+
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+CACHE_ENTRY_SUFFIX = '.json'
+
+
+@functools.cache
+def compiler_fingerprint() -> str:
+    """
+    Identifies the compiler build: the package version together with a hash of its
+    sources, so cached results never outlive a change to the compiler itself.
+    """
+    from importlib import metadata
+
+    try:
+        version = metadata.version('compiler')
+    except metadata.PackageNotFoundError:
+        version = 'unknown'
+    sources = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob('*.py')):
+        sources.update(path.name.encode())
+        sources.update(path.read_bytes())
+    return f'{version}+{sources.hexdigest()}'
+
+
+class BuildCache:
+    """
+    Content-addressed cache of whole compilations, mapping the input and the options
+    to the generated `file_map`. Least recently used entries are evicted once the
+    cache directory grows over `max_size` bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_CACHE_MAX_SIZE) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def key(self, source: bytes, options: dict) -> str:
+        """
+        Computes the cache key of the given input bytes compiled with the given options.
+        """
+        digest = hashlib.sha256()
+        digest.update(compiler_fingerprint().encode())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        digest.update(source)
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_ENTRY_SUFFIX)
+
+    def get(self, key: str) -> dict[str, str] | None:
+        """
+        Returns the cached file map, or None on a cache miss.
+        """
+        path = self.entry_path(key)
+        try:
+            with open(path, 'rb') as file:
+                file_map = json.load(file)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # A corrupted entry is as good as a missing one
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Batch workers share the cache, another one removed it first
+                pass
+            return None
+        # Mark the entry as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since it was read, the file map read is still valid
+            pass
+        return file_map
+
+    def put(self, key: str, file_map: dict[str, str]) -> None:
+        """
+        Stores the file map and evicts old entries if the cache grew too big.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        write_file(self.entry_path(key), json.dumps(file_map).encode(), atomic=True)
+        self.evict()
+
+    def evict(self) -> list[str]:
+        """
+        Removes the least recently used entries until the cache fits in `max_size`.
+
+        Returns:
+            list[str]: Keys of the removed entries.
+        """
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(CACHE_ENTRY_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # Removed by another process since the directory was listed
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.name))
+        total_size = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, name in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            removed.append(name.removesuffix(CACHE_ENTRY_SUFFIX))
+        return removed
@@ -1,24 +1,205 @@
 from compiler.models import IntermediateCode, ClassAttribute, Declaration, Class
 
+CSHARP_ESCAPES = {
+    '\\': '\\\\',
+    '"': '\\"',
+    '\0': '\\0',
+    '\a': '\\a',
+    '\b': '\\b',
+    '\f': '\\f',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+    '\v': '\\v',
+}
+
+
+def csharp_string_literal(value: str) -> str:
+    """
+    Renders a value as a C# regular string literal, escaping it where needed.
+
+    Args:
+        value (str): The raw string value.
+
+    Returns:
+        str: The value wrapped in double quotes, safe to put in C# source.
+    """
+    escaped = []
+    for char in value:
+        if char in CSHARP_ESCAPES:
+            escaped.append(CSHARP_ESCAPES[char])
+        elif not char.isprintable():
+            escaped.append(f'\\u{ord(char):04x}' if ord(char) <= 0xFFFF else f'\\U{ord(char):08x}')
+        else:
+            escaped.append(char)
+    return '"' + ''.join(escaped) + '"'
+
+
+def constant_declaration(field_name: str, value: str) -> str:
+    return f'    public static readonly string {field_name} = {csharp_string_literal(value)};'
+
+
+def constant_reference(field_name: str) -> str:
+    return f'Constants.{field_name}'
+
+
+def csharp_literal(value: str, attribute_type: str) -> str:
+    """
+    Renders an attribute value as a C# literal of the given property type.
+
+    Args:
+        value (str): The raw attribute value.
+        attribute_type (str): The C# type of the property receiving the value.
+
+    Returns:
+        str: The C# literal.
+    """
+    if attribute_type == 'int':
+        return str(int(value))
+    if attribute_type == 'long':
+        return f'{int(value)}L'
+    if attribute_type == 'double':
+        return repr(float(value))
+    if attribute_type == 'bool':
+        return value
+    return csharp_string_literal(value)
+
+
+BASE_CLASS_NAME = 'GeneratedBase'
+
+# HashCode.Combine has overloads for at most this many values
+HASH_COMBINE_MAX_ARGS = 8
+
+FINALIZE_METHOD = [
+    '    protected override void Finalize()',
+    '    {',
+    '        // Finalize resources if necessary',
+    '    }',
+]
+
+MEMBERWISE_CLONE_METHOD = [
+    '    protected object MemberwiseClone()',
+    '    {',
+    '        throw new NotImplementedException();',
+    '    }',
+]
+
+TO_STRING_METHOD = [
+    '    public override string ToString()',
+    '    {',
+    '        throw new NotImplementedException();',
+    '    }',
+]
+
+
+def join_methods(*methods: list[str]) -> list[str]:
+    lines = []
+    for method in methods:
+        if lines:
+            lines.append('')
+        lines.extend(method)
+    return lines
+
+
+def generate_equality_check(attr: ClassAttribute) -> str:
+    """
+    Generates the C# expression comparing one property of `this` and `other`.
+    """
+    prop_name = attr.name.title()
+    if attr.attribute_type in ('string', 'int', 'long', 'bool'):
+        return f'{prop_name} == other.{prop_name}'
+    if attr.attribute_type == 'double':
+        # Unlike ==, Equals treats NaN as equal to itself, as GetHashCode requires
+        return f'{prop_name}.Equals(other.{prop_name})'
+    return f'Equals({prop_name}, other.{prop_name})'
+
+
+def generate_equals_method(class_name: str, attributes: list[ClassAttribute]) -> list[str]:
+    """
+    Generates a member-wise Equals override for the given class.
+
+    Args:
+        class_name (str): The name of the class.
+        attributes (List[ClassAttribute]): A list of class attributes.
+
+    Returns:
+        list[str]: The lines of the generated method.
+    """
+    checks = [generate_equality_check(attr) for attr in attributes]
+    body = [f'        return obj is {class_name} other']
+    body.extend(f'            && {check}' for check in checks)
+    body[-1] += ';'
+    return ['    public override bool Equals(object obj)', '    {', *body, '    }']
+
+
+def generate_hash_combine(values: list[str]) -> str:
+    """
+    Generates a HashCode.Combine expression over the values, nesting the calls
+    when there are more values than a single overload accepts.
+    """
+    if len(values) <= HASH_COMBINE_MAX_ARGS:
+        return f'HashCode.Combine({", ".join(values)})'
+    chunks = [values[i : i + HASH_COMBINE_MAX_ARGS] for i in range(0, len(values), HASH_COMBINE_MAX_ARGS)]
+    return generate_hash_combine([generate_hash_combine(chunk) for chunk in chunks])
+
+
+def generate_get_hash_code_method(attributes: list[ClassAttribute]) -> list[str]:
+    """
+    Generates a GetHashCode override consistent with the generated Equals.
+
+    Args:
+        attributes (List[ClassAttribute]): A list of class attributes.
+
+    Returns:
+        list[str]: The lines of the generated method.
+    """
+    values = [attr.name.title() for attr in attributes]
+    expression = generate_hash_combine(values) if values else '0'
+    return ['    public override int GetHashCode()', '    {', f'        return {expression};', '    }']
+
+
+def generate_base_class_code(class_name: str = BASE_CLASS_NAME) -> str:
+    """
+    Generates the C# base class carrying the boilerplate methods shared by all generated classes.
+
+    Args:
+        class_name (str): The name of the base class.
+
+    Returns:
+        str: The generated C# class code as a string.
+    """
+    lines = ['using System;', '', f'public abstract class {class_name}', '{']
+    lines.extend(join_methods(FINALIZE_METHOD, MEMBERWISE_CLONE_METHOD, TO_STRING_METHOD))
+    lines.append('}')
+    return '\n'.join(lines)
+
 
-def generate_class_code(class_name: str, attributes: list[ClassAttribute]) -> str:
+def generate_class_code(
+    class_name: str, attributes: list[ClassAttribute], base_class: str | None = None, init_only: bool = False
+) -> str:
     """
     Generates C# class code for the given class name and attributes.
 
     Args:
         class_name (str): The name of the class.
         attributes (List[ClassAttribute]): A list of class attributes.
+        base_class (str | None): Base class providing the boilerplate methods. When
+            given, the class only declares its own properties, constructor and equality.
+        init_only (bool): Declare the properties `{ get; init; }`, so instances cannot
+            be changed once built.
 
     Returns:
         str: The generated C# class code as a string.
     """
-    lines = ['using System;', '', f'public class {class_name}', '{']
+    header = f'public class {class_name}' if base_class is None else f'public class {class_name} : {base_class}'
+    lines = ['using System;', '', header, '{']
+    accessors = '{ get; init; }' if init_only else '{ get; set; }'
 
     for attr in attributes:
         csharp_type = attr.attribute_type
         # Capitalize the attribute name to follow C# naming conventions
         prop_name = attr.name.title()
-        lines.append(f'    public {csharp_type} {prop_name} {{ get; set; }}')
+        lines.append(f'    public {csharp_type} {prop_name} {accessors}')
 
     constructor = [
         '',
@@ -28,47 +209,48 @@ def generate_class_code(class_name: str, attributes: list[ClassAttribute]) -> st
     for attr in attributes:
         constructor.append(f'        {attr.name.title()} = {attr.name.lower()};')
     constructor += ['    }', '']
-
-    # Add boilerplate method declarations
-    boilerplate_methods = [
-        '    public override bool Equals(object obj)',
-        '    {',
-        '        throw new NotImplementedException();',
-        '    }',
-        '',
-        '    protected override void Finalize()',
-        '    {',
-        '        // Finalize resources if necessary',
-        '    }',
-        '',
-        '    public override int GetHashCode()',
-        '    {',
-        '        throw new NotImplementedException();',
-        '    }',
-        '',
-        '    protected object MemberwiseClone()',
-        '    {',
-        '        throw new NotImplementedException();',
-        '    }',
-        '',
-        '    public override string ToString()',
-        '    {',
-        '        throw new NotImplementedException();',
-        '    }',
-    ]
     lines.extend(constructor)
-    lines.extend(boilerplate_methods)
+
+    equals_method = generate_equals_method(class_name, attributes)
+    get_hash_code_method = generate_get_hash_code_method(attributes)
+    if base_class is None:
+        methods = join_methods(
+            equals_method, FINALIZE_METHOD, get_hash_code_method, MEMBERWISE_CLONE_METHOD, TO_STRING_METHOD
+        )
+    else:
+        methods = join_methods(equals_method, get_hash_code_method)
+    lines.extend(methods)
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def generate_constants_code(constants: dict[str, str]) -> str:
+    """
+    Generates the C# class holding the pooled string constants.
+
+    Args:
+        constants (dict[str, str]): A mapping from string values to their field names.
+
+    Returns:
+        str: The generated C# class code as a string.
+    """
+    lines = ['using System;', '', 'public static class Constants', '{']
+    for value, field_name in constants.items():
+        lines.append(constant_declaration(field_name, value))
     lines.append('}')
     return '\n'.join(lines)
 
 
-def generate_single_instance_declaration(decl: Declaration, instances: dict, types: list[Class]) -> tuple[str, dict]:
+def generate_single_instance_declaration(
+    decl: Declaration, instances: dict, types: list[Class], constants: dict[str, str] | None = None
+) -> tuple[str, dict]:
     """
     Generates a single instance declaration line for Main.cs based on the declaration.
 
     Args:
         decl (Declaration): The declaration object containing instance details.
         instances (dict): A dictionary mapping declaration IDs to instance names.
+        constants (dict[str, str] | None): Pooled string values and their field names.
 
     Returns:
         str: The generated instance declaration line as a string.
@@ -82,6 +264,7 @@ def generate_single_instance_declaration(decl: Declaration, instances: dict, typ
 
     # Create a mapping of attribute names to their order in the Class definition
     attribute_order = {attr.name: index for index, attr in enumerate(class_def.attributes)}
+    attribute_types = {attr.name: attr.attribute_type for attr in class_def.attributes}
 
     # Sort the decl.attributes based on the attribute order defined in the Class
     sorted_decl_attrs = sorted(decl.attributes or [], key=lambda attr: attribute_order.get(attr.name, -1))
@@ -96,36 +279,58 @@ def generate_single_instance_declaration(decl: Declaration, instances: dict, typ
             if not ref_instance:
                 raise ValueError(f'Reference ID {attr.ref} not found.')
             args.append(ref_instance)
-        elif attr.value is not None:
-            # Only append value if ref is not present
-            args.append(f'"{attr.value}"')
-        else:
+        elif attr.value is None:
             # If neither ref nor value is present, append null
             args.append('null')
+        elif constants and attr.value in constants and attribute_types.get(attr.name, 'string') == 'string':
+            # Pooled value, reference the shared field instead of repeating the literal
+            args.append(constant_reference(constants[attr.value]))
+        else:
+            # Only append value if ref is not present
+            args.append(csharp_literal(attr.value, attribute_types.get(attr.name, 'string')))
     args_str = ', '.join(args)
     declaration_line = f'{class_name} {instance_name} = new {class_name}({args_str});'
     instances[decl.id] = instance_name
     return declaration_line, instances
 
 
+def generate_alias_declaration(decl: Declaration, instances: dict) -> tuple[str, dict]:
+    """
+    Generates a declaration line that names an already built instance.
+
+    Args:
+        decl (Declaration): The declaration referencing another instance.
+        instances (dict): A dictionary mapping declaration IDs to instance names.
+
+    Returns:
+        str: The generated declaration line as a string.
+    """
+    ref_instance = instances.get(decl.ref)
+    if not ref_instance:
+        raise ValueError(f'Reference ID {decl.ref} not found.')
+    instances[decl.id] = decl.instance_name
+    return f'{decl.class_name} {decl.instance_name} = {ref_instance};', instances
+
+
 def generate_list_instance_declaration(decl: Declaration, instances: dict) -> tuple[str, dict]:
     string_list_type = f'List<{decl.class_name}>'
     early_init = f'{string_list_type} {decl.instance_name} = new {string_list_type}();'
     lines = [early_init]
     for x in decl.attributes or []:
-        some_val = f'{decl.instance_name}.add({x.name});'
+        some_val = f'{decl.instance_name}.add({instances.get(x.ref, x.name)});'
         lines.append(some_val)
 
     instances[decl.id] = decl.instance_name
     return '\n'.join(lines), instances
 
 
-def generate_main(declarations: list[Declaration], types: list[Class]) -> str:
+def generate_main(declarations: list[Declaration], types: list[Class], constants: dict[str, str] | None = None) -> str:
     """
     Generates the content for Main.cs based on the declarations.
 
     Args:
         declarations (List[Declaration]): The list of declarations.
+        constants (dict[str, str] | None): Pooled string values and their field names.
 
     Returns:
         str: The generated Main.cs content.
@@ -135,40 +340,45 @@ def generate_main(declarations: list[Declaration], types: list[Class]) -> str:
     for decl in declarations:
         if decl.is_list:
             declaration_line, instances = generate_list_instance_declaration(decl, instances)
+        elif decl.ref is not None:
+            declaration_line, instances = generate_alias_declaration(decl, instances)
         else:
-            declaration_line, instances = generate_single_instance_declaration(decl, instances, types)
+            declaration_line, instances = generate_single_instance_declaration(decl, instances, types, constants)
         main_lines.append(declaration_line)
     return '\n'.join(main_lines)
 
 
-def code_gen(intermediate_code: IntermediateCode) -> dict[str, str]:
-    """
-    Generates C# code from the AST.
-
-    Args:
-        typed_ast (TypedTree): The semantically analyzed AST.
-
-    Returns:
-        Dict[str, str]: A mapping from filenames to their C# code content.
-    """
+def code_gen(intermediate_code: IntermediateCode, shared_base: bool = False, init_only: bool = False) -> dict[str, str]:
     """
     Generates C# code from the AST.
 
     Args:
         typed_ast (TypedTree): The semantically analyzed AST.
+        shared_base (bool): Emit the boilerplate methods once in a common base class
+            instead of repeating them in every generated class.
+        init_only (bool): Declare the properties init-only, required when instances
+            are shared by `deduplicate_declarations`.
 
     Returns:
         Dict[str, str]: A mapping from filenames to their C# code content.
     """
     code_files = {}
 
+    base_class = None
+    if shared_base and intermediate_code.types:
+        base_class = BASE_CLASS_NAME
+        code_files[f'{base_class}.cs'] = generate_base_class_code(base_class)
+
     for new_type in intermediate_code.types:
-        class_code = generate_class_code(new_type.name, new_type.attributes)
+        class_code = generate_class_code(new_type.name, new_type.attributes, base_class, init_only)
         filename = f'{new_type.name}.cs'
         code_files[filename] = class_code
 
+    if intermediate_code.constants:
+        code_files['Constants.cs'] = generate_constants_code(intermediate_code.constants)
+
     # Generate Main.cs based on declarations
-    main_content = generate_main(intermediate_code.declarations, intermediate_code.types)
+    main_content = generate_main(intermediate_code.declarations, intermediate_code.types, intermediate_code.constants)
     code_files['Main.cs'] = main_content
 
     return code_files
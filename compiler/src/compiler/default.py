@@ -1,11 +1,44 @@
-from typing import Callable
-from compiler.reader import source_reader
-from compiler.scanner import scanner
-from compiler.parser import parser
-from compiler.semantic_analyzer import semantic_analyzer
-from compiler.inter_code_gen import inter_code_gen
-from compiler.code_gen import code_gen
-from compiler.writer import writer
+import importlib
+import sys
+from typing import TYPE_CHECKING, Callable
+
+from compiler.cache import BuildCache, DEFAULT_CACHE_MAX_SIZE
+
+if TYPE_CHECKING:
+    from compiler.incremental import IncrementalCompiler
+    from compiler.instrumentation import Instrumentation
+    from compiler.profiling import StageProfiler
+    from compiler.sinks import OutputSink
+
+# Modules of the functions of the stages, imported on first use so that importing
+# this module, and a compilation stopping early, do not load the whole compiler.
+# They are still attributes of this module, e.g. `compiler.default.scanner`.
+LAZY_FUNCTIONS = {
+    'source_reader': 'compiler.reader',
+    'scanner': 'compiler.scanner',
+    'parser': 'compiler.parser',
+    'semantic_analyzer': 'compiler.semantic_analyzer',
+    'inter_code_gen': 'compiler.inter_code_gen',
+    'pool_constants': 'compiler.optimizer',
+    'deduplicate_declarations': 'compiler.optimizer',
+    'code_gen': 'compiler.code_gen',
+    'make_sink': 'compiler.sinks',
+}
+
+
+def __getattr__(name: str):
+    if name not in LAZY_FUNCTIONS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    function = getattr(importlib.import_module(LAZY_FUNCTIONS[name]), name)
+    globals()[name] = function
+    return function
+
+
+def lazy(name: str) -> Callable:
+    """
+    Returns the function `name` of LAZY_FUNCTIONS, looked up when it is called.
+    """
+    return getattr(sys.modules[__name__], name)
 
 
 def pipe(*functions: Callable) -> Callable:
@@ -17,11 +50,111 @@ def pipe(*functions: Callable) -> Callable:
     return piped
 
 
-def compiler(input_file: str, output_dir: str, max_func) -> None:
+def compiler(
+    input_file: str,
+    output_dir: str,
+    max_func,
+    constant_pool: bool = False,
+    constant_pool_min_occurrences: int = 2,
+    deduplicate: bool = False,
+    shared_base: bool = False,
+    infer_types: bool = False,
+    writer_jobs: int = 1,
+    atomic_write: bool = False,
+    fsync: str = 'none',
+    manifest: bool = False,
+    sink: 'OutputSink | str' = 'filesystem',
+    cache_dir: str | None = None,
+    cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    artifacts_dir: str | None = None,
+    start_from: str | None = None,
+    schema_lock: str | None = None,
+    incremental: 'IncrementalCompiler | None' = None,
+    instrumentation: 'Instrumentation | None' = None,
+    profiler: 'StageProfiler | None' = None,
+    raise_errors: bool = False,
+) -> None:
+    """
+    Runs the compilation pipeline up to `max_func`.
+
+    With `artifacts_dir`, the outputs of the stages in ARTIFACT_STAGES are saved
+    there. With `start_from` set to one of those stages, `input_file` is an artifact
+    saved from it, and the compilation resumes with the stage that follows.
+
+    With `schema_lock`, the class names are kept stable between runs through the
+    given lock file, see `compiler.schema_lock.SchemaLock`.
+
+    With `incremental`, the stages from the parser to the code generation are run by
+    the given engine, which reuses the results of its previous compilation.
+    It has to be created with the same code generation options.
+
+    With `instrumentation`, every stage that runs is measured, see
+    `compiler.instrumentation.Instrumentation`. The incremental engine is measured
+    as the parser and the code generation. With `profiler`, every stage is profiled
+    the same way, see `compiler.profiling.StageProfiler`. Profiling slows the stages
+    down, so it cannot be combined with `instrumentation`.
+
+    Errors are printed and None is returned, unless `raise_errors` is set. They are
+    printed to the standard error when the output is streamed to the standard output.
+    """
+    if instrumentation is not None and profiler is not None:
+        raise ValueError('Stages cannot be measured while they are profiled, the profiler inflates their times')
+    # Options that influence the generated code, and so the build cache key
+    code_options = {
+        'constant_pool': constant_pool,
+        'constant_pool_min_occurrences': constant_pool_min_occurrences,
+        'deduplicate': deduplicate,
+        'shared_base': shared_base,
+        'infer_types': infer_types,
+    }
+
+    lock = None
+
+    # Counters of the state machines, when the instrumentation counts transitions
+    counters = instrumentation.counters if instrumentation is not None else {}
+
+    def source_reader_app(x):
+        return lazy('source_reader')(x)
+
+    def scanner_app(x):
+        return lazy('scanner')(x, counters=counters.get('scanner'))
+
+    def parser_app(x):
+        return lazy('parser')(x, counters=counters.get('parser'))
+
+    def semantic_analyzer_app(x):
+        return lazy('semantic_analyzer')(x, infer_types=infer_types, schema_lock=lock)
+
+    def inter_code_gen_app(x):
+        intermediate_code = lazy('inter_code_gen')(x, schema_lock=lock)
+        if lock is not None:
+            lock.save(schema_lock)
+        if deduplicate:
+            intermediate_code = lazy('deduplicate_declarations')(intermediate_code)
+        if constant_pool:
+            intermediate_code = lazy('pool_constants')(intermediate_code, min_occurrences=constant_pool_min_occurrences)
+        return intermediate_code
+
+    def code_gen_app(x):
+        return lazy('code_gen')(x, shared_base=shared_base, init_only=deduplicate)
+
+    if isinstance(sink, str):
+        sink = lazy('make_sink')(
+            sink, output_dir, jobs=writer_jobs, atomic=atomic_write, fsync=fsync, manifest=manifest
+        )
+
     def writer_app(x):
-        return writer(x, output_dir=output_dir)
+        return sink.write(x)
 
-    functions = (source_reader, scanner, parser, semantic_analyzer, inter_code_gen, code_gen, writer_app)
+    functions = (
+        source_reader_app,
+        scanner_app,
+        parser_app,
+        semantic_analyzer_app,
+        inter_code_gen_app,
+        code_gen_app,
+        writer_app,
+    )
     str_functions = (
         'source_reader',
         'scanner',
@@ -31,10 +164,68 @@ def compiler(input_file: str, output_dir: str, max_func) -> None:
         'code_gen',
         'writer',
     )
+
+    def measured(stage: str, function: Callable) -> Callable:
+        if instrumentation is not None:
+            function = instrumentation.wrap(stage, function)
+        if profiler is not None:
+            function = profiler.wrap(stage, function)
+        return function
+
+    if instrumentation is not None or profiler is not None:
+        # Import the modules of the stages now, their import time is not part of any stage
+        for name in LAZY_FUNCTIONS:
+            lazy(name)
+    functions = tuple(measured(name, function) for name, function in zip(str_functions, functions))
+    if artifacts_dir is not None:
+        from compiler.artifacts import ARTIFACT_STAGES, saving_artifact
+
+        functions = tuple(
+            saving_artifact(name, function, artifacts_dir) if name in ARTIFACT_STAGES else function
+            for name, function in zip(str_functions, functions)
+        )
     max_index = str_functions.index(max_func)
-    functions = functions[: max_index + 1]
+    code_gen_index = str_functions.index('code_gen')
     try:
-        result = pipe(*functions)(input_file)
+        if schema_lock is not None:
+            from compiler.schema_lock import SchemaLock
+
+            lock = SchemaLock.load(schema_lock)
+            # The locked names end up in the generated code
+            code_options['schema_lock'] = lock.dumps()
+        if start_from is not None:
+            from compiler.artifacts import ARTIFACT_STAGES, load_artifact
+
+            if start_from not in ARTIFACT_STAGES:
+                raise ValueError(f'Cannot start from {start_from}, expected one of {ARTIFACT_STAGES}')
+            artifact = load_artifact(input_file, start_from)
+            return pipe(*functions[str_functions.index(start_from) + 1 : max_index + 1])(artifact)
+        if incremental is not None and max_index >= code_gen_index:
+            parse = measured('parser', incremental.parser.parse)
+            if artifacts_dir is not None:
+                parse = saving_artifact('parser', parse, artifacts_dir)
+            with open(input_file, 'r') as file:
+                ast = parse(file.read())
+            file_map = measured('code_gen', incremental.compile)(
+                ast, schema_lock=lock, fingerprints=incremental.parser.fingerprints
+            )
+            if lock is not None:
+                lock.save(schema_lock)
+            return pipe(*functions[code_gen_index + 1 : max_index + 1])(file_map)
+        if cache_dir is not None and max_index >= code_gen_index:
+            # The whole front end and code generation are skipped on a cache hit
+            cache = BuildCache(cache_dir, max_size=cache_max_size)
+            with open(input_file, 'rb') as file:
+                key = cache.key(file.read(), code_options)
+            file_map = cache.get(key)
+            if file_map is None:
+                file_map = pipe(*functions[: code_gen_index + 1])(input_file)
+                cache.put(key, file_map)
+            return pipe(*functions[code_gen_index + 1 : max_index + 1])(file_map)
+        result = pipe(*functions[: max_index + 1])(input_file)
         return result
     except Exception as e:
-        print(f'Exception occurred: {type(e).__name__} - {e}')
+        if raise_errors:
+            raise
+        # Keep standard output clean when an archive is streamed to it
+        print(f'Exception occurred: {type(e).__name__} - {e}', file=sys.stderr if output_dir == '-' else sys.stdout)
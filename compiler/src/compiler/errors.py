@@ -26,3 +26,21 @@ class SemanticError(Exception):
     """Raised when there has been identified error in the semantic meaning of XML elements"""
 
     pass
+
+
+class ArtifactError(Exception):
+    """Raised when a saved stage artifact cannot be loaded"""
+
+    pass
+
+
+class SerializationError(Exception):
+    """Raised when a value cannot be serialized or the serialized data cannot be decoded"""
+
+    pass
+
+
+class SchemaLockError(Exception):
+    """Raised when the schema lock file cannot be read"""
+
+    pass
@@ -0,0 +1,141 @@
+import hashlib
+
+from compiler.code_gen import BASE_CLASS_NAME, code_gen, generate_base_class_code, generate_class_code, generate_main
+from compiler.incremental_parser import IncrementalParser
+from compiler.inter_code_gen import IntermediateCodeGeneration
+from compiler.models import IntermediateCode, TypedXmlElement, XmlElement
+from compiler.optimizer import deduplicate_declarations, pool_constants
+from compiler.schema_lock import SchemaLock
+from compiler.semantic_analyzer import semantic_analyzer
+from compiler.serialization import dumps
+
+# Options of `compiler.default.compiler` that influence the generated code
+CODE_OPTIONS = ('constant_pool', 'constant_pool_min_occurrences', 'deduplicate', 'shared_base', 'infer_types')
+
+
+def element_fingerprint(element: XmlElement) -> bytes:
+    """
+    Hashes the whole subtree of the element, unlike its equality which ignores the children.
+    """
+    return hashlib.sha256(dumps(element)).digest()
+
+
+class IncrementalCompiler:
+    """
+    Compiles successive versions of a document, regenerating only what an edit affected.
+
+    The semantic analysis always covers the whole document, as the types are minimized
+    and numbered across all of it. The code of a class is reused while its name and
+    attributes stay the same, and the lines of Main.cs are reused for every child of
+    the root whose subtree did not change, as long as the types did not change either.
+    Deduplication and constant pooling share values between the children of the root,
+    so with them Main.cs is always regenerated as a whole.
+
+    Its `parser` reparses only the children of the root whose text changed, and
+    fingerprints them by their text so their subtrees are not hashed again.
+    """
+
+    def __init__(
+        self,
+        constant_pool: bool = False,
+        constant_pool_min_occurrences: int = 2,
+        deduplicate: bool = False,
+        shared_base: bool = False,
+        infer_types: bool = False,
+    ) -> None:
+        self.constant_pool = constant_pool
+        self.constant_pool_min_occurrences = constant_pool_min_occurrences
+        self.deduplicate = deduplicate
+        self.shared_base = shared_base
+        self.infer_types = infer_types
+        self.parser = IncrementalParser()
+        self.state: tuple | None = None
+        self.file_map: dict[str, str] = {}
+        self.class_files: dict[tuple, str] = {}
+        self.main_lines: dict[tuple, str] = {}
+        # Files added or changed, and files removed, by the last compilation
+        self.changed: list[str] = []
+        self.removed: list[str] = []
+
+    def compile(
+        self, ast: XmlElement, schema_lock: SchemaLock | None = None, fingerprints: list[bytes] | None = None
+    ) -> dict[str, str]:
+        """
+        Compiles the AST into the same files as a full compilation would.
+
+        Args:
+            ast (XmlElement): The whole document.
+            schema_lock (SchemaLock | None): Lock keeping the class names stable.
+            fingerprints (list[bytes] | None): Fingerprints of the children of the root,
+                computed with `element_fingerprint` when not given.
+
+        Returns:
+            Dict[str, str]: A mapping from filenames to their C# code content.
+        """
+        if fingerprints is None:
+            fingerprints = [element_fingerprint(child) for child in ast.children or []]
+        state = (
+            element_fingerprint(XmlElement(ast.element_name, ast.attributes)),
+            fingerprints,
+            schema_lock.dumps() if schema_lock is not None else None,
+        )
+        if state == self.state:
+            self.changed, self.removed = [], []
+            return self.file_map
+
+        semantic_output = semantic_analyzer(ast, infer_types=self.infer_types, schema_lock=schema_lock)
+        generation = IntermediateCodeGeneration(semantic_output, schema_lock)
+        generation.populate_types()
+
+        if self.deduplicate or self.constant_pool:
+            file_map = self.full_code_gen(generation)
+        else:
+            file_map = self.incremental_code_gen(generation, fingerprints, semantic_output.typed_ast)
+
+        self.changed = [filename for filename, content in file_map.items() if self.file_map.get(filename) != content]
+        self.removed = [filename for filename in self.file_map if filename not in file_map]
+        self.state, self.file_map = state, file_map
+        return file_map
+
+    def full_code_gen(self, generation: IntermediateCodeGeneration) -> dict[str, str]:
+        generation.populate_declarations()
+        intermediate_code = IntermediateCode(generation.types, generation.declarations)
+        if self.deduplicate:
+            intermediate_code = deduplicate_declarations(intermediate_code)
+        if self.constant_pool:
+            intermediate_code = pool_constants(intermediate_code, min_occurrences=self.constant_pool_min_occurrences)
+        return code_gen(intermediate_code, shared_base=self.shared_base, init_only=self.deduplicate)
+
+    def incremental_code_gen(
+        self, generation: IntermediateCodeGeneration, fingerprints: list[bytes], typed_ast: TypedXmlElement
+    ) -> dict[str, str]:
+        file_map = {}
+        base_class = None
+        if self.shared_base and generation.types:
+            base_class = BASE_CLASS_NAME
+            file_map[f'{base_class}.cs'] = generate_base_class_code(base_class)
+
+        class_files = {}
+        for new_type in generation.types:
+            key = (new_type.name, tuple((attr.name, attr.attribute_type) for attr in new_type.attributes), base_class)
+            class_code = self.class_files.get(key)
+            if class_code is None:
+                class_code = generate_class_code(new_type.name, new_type.attributes, base_class)
+            class_files[key] = file_map[f'{new_type.name}.cs'] = class_code
+
+        # The declarations of a child depend on the numbering of the types too
+        types_key = tuple(class_files)
+        main_lines = {}
+        for fingerprint, typed_child in zip(fingerprints, typed_ast.children or []):
+            key = (fingerprint, types_key)
+            lines = self.main_lines.get(key)
+            if lines is None:
+                generation.declarations = []
+                generation.populate_declarations(TypedXmlElement('root', -1, 'root', children=[typed_child]))
+                lines = generate_main(generation.declarations, generation.types)
+            main_lines[key] = lines
+        file_map['Main.cs'] = '\n'.join(lines for lines in main_lines.values() if lines)
+
+        # Only the entries of the current version are kept
+        self.class_files, self.main_lines = class_files, main_lines
+        return file_map
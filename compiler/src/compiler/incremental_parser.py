@@ -0,0 +1,164 @@
+import hashlib
+from typing import Iterator
+
+from compiler.models import EndToken, SelfClosingToken, StartToken, XmlElement, XmlToken
+from compiler.parser import State, StateName, StateTransition, build_ast
+from compiler.scanner import scanner_with_offsets
+
+# A changed region is parsed as the children of a made up root. The region always
+# starts after a '>' and is followed by whitespace, as in the document itself.
+REGION_START = '<root>'
+REGION_END = ' </root>'
+
+
+def parse_with_offsets(text: str) -> tuple[XmlElement, int | None, list[int]]:
+    """
+    Parses the text exactly like `parser(scanner(text))`, and locates the children of the root.
+
+    Returns:
+        tuple: The AST, the offset right after the start tag of the root (None when
+        the root has no start tag) and the offsets right after every child of the root.
+    """
+    root_end = None
+    child_ends = []
+
+    def xml_tokens() -> Iterator[XmlToken]:
+        # Consumed lazily by build_ast, so errors are raised in the same order as by the parser
+        nonlocal root_end
+        state_machine = StateTransition()
+        state = State(StateName.START_STATE)
+        depth = 0
+        for token, end in scanner_with_offsets(text):
+            state, xml_token = state_machine(state, token)
+            if not xml_token:
+                continue
+            if isinstance(xml_token, StartToken):
+                depth += 1
+                if depth == 1:
+                    root_end = end
+            elif isinstance(xml_token, EndToken):
+                depth -= 1
+                if depth == 1:
+                    child_ends.append(end)
+            elif isinstance(xml_token, SelfClosingToken) and depth == 1:
+                child_ends.append(end)
+            yield xml_token
+
+    ast = build_ast(xml_tokens())
+    return ast, root_end, child_ends
+
+
+def segment_hash(text: str, start: int, end: int) -> bytes:
+    return hashlib.sha256(text[start:end].encode('utf-8', 'surrogatepass')).digest()
+
+
+class IncrementalParser:
+    """
+    Parses successive versions of a document, tokenizing only the children of the root
+    whose text changed and reusing the previous subtrees of all the others.
+
+    The document is split into segments: the start tag of the root, one segment for
+    every child of the root (together with the whitespace before it), and the rest.
+    Their character ranges and hashes are kept, and on the next version the segments
+    are matched from both ends. Only the text in between is parsed again.
+    """
+
+    def __init__(self) -> None:
+        self.ast: XmlElement | None = None
+        # Offsets where the segments start, followed by the length of the text
+        self.bounds: list[int] = []
+        self.hashes: list[bytes] = []
+        # Children of the root parsed by the last call
+        self.reparsed = 0
+
+    @property
+    def fingerprints(self) -> list[bytes]:
+        """
+        Hashes of the text of every child of the root, a fingerprint of its subtree.
+        """
+        return self.hashes[1:-1]
+
+    def parse(self, text: str) -> XmlElement:
+        """
+        Parses the text into the same AST as `parser(scanner(text))`.
+        """
+        if self.ast is not None:
+            ast = self.reparse(text)
+            if ast is not None:
+                return ast
+        return self.full_parse(text)
+
+    def full_parse(self, text: str) -> XmlElement:
+        ast, root_end, child_ends = parse_with_offsets(text)
+        self.reparsed = len(ast.children or [])
+        if root_end is None or len(child_ends) != self.reparsed:
+            # Self closing root or elements after the root, nothing to reuse
+            self.ast, self.bounds, self.hashes = None, [], []
+            return ast
+        self.ast = ast
+        self.bounds = [0, root_end, *child_ends, len(text)]
+        self.hashes = [segment_hash(text, start, end) for start, end in zip(self.bounds, self.bounds[1:])]
+        return ast
+
+    def reparse(self, text: str) -> XmlElement | None:
+        """
+        Reparses only the changed region, or returns None when the start tag of the root
+        or the text after the last child changed and the whole text has to be parsed.
+        """
+        bounds, hashes = self.bounds, self.hashes
+        children_count = len(hashes) - 2
+        delta = len(text) - bounds[-1]
+
+        tail_start = bounds[-2] + delta
+        if (
+            segment_hash(text, 0, bounds[1]) != hashes[0]
+            or tail_start < bounds[1]
+            or segment_hash(text, tail_start, len(text)) != hashes[-1]
+        ):
+            return None
+
+        # Unchanged children at the start keep their offsets, the ones at the end are shifted
+        first = 1
+        while first <= children_count and segment_hash(text, bounds[first], bounds[first + 1]) == hashes[first]:
+            first += 1
+        last = children_count
+        while (
+            last >= first
+            and bounds[last] + delta >= bounds[first]
+            and segment_hash(text, bounds[last] + delta, bounds[last + 1] + delta) == hashes[last]
+        ):
+            last -= 1
+
+        region_start, region_end = bounds[first], bounds[last + 1] + delta
+        if region_end < region_start:
+            return None
+        if first > children_count and delta == 0:
+            self.reparsed = 0
+            return self.ast
+
+        try:
+            region_ast, _, region_ends = parse_with_offsets(REGION_START + text[region_start:region_end] + REGION_END)
+        except Exception:
+            # The whole text is parsed again to report the error exactly as a full parse does
+            return None
+        region_children = region_ast.children or []
+        if len(region_ends) != len(region_children):
+            return None
+        region_ends = [end - len(REGION_START) + region_start for end in region_ends]
+
+        old_children = self.ast.children or []
+        children = old_children[: first - 1] + region_children + old_children[last:]
+        new_bounds = bounds[: first + 1] + region_ends + [bound + delta for bound in bounds[last + 2 :]]
+
+        # The first segment after the region may now start with different whitespace
+        changed = range(first, first + len(region_ends) + 1)
+        new_hashes = (
+            hashes[:first]
+            + [segment_hash(text, new_bounds[index], new_bounds[index + 1]) for index in changed]
+            + hashes[last + 2 :]
+        )
+
+        self.ast = XmlElement(self.ast.element_name, self.ast.attributes, children or None)
+        self.bounds, self.hashes = new_bounds, new_hashes
+        self.reparsed = len(region_children)
+        return self.ast
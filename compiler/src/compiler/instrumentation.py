@@ -0,0 +1,164 @@
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Any, Callable, Iterator
+
+from compiler.models import (
+    IntermediateCode,
+    SemanticAnalyzerOutput,
+    StageStats,
+    TransitionCounters,
+    WriterOutput,
+    XmlElement,
+)
+
+# Stages whose state machines can count their transitions
+COUNTED_STAGES = ('scanner', 'parser')
+# What the items counted for every stage are
+STAGE_ITEMS = {
+    'source_reader': 'chars',
+    'scanner': 'tokens',
+    'parser': 'elements',
+    'semantic_analyzer': 'types',
+    'inter_code_gen': 'declarations',
+    'code_gen': 'files',
+    'writer': 'files',
+}
+
+StageHook = Callable[[StageStats], None]
+
+
+def count_elements(ast: XmlElement) -> int:
+    count = 0
+    stack = [ast]
+    while stack:
+        element = stack.pop()
+        count += 1
+        stack.extend(element.children or [])
+    return count
+
+
+def count_items(output: Any) -> int:
+    """
+    Counts the items produced by a stage: characters, tokens, elements of the AST,
+    types, declarations or files.
+    """
+    if isinstance(output, XmlElement):
+        return count_elements(output)
+    if isinstance(output, SemanticAnalyzerOutput):
+        return len(output.types)
+    if isinstance(output, IntermediateCode):
+        return len(output.declarations)
+    if isinstance(output, WriterOutput):
+        return len(output.written) + len(output.skipped)
+    if isinstance(output, (list, dict)):
+        return len(output)
+    return 0
+
+
+class Instrumentation:
+    """
+    Measures every stage of the pipeline: wall time, CPU time and the number of items
+    it produced.
+
+    With `trace_memory`, the peak memory allocated while a stage runs is traced with
+    tracemalloc as well. Tracing slows every allocation down, some stages several times
+    more than others, so the times measured with it are only comparable with each other
+    and it is off by default.
+
+    The source reader and the scanner are lazy, every stage would otherwise run
+    interleaved with the next one. Their output is collected into a list instead,
+    so each stage is measured on its own.
+
+    Hooks are called with the StageStats of every stage as soon as it finishes.
+
+    With `count_transitions`, the state machines of the scanner and the parser also
+    count their transitions per pair of states and their tokens per kind. Counting
+    slows these stages down, so it is off by default.
+    """
+
+    def __init__(
+        self, trace_memory: bool = False, count_transitions: bool = False, hooks: list[StageHook] | None = None
+    ) -> None:
+        self.trace_memory = trace_memory
+        self.hooks: list[StageHook] = list(hooks or [])
+        self.stages: list[StageStats] = []
+        self.counters: dict[str, TransitionCounters] = (
+            {stage: TransitionCounters() for stage in COUNTED_STAGES} if count_transitions else {}
+        )
+
+    def add_hook(self, hook: StageHook) -> None:
+        self.hooks.append(hook)
+
+    def wrap(self, stage: str, function: Callable) -> Callable:
+        def instrumented(*args, **kwargs):
+            return self.measure(stage, function, *args, **kwargs)
+
+        return instrumented
+
+    def measure(self, stage: str, function: Callable, *args, **kwargs) -> Any:
+        """
+        Runs the stage function and records its StageStats.
+        """
+        # An already running trace, e.g. of a profiler, is left running
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            output = function(*args, **kwargs)
+            if isinstance(output, Iterator):
+                output = list(output)
+            wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            peak_memory = tracemalloc.get_traced_memory()[1] - baseline if self.trace_memory else 0
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        stats = StageStats(stage, wall_time, cpu_time, peak_memory, count_items(output), STAGE_ITEMS.get(stage, ''))
+        self.stages.append(stats)
+        for hook in self.hooks:
+            hook(stats)
+        return output
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: The stats of every stage and their totals, ready to be dumped as JSON.
+        """
+        report = {
+            # The times of a report tracing memory are inflated
+            'trace_memory': self.trace_memory,
+            'stages': [asdict(stats) for stats in self.stages],
+            'total': {
+                'wall_time': sum(stats.wall_time for stats in self.stages),
+                'cpu_time': sum(stats.cpu_time for stats in self.stages),
+                'peak_memory': max((stats.peak_memory for stats in self.stages), default=0),
+            },
+        }
+        if self.counters:
+            # Most frequent first
+            report['counters'] = {
+                stage: {
+                    'transitions': dict(counters.transitions.most_common()),
+                    'tokens': dict(counters.tokens.most_common()),
+                }
+                for stage, counters in self.counters.items()
+            }
+        return report
+
+    def save(self, path: str) -> None:
+        """
+        Writes the report as JSON to the file, or to standard error when the path is '-'.
+        """
+        data = json.dumps(self.report(), indent=2)
+        if path == '-':
+            print(data, file=sys.stderr)
+            return
+        with open(path, 'w') as file:
+            file.write(data + '\n')
@@ -7,11 +7,13 @@ from compiler.models import (
     Declaration,
     TypedXmlElement,
 )
+from compiler.schema_lock import SchemaLock, type_signature
 
 
 class IntermediateCodeGeneration:
-    def __init__(self, sem_output: SemanticAnalyzerOutput) -> None:
+    def __init__(self, sem_output: SemanticAnalyzerOutput, schema_lock: SchemaLock | None = None) -> None:
         self.sem_output = sem_output
+        self.schema_lock = schema_lock
         self.declarations: list[Declaration] = []
         self.types: list[Class] = []
         self.declaration_seq = 0
@@ -21,21 +23,30 @@ class IntermediateCodeGeneration:
         self.populate_declarations()
 
     def populate_types(self):
-        for i, set_of_attrs in enumerate(self.sem_output.types, start=1):
-            class_name = f'Class{i}'
-            self.types.append(Class(class_name, list(set_of_attrs)))
+        if self.schema_lock is not None:
+            class_names = self.schema_lock.assign([type_signature(attrs) for attrs in self.sem_output.types])
+        else:
+            class_names = [f'Class{i}' for i in range(1, len(self.sem_output.types) + 1)]
+        for class_name, set_of_attrs in zip(class_names, self.sem_output.types):
+            # Sort the attributes so the generated code does not depend on set iteration order
+            self.types.append(Class(class_name, sorted(set_of_attrs, key=lambda attr: attr.name)))
 
         for _type in self.types:
             attrs = []
             for attr in _type.attributes:
-                if attr.attribute_type in (str(i) for i in range(10)):
+                if attr.attribute_type.isdigit():
                     type_index = int(attr.attribute_type)
                     type_name = self.types[type_index].name
                     attr = ClassAttribute(attr.name, type_name)
                 attrs.append(attr)
             _type.attributes = attrs
 
-    def populate_declarations(self):
+    def populate_declarations(self, root: TypedXmlElement | None = None):
+        """
+        Collects the declarations of the typed tree, or of the given root with some of its children.
+        """
+        root = root or self.sem_output.typed_ast
+
         def rec(element: TypedXmlElement, parent_role: str | None = None):
             if not element.children:  # leaf node
                 id_assigned = self.declaration_seq
@@ -90,20 +101,25 @@ class IntermediateCodeGeneration:
             )
             return str(id_assigned)
 
-        if not self.sem_output.typed_ast.children:
+        if not root.children:
             return
-        rec(self.sem_output.typed_ast)
+        rec(root)
 
 
-def inter_code_gen(semantic_analysis_output: SemanticAnalyzerOutput) -> IntermediateCode:
+def inter_code_gen(
+    semantic_analysis_output: SemanticAnalyzerOutput, schema_lock: SchemaLock | None = None
+) -> IntermediateCode:
     """
     Identify unique classes and it's types, and Identify all declarations and
     it's dependencies (references to other declaration, that we need to build
     first and use to build current instance) (declarations are guaranteed to be
     returned in the topological order, such that the instance lvalue is allways
     available for later instances)
+
+    With a `schema_lock`, classes keep the names the lock assigned to their attributes
+    in previous runs, and the lock is updated with the names of new classes.
     """
-    inter_code_generation = IntermediateCodeGeneration(semantic_analysis_output)
+    inter_code_generation = IntermediateCodeGeneration(semantic_analysis_output, schema_lock)
     inter_code_generation.run()
     types = inter_code_generation.types
     declarations = inter_code_generation.declarations
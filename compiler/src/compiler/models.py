@@ -1,5 +1,7 @@
 from abc import ABC
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
 
 
 class BaseToken(ABC):
@@ -109,6 +111,7 @@ class Declaration:
     class_name: str
     attributes: list[InstanceAttribute] | None = None
     is_list: bool = False
+    ref: str | None = None
 
 
 @dataclass
@@ -128,6 +131,7 @@ class Class:
 class IntermediateCode:
     types: list[Class]
     declarations: list[Declaration]
+    constants: dict[str, str] = field(default_factory=dict)
 
 
 @dataclass
@@ -145,3 +149,83 @@ class TypedXmlElement:
 class SemanticAnalyzerOutput:
     typed_ast: TypedXmlElement
     types: list[set[ClassAttribute]]
+
+
+@dataclass
+class WriterOutput:
+    """
+    Reports which files the writer actually wrote, which were already up to date
+    and which stale files from the previous generation were removed
+    """
+
+    written: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BatchResult:
+    """
+    Reports the outcome of compiling a single file in batch mode
+    """
+
+    input_file: str
+    output_dir: str
+    output: WriterOutput | None = None
+    error: str | None = None
+    duration: float = 0.0
+
+
+@dataclass
+class BatchSummary:
+    results: list[BatchResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(result.error is None for result in self.results)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+
+@dataclass
+class StageStats:
+    """
+    Measurements of a single stage of the pipeline, see `compiler.instrumentation`
+    """
+
+    stage: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    # Bytes allocated at the peak of the stage on top of what was allocated before it
+    peak_memory: int = 0
+    items: int = 0
+    unit: str = ''
+
+
+@dataclass
+class TransitionCounters:
+    """
+    Counts the transitions of a state machine per pair of states, and the tokens it produced per kind
+    """
+
+    transitions: Counter[str] = field(default_factory=Counter)
+    tokens: Counter[str] = field(default_factory=Counter)
+
+    def wrap(self, state_machine: Callable) -> Callable:
+        """
+        Wraps a StateTransition of the scanner or the parser. Counting only happens
+        through the returned function, so the state machines cost nothing more without it.
+        """
+        transitions, tokens = self.transitions, self.tokens
+
+        def counted(state, item):
+            new_state, token = state_machine(state, item)
+            transitions[f'{state.state_name} -> {new_state.state_name}'] += 1
+            if token:
+                tokens[type(token).__name__] += 1
+            return new_state, token
+
+        return counted
@@ -0,0 +1,101 @@
+from collections import Counter
+from dataclasses import replace
+
+from compiler.code_gen import constant_declaration, constant_reference, csharp_string_literal
+from compiler.models import IntermediateCode
+
+
+def pooling_saves_space(value: str, field_name: str, count: int) -> bool:
+    # Line breaks included, C# interns the literals anyway so size is the only gain
+    inline = count * len(csharp_string_literal(value))
+    pooled = len(constant_declaration(field_name, value)) + 1 + count * len(constant_reference(field_name))
+    return inline > pooled
+
+
+def pool_constants(intermediate_code: IntermediateCode, min_occurrences: int = 2) -> IntermediateCode:
+    """
+    Hoists string values that are repeated across declarations into a constant pool.
+
+    Every string value used at least `min_occurrences` times gets a field name assigned,
+    in order of first appearance, when its field and references are shorter than the
+    literals they replace. The code generator emits those values once as
+    `static readonly string` fields and references them from Main.cs.
+
+    Args:
+        intermediate_code (IntermediateCode): The intermediate code to optimize.
+        min_occurrences (int): How many times a value has to appear to be pooled.
+
+    Returns:
+        IntermediateCode: The same intermediate code with `constants` populated.
+    """
+    attribute_types = {
+        (_type.name, attr.name): attr.attribute_type for _type in intermediate_code.types for attr in _type.attributes
+    }
+    occurrences = Counter(
+        attr.value
+        for decl in intermediate_code.declarations
+        if not decl.is_list
+        for attr in decl.attributes or []
+        if attr.ref is None
+        and attr.value is not None
+        and attribute_types.get((decl.class_name, attr.name), 'string') == 'string'
+    )
+    constants = {}
+    for value, count in occurrences.items():
+        field_name = f'Str{len(constants)}'
+        if count >= min_occurrences and pooling_saves_space(value, field_name, count):
+            constants[value] = field_name
+    return replace(intermediate_code, constants=constants)
+
+
+def deduplicate_declarations(intermediate_code: IntermediateCode) -> IntermediateCode:
+    """
+    Shares structurally identical declarations using value numbering.
+
+    Declarations are visited in topological order and numbered by their class,
+    values and (already numbered) references, so whole identical subgraphs
+    collapse onto the first instance built. Duplicates that are only referenced
+    by other declarations are dropped and the references redirected, while named
+    top-level duplicates become aliases of the shared instance.
+
+    Sharing is only safe for immutable instances, the classes generated with it
+    must declare their properties init-only (`code_gen(..., init_only=True)`).
+
+    Args:
+        intermediate_code (IntermediateCode): The intermediate code to optimize.
+
+    Returns:
+        IntermediateCode: The intermediate code with duplicate declarations shared.
+    """
+    referenced = set(
+        attr.ref for decl in intermediate_code.declarations for attr in decl.attributes or [] if attr.ref is not None
+    )
+    value_numbers: dict[tuple, str] = {}
+    canonical_ids: dict[str, str] = {}
+    declarations = []
+
+    for decl in intermediate_code.declarations:
+        if decl.attributes:
+            attributes = [
+                replace(attr, ref=canonical_ids[attr.ref]) if attr.ref in canonical_ids else attr
+                for attr in decl.attributes
+            ]
+            decl = replace(decl, attributes=attributes)
+        if decl.is_list or decl.ref is not None:
+            declarations.append(decl)
+            continue
+
+        key = (
+            decl.class_name,
+            tuple(sorted(((attr.name, attr.value, attr.ref) for attr in decl.attributes or []), key=lambda x: x[0])),
+        )
+        existing_id = value_numbers.get(key)
+        if existing_id is None:
+            value_numbers[key] = decl.id
+            declarations.append(decl)
+        elif decl.id in referenced:
+            canonical_ids[decl.id] = existing_id
+        else:
+            declarations.append(replace(decl, attributes=None, ref=existing_id))
+
+    return replace(intermediate_code, declarations=declarations)
@@ -13,6 +13,7 @@ from compiler.models import (
     Text,
     String,
     XmlElement,
+    TransitionCounters,
 )
 
 
@@ -121,17 +122,20 @@ class StateTransition:
         return handler(state, token)
 
 
-def build_xml_tokens(tokens: Iterable[BaseToken]) -> Iterable[XmlToken]:
+def build_xml_tokens(tokens: Iterable[BaseToken], counters: TransitionCounters | None = None) -> Iterable[XmlToken]:
     """
     Takes base tokens and generates xml tokens from them.
 
     Args:
         tokens (Iterable[BaseToken]): An iterable of tokens.
+        counters (TransitionCounters | None): Counts the transitions and xml tokens when given.
 
     Returns:
         Iterable of XmlTokens
     """
     state_machine = StateTransition()
+    if counters is not None:
+        state_machine = counters.wrap(state_machine)
     state = State(StateName.START_STATE)
 
     for base_token in tokens:
@@ -187,16 +191,17 @@ def build_ast(tokens: Iterable[XmlToken]) -> XmlElement:
     return children_stack[0][0]
 
 
-def parser(tokens: Iterable[BaseToken]) -> XmlElement:
+def parser(tokens: Iterable[BaseToken], counters: TransitionCounters | None = None) -> XmlElement:
     """
     Parses a stream of tokens into an Abstract Syntax Tree (AST).
 
     Args:
         tokens (Iterable[BaseToken]): An iterable of tokens.
+        counters (TransitionCounters | None): Counts the transitions and xml tokens when given.
 
     Returns:
         ast: root of ast
     """
-    xml_tokens = build_xml_tokens(tokens)
+    xml_tokens = build_xml_tokens(tokens, counters)
     ast = build_ast(xml_tokens)
     return ast
@@ -0,0 +1,83 @@
+import cProfile
+import os
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+# Allocations listed in the report of every stage
+DEFAULT_TOP_ALLOCATIONS = 25
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class StageProfiler:
+    """
+    Profiles every stage of the pipeline with cProfile and tracemalloc, writing to
+    `profile_dir` for each stage:
+
+    - `<stage>.pstats`: the profile, to be read with `pstats.Stats` or snakeviz.
+    - `<stage>.allocations.txt`: the lines that allocated the most memory during the
+      stage and kept it allocated until its end.
+
+    Tracing the allocations slows every allocation down, so the profile taken at the
+    same time attributes more time than is due to the functions allocating the most.
+    With `trace_allocations` off, only the profile is written, and its hot paths are
+    the ones of an untraced run.
+
+    Like with `compiler.instrumentation.Instrumentation`, the output of the lazy
+    source reader and scanner is collected into a list, so their work is not
+    profiled as part of the following stage.
+    """
+
+    def __init__(self, profile_dir: str, top: int = DEFAULT_TOP_ALLOCATIONS, trace_allocations: bool = True) -> None:
+        self.profile_dir = profile_dir
+        self.top = top
+        self.trace_allocations = trace_allocations
+
+    def wrap(self, stage: str, function: Callable) -> Callable:
+        def profiled(*args, **kwargs):
+            return self.profile(stage, function, *args, **kwargs)
+
+        return profiled
+
+    def run(self, function: Callable, *args, **kwargs) -> tuple[cProfile.Profile, Any]:
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            output = function(*args, **kwargs)
+            if isinstance(output, Iterator):
+                output = list(output)
+        finally:
+            profile.disable()
+        return profile, output
+
+    def profile(self, stage: str, function: Callable, *args, **kwargs) -> Any:
+        """
+        Runs the stage function, and writes its profile and allocations.
+        """
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if not self.trace_allocations:
+            profile, output = self.run(function, *args, **kwargs)
+            profile.dump_stats(os.path.join(self.profile_dir, f'{stage}.pstats'))
+            return output
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            profile, output = self.run(function, *args, **kwargs)
+            after = tracemalloc.take_snapshot()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        profile.dump_stats(os.path.join(self.profile_dir, f'{stage}.pstats'))
+        differences = after.filter_traces(SNAPSHOT_FILTERS).compare_to(before.filter_traces(SNAPSHOT_FILTERS), 'lineno')
+        with open(os.path.join(self.profile_dir, f'{stage}.allocations.txt'), 'w') as file:
+            file.write(f'Top {self.top} allocations of {stage}\n')
+            for difference in differences[: self.top]:
+                file.write(f'{difference}\n')
+        return output
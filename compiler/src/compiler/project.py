@@ -0,0 +1,121 @@
+import sys
+
+from compiler.batch import output_dirs
+from compiler.code_gen import code_gen, generate_main
+from compiler.default import pipe
+from compiler.inter_code_gen import inter_code_gen
+from compiler.models import IntermediateCode, WriterOutput
+from compiler.optimizer import deduplicate_declarations, pool_constants
+from compiler.parser import parser
+from compiler.reader import source_reader
+from compiler.scanner import scanner
+from compiler.schema_lock import SchemaLock
+from compiler.semantic_analyzer import project_semantic_analyzer
+from compiler.sinks import OutputSink, make_sink
+
+
+def main_filename(relative_path: str) -> str:
+    """
+    Names the Main file of an input, e.g. `pets/dog` -> `pets.dog.Main.cs`.
+    """
+    return '.'.join(relative_path.replace('\\', '/').split('/')) + '.Main.cs'
+
+
+def main_filenames(input_files: list[str]) -> list[str]:
+    """
+    Names the Main files of all inputs, e.g. `pets/dog.xml` -> `pets.dog.Main.cs`.
+
+    Raises:
+        ValueError: When two inputs get the same name, e.g. `pets/dog.xml` and `pets.dog.xml`.
+    """
+    relative_paths = output_dirs(input_files, '')
+    filenames = [main_filename(relative_paths[input_file]) for input_file in input_files]
+    inputs_by_filename = {}
+    for input_file, filename in zip(input_files, filenames):
+        if filename in inputs_by_filename:
+            raise ValueError(f'{inputs_by_filename[filename]} and {input_file} would both be compiled into {filename}')
+        inputs_by_filename[filename] = input_file
+    return filenames
+
+
+def project_code_gen(
+    intermediate_codes: dict[str, IntermediateCode],
+    constant_pool: bool = False,
+    constant_pool_min_occurrences: int = 2,
+    shared_base: bool = False,
+    init_only: bool = False,
+) -> dict[str, str]:
+    """
+    Generates the shared classes once and a Main file for every input.
+
+    Args:
+        intermediate_codes (dict[str, IntermediateCode]): Intermediate code of every input
+            by its Main filename, all of them with the same types.
+        constant_pool (bool): Pool the values repeated across all inputs into a single Constants class.
+        constant_pool_min_occurrences (int): How many times a value has to repeat to be pooled.
+        shared_base (bool): Emit the boilerplate methods once in a common base class.
+        init_only (bool): Declare the properties init-only, for deduplicated declarations.
+
+    Returns:
+        Dict[str, str]: A mapping from filenames to their C# code content.
+    """
+    types = next(iter(intermediate_codes.values())).types if intermediate_codes else []
+    declarations = [decl for code in intermediate_codes.values() for decl in code.declarations]
+    constants = {}
+    if constant_pool:
+        constants = pool_constants(IntermediateCode(types, declarations), constant_pool_min_occurrences).constants
+
+    code_files = code_gen(IntermediateCode(types, [], constants), shared_base=shared_base, init_only=init_only)
+    del code_files['Main.cs']
+    for filename, intermediate_code in intermediate_codes.items():
+        code_files[filename] = generate_main(intermediate_code.declarations, types, constants)
+    return code_files
+
+
+def project_compiler(
+    input_files: list[str],
+    output_dir: str,
+    constant_pool: bool = False,
+    constant_pool_min_occurrences: int = 2,
+    deduplicate: bool = False,
+    shared_base: bool = False,
+    infer_types: bool = False,
+    sink: OutputSink | str = 'filesystem',
+    schema_lock: str | None = None,
+    raise_errors: bool = False,
+    **writer_options,
+) -> WriterOutput | None:
+    """
+    Compiles many XML files into one set of classes. Elements of the same shape get
+    the same class in every file, and every file gets its own Main file. With
+    `schema_lock`, the class names are kept stable between runs through the lock file.
+
+    Errors are printed and None is returned, unless `raise_errors` is set. They are
+    printed to the standard error when the output is streamed to the standard output.
+    """
+    if isinstance(sink, str):
+        sink = make_sink(sink, output_dir, **writer_options)
+    try:
+        filenames = main_filenames(input_files)
+        lock = SchemaLock.load(schema_lock) if schema_lock is not None else None
+        front_end = pipe(source_reader, scanner, parser)
+        asts = [front_end(input_file) for input_file in input_files]
+
+        intermediate_codes = {}
+        for filename, semantic_output in zip(filenames, project_semantic_analyzer(asts, infer_types, lock)):
+            intermediate_code = inter_code_gen(semantic_output, schema_lock=lock)
+            if deduplicate:
+                intermediate_code = deduplicate_declarations(intermediate_code)
+            intermediate_codes[filename] = intermediate_code
+
+        if lock is not None:
+            lock.save(schema_lock)
+
+        file_map = project_code_gen(
+            intermediate_codes, constant_pool, constant_pool_min_occurrences, shared_base, init_only=deduplicate
+        )
+        return sink.write(file_map)
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f'Exception occurred: {type(e).__name__} - {e}', file=sys.stderr if output_dir == '-' else sys.stdout)
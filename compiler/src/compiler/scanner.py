@@ -7,7 +7,10 @@ from compiler.errors import (
     UnexpectedNumericError,
     QuoteFollowedByNonWhitespaceError,
 )
-from compiler.models import BaseToken, Symbol, Text, String
+from compiler.models import BaseToken, Symbol, Text, String, TransitionCounters
+
+
+SYMBOLS = {'<', '</', '>', '/>', '='}
 
 
 class StateName(StrEnum):
@@ -134,18 +137,20 @@ class StateTransition:
         raise QuoteFollowedByNonWhitespaceError('Quote followed by non-whitespace character in STRING_END.')
 
 
-def scanner(chars: Iterable[str]) -> Iterable[BaseToken]:
+def scanner(chars: Iterable[str], counters: TransitionCounters | None = None) -> Iterable[BaseToken]:
     """
     Converts a stream of characters into tokens using a state machine.
 
     Args:
         chars (Iterable[str]): An iterable stream of INDIVIDUAL characters.
+        counters (TransitionCounters | None): Counts the transitions and tokens when given.
 
     Yields:
         Token: The next token in the stream.
     """
-    symbols = {'<', '</', '>', '/>', '='}
-    state_machine = StateTransition(symbols)
+    state_machine = StateTransition(SYMBOLS)
+    if counters is not None:
+        state_machine = counters.wrap(state_machine)
     state = State(StateName.START_STATE)
 
     for char in chars:
@@ -157,3 +162,25 @@ def scanner(chars: Iterable[str]) -> Iterable[BaseToken]:
     state, token = state_machine(state, '\0')  # Use a null character to represent EOF
     if token:
         yield token
+
+
+def scanner_with_offsets(chars: Iterable[str]) -> Iterable[tuple[BaseToken, int]]:
+    """
+    Works like `scanner`, and also yields the offset right after the end of every token.
+
+    A token is only complete once the character following it is seen, so the offset
+    of that character is the end of the token.
+    """
+    state_machine = StateTransition(SYMBOLS)
+    state = State(StateName.START_STATE)
+
+    offset = -1
+    for offset, char in enumerate(chars):
+        state, token = state_machine(state, char)
+        if token:
+            yield token, offset
+
+    # The EOF comes right after the last character
+    state, token = state_machine(state, '\0')
+    if token:
+        yield token, offset + 1
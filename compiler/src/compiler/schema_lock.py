@@ -0,0 +1,97 @@
+import json
+import os
+import re
+
+from compiler.errors import SchemaLockError
+from compiler.writer import write_file
+
+SCHEMA_LOCK_VERSION = 1
+CLASS_NAME_PATTERN = re.compile(r'Class([0-9]+)')
+
+# A type is identified by the sorted names of its attributes
+Signature = tuple[str, ...]
+
+
+class SchemaLock:
+    """
+    Persists the class name assigned to every type signature, so a class keeps its
+    name between runs however the other types change. Names of types that are no
+    longer generated stay reserved and are never given to another signature.
+    """
+
+    def __init__(self, classes: dict[Signature, str] | None = None, active: set[str] | None = None) -> None:
+        self.classes: dict[Signature, str] = dict(classes or {})
+        # Classes generated by the last run
+        self.active: set[str] = set(active or ())
+
+    @classmethod
+    def load(cls, path: str) -> 'SchemaLock':
+        """
+        Reads the lock file, a missing file is an empty lock.
+        """
+        try:
+            with open(path, 'rb') as file:
+                content = json.load(file)
+        except FileNotFoundError:
+            return cls()
+        except ValueError as e:
+            raise SchemaLockError(f'Schema lock {path} is not valid JSON: {e}') from e
+        if not isinstance(content, dict) or content.get('version') != SCHEMA_LOCK_VERSION:
+            raise SchemaLockError(f'Schema lock {path} has an unsupported version')
+        classes = {tuple(entry['attributes']): entry['name'] for entry in content.get('classes', [])}
+        active = {entry['name'] for entry in content.get('classes', []) if entry.get('active')}
+        return cls(classes, active)
+
+    def dumps(self) -> str:
+        entries = [
+            {'name': name, 'attributes': list(signature), 'active': name in self.active}
+            for signature, name in sorted(self.classes.items(), key=lambda item: class_number(item[1]))
+        ]
+        return json.dumps({'version': SCHEMA_LOCK_VERSION, 'classes': entries}, indent=2) + '\n'
+
+    def save(self, path: str) -> None:
+        """
+        Writes the lock file atomically, unless it already holds the same content.
+        """
+        data = self.dumps().encode()
+        try:
+            with open(path, 'rb') as file:
+                if file.read() == data:
+                    return
+        except FileNotFoundError:
+            pass
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write_file(path, data, atomic=True)
+
+    def active_signatures(self) -> set[Signature]:
+        return {signature for signature, name in self.classes.items() if name in self.active}
+
+    def assign(self, signatures: list[Signature]) -> list[str]:
+        """
+        Names the classes of the given signatures, reusing the locked names and giving
+        new signatures the numbers following the highest one ever used.
+
+        Returns:
+            list[str]: Class names in the order of the signatures.
+        """
+        next_number = max((class_number(name) for name in self.classes.values()), default=0) + 1
+        names = []
+        for signature in signatures:
+            name = self.classes.get(signature)
+            if name is None:
+                name = self.classes[signature] = f'Class{next_number}'
+                next_number += 1
+            names.append(name)
+        self.active = set(names)
+        return names
+
+
+def class_number(name: str) -> int:
+    match = CLASS_NAME_PATTERN.fullmatch(name)
+    return int(match.group(1)) if match else 0
+
+
+def type_signature(attributes) -> Signature:
+    return tuple(sorted(attr.name for attr in attributes))
@@ -1,13 +1,85 @@
+import math
+import re
+from decimal import Decimal
+
 from compiler.models import ClassAttribute, TypedXmlElement, XmlElement, SemanticAnalyzerOutput
 from compiler.errors import SemanticError
+from compiler.schema_lock import SchemaLock, type_signature
+
+INTEGER_PATTERN = re.compile(r'[+-]?[0-9]+')
+REAL_PATTERN = re.compile(r'[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?')
+BOOLEAN_VALUES = ('true', 'false')
+# Zeros before the first digit, e.g. in zip codes, that a number literal would drop
+LEADING_ZEROS_PATTERN = re.compile(r'-?0[0-9]')
+# Numeric types ordered from the narrowest to the widest
+NUMERIC_TYPES = ('int', 'long', 'double')
+
+
+def infer_value_type(value: str) -> str:
+    """
+    Identify the narrowest C# type that can represent the given attribute value.
+
+    Examples:
+        '42' -> 'int', '4294967296' -> 'long', '2.5' -> 'double', 'true' -> 'bool', 'Tom' -> 'string'
+
+    Numbers whose literal would not read back as the same text, e.g. '00501', '+12'
+    or more digits than a double holds, stay strings.
+    """
+    if value in BOOLEAN_VALUES:
+        return 'bool'
+    if INTEGER_PATTERN.fullmatch(value):
+        number = int(value)
+        if str(number) != value:
+            return 'string'
+        if -(2**31) <= number < 2**31:
+            return 'int'
+        if -(2**63) <= number < 2**63:
+            return 'long'
+        # Too big for any integer type, keep the exact digits
+        return 'string'
+    if REAL_PATTERN.fullmatch(value) and math.isfinite(float(value)):
+        if value.startswith('+') or LEADING_ZEROS_PATTERN.match(value):
+            return 'string'
+        if not exact_double(value):
+            return 'string'
+        return 'double'
+    return 'string'
+
+
+def exact_double(value: str) -> bool:
+    """
+    Tell whether the number reads back unchanged from the double literal printed for it.
+
+    Examples:
+        '2.5' -> True, '9007199254740992' -> True, '9007199254740993' -> False
+    """
+    return Decimal(value) == Decimal(repr(float(value)))
+
+
+def widen_type(first: str, second: str) -> str:
+    """
+    Return the narrowest type able to hold values of both types.
+
+    Examples:
+        ('int', 'long') -> 'long', ('int', 'double') -> 'double', ('bool', 'int') -> 'string'
+    """
+    if first == second:
+        return first
+    if first in NUMERIC_TYPES and second in NUMERIC_TYPES:
+        return max(first, second, key=NUMERIC_TYPES.index)
+    return 'string'
 
 
 class SemanticAnalyzer:
-    def __init__(self, root_element: XmlElement) -> None:
+    def __init__(
+        self, root_element: XmlElement, infer_types: bool = False, schema_lock: SchemaLock | None = None
+    ) -> None:
         assert root_element.element_name == 'root', 'The tree must start with a root node.'
         self.identified_types: list[set[ClassAttribute]] = []
         self.element_names: list[str] = []
         self.root = root_element
+        self.infer_types = infer_types
+        self.schema_lock = schema_lock
 
     def analyze(self):
         """
@@ -21,8 +93,48 @@ class SemanticAnalyzer:
 
         typed_ast = self.verify_and_build_typed_ast(self.root, strict=True)
 
+        if self.infer_types:
+            self.infer_attribute_types(typed_ast)
+
         return typed_ast
 
+    def infer_attribute_types(self, typed_ast: TypedXmlElement):
+        """
+        Replace the 'string' type of each class attribute with the narrowest type
+        that holds every value observed for it across all instances of the class.
+
+        Integers widened to double must be exact doubles, the attribute stays a
+        string otherwise, e.g. for '9007199254740993' and '1.5'.
+        """
+        observed: dict[tuple[int, str], str] = {}
+        # Attributes with an integer value that a double would round
+        inexact: set[tuple[int, str]] = set()
+
+        def rec(element: TypedXmlElement):
+            if element.identified_role == 'declaration':
+                for attr in element.attributes or []:
+                    key = (element.identified_type, attr.name)
+                    value_type = infer_value_type(attr.value)
+                    observed[key] = widen_type(observed[key], value_type) if key in observed else value_type
+                    if value_type in ('int', 'long') and not exact_double(attr.value):
+                        inexact.add(key)
+            for child in element.children or []:
+                rec(child)
+
+        rec(typed_ast)
+
+        for key in inexact:
+            if observed[key] == 'double':
+                observed[key] = 'string'
+
+        for i, attrs in enumerate(self.identified_types):
+            self.identified_types[i] = set(
+                ClassAttribute(attr.name, observed.get((i, attr.name), 'string'))
+                if attr.attribute_type == 'string'
+                else attr
+                for attr in attrs
+            )
+
     def minimize_types(self):
         """
         Given a list of sets, produce smaller list of sets that will contain all subsets in that list
@@ -36,15 +148,23 @@ class SemanticAnalyzer:
 
             input: [{'a', 'b'}, {'a', 'b'}]
             output: [{'a', 'b'}]
+
+        When the types are exactly the ones the schema lock recorded for the previous
+        run, they are already minimal and the pairwise comparison is skipped.
         """
         minimized = set(frozenset(s) for s in self.identified_types)
         to_remove = set()
 
-        for s1 in minimized:
-            for s2 in minimized:
-                if s1 != s2 and s1.issubset(s2):
-                    to_remove.add(s1)
-                    break
+        is_locked = (
+            self.schema_lock is not None
+            and set(type_signature(s) for s in minimized) == self.schema_lock.active_signatures()
+        )
+        if not is_locked:
+            for s1 in minimized:
+                for s2 in minimized:
+                    if s1 != s2 and s1.issubset(s2):
+                        to_remove.add(s1)
+                        break
 
         self.identified_types = [set(s) for s in minimized if s not in to_remove]
 
@@ -189,13 +309,72 @@ class SemanticAnalyzer:
         )
 
 
-def semantic_analyzer(ast: XmlElement) -> SemanticAnalyzerOutput:
+class ProjectSemanticAnalyzer(SemanticAnalyzer):
+    """
+    Analyzes the trees of many files against a single table of types, so elements of
+    the same shape get the same type in every file. Element names only have to be
+    unique within a single file.
+    """
+
+    def __init__(
+        self, root_elements: list[XmlElement], infer_types: bool = False, schema_lock: SchemaLock | None = None
+    ) -> None:
+        for root_element in root_elements:
+            assert root_element.element_name == 'root', 'The tree must start with a root node.'
+        self.identified_types: list[set[ClassAttribute]] = []
+        self.element_names: list[str] = []
+        self.roots = root_elements
+        self.infer_types = infer_types
+        self.schema_lock = schema_lock
+
+    def analyze_all(self) -> list[TypedXmlElement]:
+        """
+        Performs the analysis of every tree, with the same passes as `SemanticAnalyzer.analyze`.
+        """
+        for root in self.roots:
+            self.element_names = []
+            self.verify_and_build_typed_ast(root)
+
+        self.minimize_types()
+
+        typed_asts = []
+        for root in self.roots:
+            self.element_names = []
+            typed_asts.append(self.verify_and_build_typed_ast(root, strict=True))
+
+        if self.infer_types:
+            # Values observed in all files decide the type of an attribute
+            self.infer_attribute_types(TypedXmlElement('root', -1, 'root', children=typed_asts))
+
+        return typed_asts
+
+
+def project_semantic_analyzer(
+    asts: list[XmlElement], infer_types: bool = False, schema_lock: SchemaLock | None = None
+) -> list[SemanticAnalyzerOutput]:
+    """
+    Analyzes the ASTs of many files at once. The outputs share a single list of types.
+    """
+    project_analyzer = ProjectSemanticAnalyzer(asts, infer_types=infer_types, schema_lock=schema_lock)
+    typed_asts = project_analyzer.analyze_all()
+    types = project_analyzer.identified_types
+    return [SemanticAnalyzerOutput(typed_ast, types) for typed_ast in typed_asts]
+
+
+def semantic_analyzer(
+    ast: XmlElement, infer_types: bool = False, schema_lock: SchemaLock | None = None
+) -> SemanticAnalyzerOutput:
     """
     Takes in naive input of XmlElement and analyzes it for correctness.
     In the same time, it generates some Typed AST to make it easy for the later
     stages to do the work (since we already have done the work once)
+
+    With `infer_types`, attributes holding only numeric or boolean values are
+    typed accordingly instead of being strings.
+
+    With a `schema_lock`, the minimization of types is skipped when the types match it.
     """
-    semantic_analyzer = SemanticAnalyzer(ast)
+    semantic_analyzer = SemanticAnalyzer(ast, infer_types=infer_types, schema_lock=schema_lock)
 
     # Perform the semantic analysis
     typed_ast = semantic_analyzer.analyze()
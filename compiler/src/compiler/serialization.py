@@ -0,0 +1,333 @@
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Any, Callable
+
+from compiler.errors import SerializationError
+from compiler.models import (
+    Class,
+    ClassAttribute,
+    Declaration,
+    ElementAttribute,
+    InstanceAttribute,
+    IntermediateCode,
+    SemanticAnalyzerOutput,
+    TypedXmlElement,
+    XmlElement,
+)
+
+# Layout: magic, version, kind, the width of the ints, the sizes of the sections, the
+# string lengths, the flat int array describing the nodes in preorder and the UTF-8
+# encoded string table. Strings are referenced by their index in the table, 0 stands for None.
+MAGIC = b'ECOTEBIN'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sBBBIII')
+# The ints are stored in the narrowest of these array typecodes that fits them all
+INT_TYPECODES = ('b', 'h', 'i', 'q')
+
+KIND_XML_ELEMENT = 1
+KIND_TYPED_XML_ELEMENT = 2
+KIND_SEMANTIC_ANALYZER_OUTPUT = 3
+KIND_INTERMEDIATE_CODE = 4
+KIND_FILE_MAP = 5
+
+# Node flags
+HAS_ATTRIBUTES = 1
+HAS_CHILDREN = 2
+IS_LIST = 4
+HAS_CLASS = 8
+HAS_REF = 16
+STRING_TYPE = 32
+
+
+class Encoder:
+    """
+    Flattens the models into an interned string table and an array of ints.
+    """
+
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.ints: list[int] = []
+
+    def string(self, value: str | None) -> int:
+        if value is None:
+            return 0
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings) + 1
+        return index
+
+    def element_attributes(self, attributes: list[ElementAttribute]) -> None:
+        string, ints = self.string, self.ints
+        ints.append(len(attributes))
+        for attribute in attributes:
+            ints.append(string(attribute.name))
+            ints.append(string(attribute.value))
+
+    def xml_element(self, element: XmlElement) -> None:
+        ints = self.ints
+        flags = (HAS_ATTRIBUTES if element.attributes is not None else 0) | (
+            HAS_CHILDREN if element.children is not None else 0
+        )
+        ints.append(flags)
+        ints.append(self.string(element.element_name))
+        if element.attributes is not None:
+            self.element_attributes(element.attributes)
+        if element.children is not None:
+            ints.append(len(element.children))
+            for child in element.children:
+                self.xml_element(child)
+
+    def class_(self, cls: Class) -> None:
+        string, ints = self.string, self.ints
+        ints.append(string(cls.name))
+        ints.append(len(cls.attributes))
+        for attribute in cls.attributes:
+            ints.append(string(attribute.name))
+            ints.append(string(attribute.attribute_type))
+
+    def typed_xml_element(self, element: TypedXmlElement) -> None:
+        ints = self.ints
+        string_type = isinstance(element.identified_type, str)
+        flags = (
+            (HAS_ATTRIBUTES if element.attributes is not None else 0)
+            | (HAS_CHILDREN if element.children is not None else 0)
+            | (IS_LIST if element.is_list else 0)
+            | (HAS_CLASS if element.identified_class is not None else 0)
+            | (STRING_TYPE if string_type else 0)
+        )
+        ints.append(flags)
+        ints.append(self.string(element.element_name))
+        ints.append(self.string(element.identified_type) if string_type else element.identified_type)
+        ints.append(self.string(element.identified_role))
+        if element.attributes is not None:
+            self.element_attributes(element.attributes)
+        if element.identified_class is not None:
+            self.class_(element.identified_class)
+        if element.children is not None:
+            ints.append(len(element.children))
+            for child in element.children:
+                self.typed_xml_element(child)
+
+    def semantic_analyzer_output(self, output: SemanticAnalyzerOutput) -> None:
+        string, ints = self.string, self.ints
+        self.typed_xml_element(output.typed_ast)
+        ints.append(len(output.types))
+        for attributes in output.types:
+            ints.append(len(attributes))
+            for attribute in attributes:
+                ints.append(string(attribute.name))
+                ints.append(string(attribute.attribute_type))
+
+    def declaration(self, declaration: Declaration) -> None:
+        string, ints = self.string, self.ints
+        flags = (
+            (HAS_ATTRIBUTES if declaration.attributes is not None else 0)
+            | (IS_LIST if declaration.is_list else 0)
+            | (HAS_REF if declaration.ref is not None else 0)
+        )
+        ints.append(flags)
+        ints.append(string(declaration.id))
+        ints.append(string(declaration.instance_name))
+        ints.append(string(declaration.class_name))
+        if declaration.ref is not None:
+            ints.append(string(declaration.ref))
+        if declaration.attributes is not None:
+            ints.append(len(declaration.attributes))
+            for attribute in declaration.attributes:
+                ints.append(string(attribute.name))
+                ints.append(string(attribute.value))
+                ints.append(string(attribute.ref))
+                ints.append(IS_LIST if attribute.is_list else 0)
+
+    def intermediate_code(self, intermediate_code: IntermediateCode) -> None:
+        string, ints = self.string, self.ints
+        ints.append(len(intermediate_code.types))
+        for cls in intermediate_code.types:
+            self.class_(cls)
+        ints.append(len(intermediate_code.declarations))
+        for declaration in intermediate_code.declarations:
+            self.declaration(declaration)
+        ints.append(len(intermediate_code.constants))
+        for value, name in intermediate_code.constants.items():
+            ints.append(string(value))
+            ints.append(string(name))
+
+    def file_map(self, file_map: dict[str, str]) -> None:
+        string, ints = self.string, self.ints
+        ints.append(len(file_map))
+        for filename, content in file_map.items():
+            ints.append(string(filename))
+            ints.append(string(content))
+
+
+class Decoder:
+    """
+    Rebuilds the models from the string table and the int array written by the Encoder.
+    """
+
+    def __init__(self, strings: list[str | None], ints: array) -> None:
+        self.strings = strings
+        self.read: Callable[[], int] = iter(ints).__next__
+
+    def string(self) -> str | None:
+        return self.strings[self.read()]
+
+    def element_attributes(self) -> list[ElementAttribute]:
+        read, strings = self.read, self.strings
+        return [ElementAttribute(strings[read()], strings[read()]) for _ in range(read())]
+
+    def xml_element(self) -> XmlElement:
+        read = self.read
+        flags = read()
+        element_name = self.strings[read()]
+        attributes = self.element_attributes() if flags & HAS_ATTRIBUTES else None
+        children = [self.xml_element() for _ in range(read())] if flags & HAS_CHILDREN else None
+        return XmlElement(element_name, attributes, children)
+
+    def class_(self) -> Class:
+        read, strings = self.read, self.strings
+        name = strings[read()]
+        return Class(name, [ClassAttribute(strings[read()], strings[read()]) for _ in range(read())])
+
+    def typed_xml_element(self) -> TypedXmlElement:
+        read, strings = self.read, self.strings
+        flags = read()
+        element_name = strings[read()]
+        identified_type = strings[read()] if flags & STRING_TYPE else read()
+        identified_role = strings[read()]
+        attributes = self.element_attributes() if flags & HAS_ATTRIBUTES else None
+        identified_class = self.class_() if flags & HAS_CLASS else None
+        children = [self.typed_xml_element() for _ in range(read())] if flags & HAS_CHILDREN else None
+        return TypedXmlElement(
+            element_name,
+            identified_type,
+            identified_role,
+            children,
+            attributes,
+            identified_class,
+            bool(flags & IS_LIST),
+        )
+
+    def semantic_analyzer_output(self) -> SemanticAnalyzerOutput:
+        read, strings = self.read, self.strings
+        typed_ast = self.typed_xml_element()
+        types = [{ClassAttribute(strings[read()], strings[read()]) for _ in range(read())} for _ in range(read())]
+        return SemanticAnalyzerOutput(typed_ast, types)
+
+    def declaration(self) -> Declaration:
+        read, strings = self.read, self.strings
+        flags = read()
+        id, instance_name, class_name = strings[read()], strings[read()], strings[read()]
+        ref = strings[read()] if flags & HAS_REF else None
+        attributes = None
+        if flags & HAS_ATTRIBUTES:
+            attributes = [
+                InstanceAttribute(strings[read()], strings[read()], strings[read()], bool(read() & IS_LIST))
+                for _ in range(read())
+            ]
+        return Declaration(id, instance_name, class_name, attributes, bool(flags & IS_LIST), ref)
+
+    def intermediate_code(self) -> IntermediateCode:
+        read, strings = self.read, self.strings
+        types = [self.class_() for _ in range(read())]
+        declarations = [self.declaration() for _ in range(read())]
+        constants = {strings[read()]: strings[read()] for _ in range(read())}
+        return IntermediateCode(types, declarations, constants)
+
+    def file_map(self) -> dict[str, str]:
+        read, strings = self.read, self.strings
+        return {strings[read()]: strings[read()] for _ in range(read())}
+
+
+KINDS: dict[type, tuple[int, str]] = {
+    XmlElement: (KIND_XML_ELEMENT, 'xml_element'),
+    TypedXmlElement: (KIND_TYPED_XML_ELEMENT, 'typed_xml_element'),
+    SemanticAnalyzerOutput: (KIND_SEMANTIC_ANALYZER_OUTPUT, 'semantic_analyzer_output'),
+    IntermediateCode: (KIND_INTERMEDIATE_CODE, 'intermediate_code'),
+    dict: (KIND_FILE_MAP, 'file_map'),
+}
+KIND_METHODS = {kind: method for kind, method in KINDS.values()}
+
+
+def little_endian(values: array) -> array:
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def int_typecode(values: list[int]) -> str:
+    low, high = min(values, default=0), max(values, default=0)
+    for typecode in INT_TYPECODES:
+        limit = 1 << (8 * array(typecode).itemsize - 1)
+        if -limit <= low and high < limit:
+            return typecode
+    raise SerializationError('Value is too large to serialize')
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serializes an AST, a semantic analyzer output, an intermediate code or a file map.
+
+    Args:
+        value (Any): One of the models produced by the pipeline stages.
+
+    Returns:
+        bytes: The compact binary encoding, see `loads`.
+    """
+    if type(value) not in KINDS:
+        raise SerializationError(f'Cannot serialize {type(value).__name__}')
+    kind, method = KINDS[type(value)]
+    encoder = Encoder()
+    getattr(encoder, method)(value)
+    text = ''.join(encoder.strings)
+    lengths = little_endian(array('I', map(len, encoder.strings)))
+    typecode = int_typecode(encoder.ints)
+    ints = little_endian(array(typecode, encoder.ints))
+    blob = text.encode('utf-8', 'surrogatepass')
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, kind, INT_TYPECODES.index(typecode), len(lengths), len(ints), len(blob))
+    return b''.join((header, lengths.tobytes(), ints.tobytes(), blob))
+
+
+def loads(data: bytes) -> Any:
+    """
+    Deserializes the value serialized by `dumps`.
+    """
+    if len(data) < HEADER.size:
+        raise SerializationError('Data is too short to hold a serialized value')
+    magic, version, kind, int_width, string_count, int_count, blob_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SerializationError('Data is not a serialized compiler value')
+    if version != FORMAT_VERSION:
+        raise SerializationError(f'Unsupported serialization format version: {version}')
+    if kind not in KIND_METHODS or int_width >= len(INT_TYPECODES):
+        raise SerializationError('Serialized data is corrupted')
+    ints = array(INT_TYPECODES[int_width])
+    ints_offset = HEADER.size + 4 * string_count
+    blob_offset = ints_offset + ints.itemsize * int_count
+    if len(data) != blob_offset + blob_size:
+        raise SerializationError('Serialized data is truncated')
+
+    lengths = array('I')
+    lengths.frombytes(data[HEADER.size : ints_offset])
+    ints.frombytes(data[ints_offset:blob_offset])
+    text = data[blob_offset:].decode('utf-8', 'surrogatepass')
+    offsets = [0, *accumulate(little_endian(lengths))]
+    strings = [None, *(text[start:end] for start, end in zip(offsets, offsets[1:]))]
+
+    decoder = Decoder(strings, little_endian(ints))
+    try:
+        return getattr(decoder, KIND_METHODS[kind])()
+    except (StopIteration, IndexError) as e:
+        raise SerializationError('Serialized data is corrupted') from e
+
+
+def save(path: str, value: Any) -> None:
+    with open(path, 'wb') as file:
+        file.write(dumps(value))
+
+
+def load(path: str) -> Any:
+    with open(path, 'rb') as file:
+        return loads(file.read())
@@ -1,8 +1,193 @@
-from pydantic_settings import BaseSettings, CliPositionalArg
-from pydantic import Field
+import argparse
+import functools
+import os
+import re
+import sys
+import types
+from typing import Callable
 
+INPUT_FILE_DESCRIPTION = 'Path to input XML file, or a directory or glob pattern of files to compile in batch'
 
-class Settings(BaseSettings, cli_parse_args=True):
-    input_file: CliPositionalArg[str] = Field(..., description='Path to input XML file')
-    output_dir: str = Field('generated', description='Directory to output C# code')
-    max_function: str = Field('writer', description='what is the last function that we want to trigger')
+# Type, default value and description of every option. The pydantic Settings class is
+# built from this table, it is only imported when the command line needs it.
+OPTIONS: dict[str, tuple[type | types.UnionType, object, str]] = {
+    'output_dir': (str, 'generated', 'Directory to output C# code'),
+    'max_function': (str, 'writer', 'what is the last function that we want to trigger'),
+    'constant_pool': (bool, False, 'Hoist repeated string values into static readonly fields'),
+    'constant_pool_min_occurrences': (int, 2, 'How many times a value has to repeat to be pooled'),
+    'deduplicate': (
+        bool,
+        False,
+        'Share identical declarations as a single instance in Main.cs, with init-only properties',
+    ),
+    'shared_base': (bool, False, 'Emit boilerplate methods once in a shared GeneratedBase class'),
+    'infer_types': (bool, False, 'Type attributes as int, long, double or bool when all values allow it'),
+    'writer_jobs': (int, 1, 'Number of threads writing the output files'),
+    'atomic_write': (bool, False, 'Replace each output file atomically through a temporary file'),
+    'fsync': (str, 'none', 'When to fsync written files: none, file or full (files and directory)'),
+    'manifest': (bool, False, 'Track generated files in a manifest and remove stale ones'),
+    'sink': (str, 'filesystem', 'Output sink: filesystem, zip, tar, tar.gz or tar.xz'),
+    'cache_dir': (str | None, None, 'Directory of the build cache, disabled when not set'),
+    'cache_max_size': (int, 256 * 1024 * 1024, 'Size in bytes above which old cache entries are evicted'),
+    'artifacts_dir': (str | None, None, 'Directory to save the output of every stage to'),
+    'start_from': (str | None, None, 'Stage whose saved artifact is the input file, to resume after it'),
+    'jobs': (int, 1, 'Number of processes compiling files in batch mode'),
+    'project': (bool, False, 'Compile all input files against one shared set of classes'),
+    'schema_lock': (str | None, None, 'Lock file keeping class names stable between runs'),
+    'watch': (bool, False, 'Keep running and recompile the input files whenever they change'),
+    'watch_interval': (float, 0.5, 'Seconds between two checks of the watched files'),
+    'stats': (
+        str | None,
+        None,
+        'File to write the time and item count of every stage to as JSON, - for stderr',
+    ),
+    'stats_memory': (
+        bool,
+        False,
+        'Add the peak memory of every stage to the stats report, tracing it inflates the times',
+    ),
+    'count_transitions': (
+        bool,
+        False,
+        'Add the transitions of the scanner and parser state machines to the stats report',
+    ),
+    'profile_dir': (str | None, None, 'Directory to write a profile and the allocations of every stage to'),
+    'profile_allocations': (
+        bool,
+        True,
+        'Trace the allocations of the profiled stages, which skews the profile towards allocating code',
+    ),
+}
+
+# Spellings of the booleans accepted by pydantic
+TRUE_VALUES = ('1', 'on', 't', 'true', 'y', 'yes')
+FALSE_VALUES = ('0', 'off', 'f', 'false', 'n', 'no')
+# ASCII digits only, `\d` would also accept digits of other scripts that pydantic rejects
+INTEGER = re.compile(r'[+-]?[0-9]+')
+DECIMAL = re.compile(r'[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?')
+
+
+def parse_bool(value: str) -> bool:
+    if value.lower() in TRUE_VALUES:
+        return True
+    if value.lower() in FALSE_VALUES:
+        return False
+    raise ValueError(f'Invalid boolean {value!r}')
+
+
+def parse_int(value: str) -> int:
+    if not INTEGER.fullmatch(value):
+        raise ValueError(f'Invalid integer {value!r}')
+    return int(value)
+
+
+def parse_float(value: str) -> float:
+    if not DECIMAL.fullmatch(value):
+        raise ValueError(f'Invalid number {value!r}')
+    return float(value)
+
+
+VALUE_PARSERS = {str: str, bool: parse_bool, int: parse_int, float: parse_float}
+
+
+def value_parser(option_type: type | types.UnionType) -> Callable[[str], object]:
+    if not isinstance(option_type, types.UnionType):
+        return VALUE_PARSERS[option_type]
+    # Optional values, pydantic reads `null` as None
+    (value_type,) = (argument for argument in option_type.__args__ if argument is not type(None))
+
+    def parse_optional(value: str):
+        if value == 'null':
+            raise ValueError('None values are left to pydantic')
+        return VALUE_PARSERS[value_type](value)
+
+    return parse_optional
+
+
+@functools.cache
+def settings_class() -> type:
+    """
+    Builds the pydantic Settings class from OPTIONS, importing pydantic.
+    """
+    from pydantic import Field
+    from pydantic_settings import BaseSettings, CliPositionalArg
+
+    namespace = {
+        '__module__': __name__,
+        '__annotations__': {
+            'input_file': CliPositionalArg[str],
+            **{name: option_type for name, (option_type, _, _) in OPTIONS.items()},
+        },
+        'input_file': Field(..., description=INPUT_FILE_DESCRIPTION),
+        **{name: Field(default, description=description) for name, (_, default, description) in OPTIONS.items()},
+    }
+    return types.new_class('Settings', (BaseSettings,), {'cli_parse_args': True}, lambda ns: ns.update(namespace))
+
+
+def __getattr__(name: str):
+    # `from compiler.settings import Settings` keeps working, importing pydantic on first use
+    if name == 'Settings':
+        return settings_class()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+class PlainArgumentParser(argparse.ArgumentParser):
+    """
+    Parser of the plain command lines, raising instead of exiting so the ones it
+    does not understand are left to pydantic.
+    """
+
+    def error(self, message: str):
+        raise ValueError(message)
+
+
+@functools.cache
+def plain_argument_parser() -> PlainArgumentParser:
+    arguments = PlainArgumentParser(add_help=False, allow_abbrev=False)
+    arguments.add_argument('input_file')
+    for name, (option_type, default, _) in OPTIONS.items():
+        arguments.add_argument(f'--{name}', type=value_parser(option_type), default=default)
+    return arguments
+
+
+def parse_plain_arguments(argv: list[str]) -> argparse.Namespace | None:
+    """
+    Parses the command line with argparse alone, the way pydantic would.
+
+    Returns:
+        argparse.Namespace | None: The settings, or None when the command line asks
+        for the help, sets options through environment variables, or is invalid.
+    """
+    if any(name.lower() in OPTIONS or name.lower() == 'input_file' for name in os.environ):
+        return None
+    try:
+        return plain_argument_parser().parse_args(argv)
+    except ValueError:
+        return None
+
+
+def changed_options(settings, names: tuple[str, ...]) -> list[str]:
+    """
+    Returns:
+        list[str]: The options among `names` set to something else than their default.
+    """
+    return [name for name in names if getattr(settings, name) != OPTIONS[name][1]]
+
+
+def load_settings(argv: list[str] | None = None):
+    """
+    Reads the settings from the command line. Plain command lines are parsed with
+    argparse, pydantic is only imported for the help, the environment variables and
+    the error messages.
+
+    Args:
+        argv (list[str] | None): The arguments, the ones of the process when not given.
+
+    Returns:
+        argparse.Namespace | Settings: The settings, with one attribute per option.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    settings = parse_plain_arguments(argv)
+    if settings is not None:
+        return settings
+    return settings_class()(_cli_parse_args=argv)
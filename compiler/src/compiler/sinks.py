@@ -0,0 +1,140 @@
+import io
+import sys
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+from compiler.models import WriterOutput
+from compiler.writer import writer
+
+# Archive members get a fixed timestamp, so identical outputs produce identical archives
+ARCHIVE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ARCHIVE_MTIME = 315532800
+ARCHIVE_FILE_MODE = 0o644
+# zipfile.ZIP_DEFLATED, the archive modules are only imported by the sinks writing archives
+ZIP_DEFLATED = 8
+
+STDOUT = '-'
+
+
+class OutputSink(ABC):
+    """
+    Represents a destination for the files generated by the compiler.
+    """
+
+    @abstractmethod
+    def write(self, file_map: dict[str, str]) -> WriterOutput:
+        """
+        Stores all generated files.
+
+        Args:
+            file_map (Dict[str, str]): A mapping from filenames to their C# code content.
+
+        Returns:
+            WriterOutput: The names of the stored files.
+        """
+
+
+class FileSystemSink(OutputSink):
+    """
+    Writes one file per generated class into a directory, see `compiler.writer.writer`.
+    """
+
+    def __init__(self, output_dir: str, **writer_options) -> None:
+        self.output_dir = output_dir
+        self.writer_options = writer_options
+
+    def write(self, file_map: dict[str, str]) -> WriterOutput:
+        return writer(file_map, output_dir=self.output_dir, **self.writer_options)
+
+
+class MemorySink(OutputSink):
+    """
+    Keeps the generated files in memory, in the `files` attribute.
+    """
+
+    def __init__(self) -> None:
+        self.files: dict[str, str] = {}
+
+    def write(self, file_map: dict[str, str]) -> WriterOutput:
+        self.files = dict(file_map)
+        return WriterOutput(written=list(file_map))
+
+
+class ZipSink(OutputSink):
+    """
+    Stores the generated files in a zip archive.
+    """
+
+    def __init__(self, target: str | BinaryIO, compression: int = ZIP_DEFLATED) -> None:
+        self.target = target
+        self.compression = compression
+
+    def write(self, file_map: dict[str, str]) -> WriterOutput:
+        import zipfile
+
+        with zipfile.ZipFile(self.target, 'w', compression=self.compression) as archive:
+            for filename, content in file_map.items():
+                info = zipfile.ZipInfo(filename, date_time=ARCHIVE_DATE_TIME)
+                info.compress_type = self.compression
+                info.external_attr = ARCHIVE_FILE_MODE << 16
+                archive.writestr(info, content.encode())
+        return WriterOutput(written=list(file_map))
+
+
+class TarSink(OutputSink):
+    """
+    Streams the generated files as a tar archive, to standard output when the target is '-'.
+    """
+
+    def __init__(self, target: str | BinaryIO = STDOUT, compression: str = '') -> None:
+        self.target = target
+        self.compression = compression
+
+    def write(self, file_map: dict[str, str]) -> WriterOutput:
+        import tarfile
+
+        mode = f'w|{self.compression}'
+        if self.target == STDOUT:
+            archive = tarfile.open(fileobj=sys.stdout.buffer, mode=mode)
+        elif isinstance(self.target, str):
+            archive = tarfile.open(self.target, mode=mode)
+        else:
+            archive = tarfile.open(fileobj=self.target, mode=mode)
+        with archive:
+            for filename, content in file_map.items():
+                data = content.encode()
+                info = tarfile.TarInfo(filename)
+                info.size = len(data)
+                info.mtime = ARCHIVE_MTIME
+                info.mode = ARCHIVE_FILE_MODE
+                archive.addfile(info, io.BytesIO(data))
+        if self.target == STDOUT:
+            sys.stdout.buffer.flush()
+        return WriterOutput(written=list(file_map))
+
+
+SINKS = ('filesystem', 'memory', 'zip', 'tar', 'tar.gz', 'tar.xz')
+
+
+def make_sink(kind: str, output: str, **writer_options) -> OutputSink:
+    """
+    Creates the output sink of the given kind.
+
+    Args:
+        kind (str): One of SINKS.
+        output (str): The output directory for the filesystem sink, the archive
+            path for the others ('-' streams a tar archive to standard output).
+        writer_options: Options of `compiler.writer.writer`, used by the filesystem sink.
+
+    Returns:
+        OutputSink: The sink.
+    """
+    if kind == 'filesystem':
+        return FileSystemSink(output, **writer_options)
+    if kind == 'memory':
+        return MemorySink()
+    if kind == 'zip':
+        return ZipSink(sys.stdout.buffer if output == STDOUT else output)
+    if kind in ('tar', 'tar.gz', 'tar.xz'):
+        return TarSink(output, compression=kind.removeprefix('tar').removeprefix('.'))
+    raise ValueError(f'Unknown output sink: {kind}, expected one of {SINKS}')
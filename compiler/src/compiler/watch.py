@@ -0,0 +1,115 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Callable
+
+from compiler.batch import expand_inputs, input_root, is_batch_input, output_dirs
+from compiler.default import compiler
+from compiler.incremental import CODE_OPTIONS, IncrementalCompiler
+from compiler.models import BatchResult
+
+DEFAULT_WATCH_INTERVAL = 0.5
+
+
+class Watcher:
+    """
+    Keeps recompiling the watched files whenever they change, in a single long-lived
+    process, so every recompile runs with the modules imported and the caches warm.
+
+    The files are polled: a file is only read when its size or modification time
+    changed, and only recompiled when its content changed too. Every file keeps its
+    own IncrementalCompiler, so only the parts of the output affected by an edit are
+    generated again.
+
+    The output directories mirror the layout of the files below the watched directory,
+    so they stay the same as files are added or removed.
+    """
+
+    def __init__(
+        self,
+        inputs: list[str],
+        output_dir: str,
+        on_result: Callable[[BatchResult], None] | None = None,
+        **compiler_options,
+    ) -> None:
+        self.inputs = inputs
+        self.output_dir = output_dir
+        self.root = input_root(inputs)
+        self.on_result = on_result
+        self.compiler_options = compiler_options
+        self.compiler_options.setdefault('max_func', 'writer')
+        # Size and modification time, and the hash of the content of every compiled file
+        self.stats: dict[str, tuple[int, int]] = {}
+        self.hashes: dict[str, str] = {}
+        self.engines: dict[str, IncrementalCompiler] = {}
+
+    def engine(self, input_file: str) -> IncrementalCompiler:
+        if input_file not in self.engines:
+            code_options = {name: value for name, value in self.compiler_options.items() if name in CODE_OPTIONS}
+            self.engines[input_file] = IncrementalCompiler(**code_options)
+        return self.engines[input_file]
+
+    def destinations(self) -> dict[str, str]:
+        if len(self.inputs) == 1 and not is_batch_input(self.inputs[0]):
+            return {self.inputs[0]: self.output_dir}
+        return output_dirs(expand_inputs(self.inputs), self.output_dir, root=self.root)
+
+    def changed(self, input_file: str) -> bool:
+        try:
+            stat = os.stat(input_file)
+        except FileNotFoundError:
+            self.stats.pop(input_file, None)
+            self.hashes.pop(input_file, None)
+            self.engines.pop(input_file, None)
+            return False
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if self.stats.get(input_file) == signature:
+            return False
+        self.stats[input_file] = signature
+        with open(input_file, 'rb') as file:
+            content_hash = hashlib.sha256(file.read()).hexdigest()
+        if self.hashes.get(input_file) == content_hash:
+            # Saved without changes
+            return False
+        self.hashes[input_file] = content_hash
+        return True
+
+    def poll(self) -> list[BatchResult]:
+        """
+        Recompiles the files changed since the last poll, all of them on the first poll.
+
+        Returns:
+            list[BatchResult]: Results of the recompiled files.
+        """
+        results = []
+        for input_file, output_dir in self.destinations().items():
+            if not self.changed(input_file):
+                continue
+            start = time.perf_counter()
+            try:
+                output = compiler(
+                    input_file,
+                    output_dir,
+                    incremental=self.engine(input_file),
+                    raise_errors=True,
+                    **self.compiler_options,
+                )
+                result = BatchResult(input_file, output_dir, output, duration=time.perf_counter() - start)
+            except Exception as e:
+                result = BatchResult(
+                    input_file, output_dir, error=f'{type(e).__name__} - {e}', duration=time.perf_counter() - start
+                )
+            results.append(result)
+            if self.on_result is not None:
+                self.on_result(result)
+        return results
+
+    def run(self, interval: float = DEFAULT_WATCH_INTERVAL, stop: threading.Event | None = None) -> None:
+        """
+        Polls the files every `interval` seconds until `stop` is set, or forever.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.poll()
+            stop.wait(interval)
@@ -1,17 +1,205 @@
+import hashlib
+import json
 import os
+import uuid
 
+from compiler.models import WriterOutput
 
-def writer(file_map: dict[str, str], output_dir: str) -> dict[str, str]:
+# none: leave flushing to the OS, file: fsync every written file,
+# full: additionally fsync the output directory so the renames are durable
+FSYNC_POLICIES = ('none', 'file', 'full')
+
+MANIFEST_FILENAME = '.compiler-manifest.json'
+MANIFEST_VERSION = 1
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_manifest(output_dir: str) -> dict[str, dict]:
+    """
+    Reads the manifest of the files produced by the previous writer run.
+
+    Returns:
+        dict[str, dict]: A mapping from filenames to their `sha256`, `size` and
+        `mtime_ns`. Empty when there is no usable manifest.
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILENAME), 'rb') as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    files = manifest.get('files', {})
+    if not isinstance(files, dict) or not all(isinstance(entry, dict) for entry in files.values()):
+        return {}
+    return files
+
+
+def changed_files(file_map: dict[str, str], output_dir: str) -> list[str]:
+    """
+    Lists the files whose content differs from the last written generation,
+    using only the manifest instead of reading the output directory.
+    """
+    manifest = read_manifest(output_dir)
+    return [
+        filename
+        for filename, content in file_map.items()
+        if manifest.get(filename, {}).get('sha256') != content_hash(content.encode())
+    ]
+
+
+def is_up_to_date(file_path: str, data: bytes, entry: dict | None = None) -> bool:
+    """
+    Checks whether the file on disk already holds exactly the given content.
+
+    When given a manifest `entry` recorded for this very content, a file matching it
+    by size and modification time is trusted without reading it. Otherwise the size
+    is compared first, so changed files are usually detected without reading them.
+    """
+    try:
+        stat = os.stat(file_path)
+        if stat.st_size != len(data):
+            return False
+        if entry is not None and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return True
+        with open(file_path, 'rb') as file:
+            return file.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def write_file(file_path: str, data: bytes, atomic: bool = False, fsync: str = 'none') -> None:
+    """
+    Writes the data to the file.
+
+    Args:
+        file_path (str): Path of the file to write.
+        data (bytes): The content of the file.
+        atomic (bool): Write to a temporary file next to the target and rename it
+            over the target, so readers and crashes never see a partially written file.
+        fsync (str): One of FSYNC_POLICIES.
+    """
+    target_path = file_path
+    if atomic:
+        directory, filename = os.path.split(file_path)
+        file_path = os.path.join(directory, f'.{filename}.{uuid.uuid4().hex}.tmp')
+    try:
+        with open(file_path, 'xb' if atomic else 'wb') as file:
+            file.write(data)
+            if fsync != 'none':
+                file.flush()
+                os.fsync(file.fileno())
+        if atomic:
+            os.replace(file_path, target_path)
+    except BaseException:
+        if atomic and os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+
+def fsync_directory(directory: str) -> None:
+    if os.name != 'posix':
+        # Directories cannot be opened for fsync on other platforms
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def remove_stale_files(output_dir: str, filenames: list[str]) -> list[str]:
+    removed = []
+    for filename in filenames:
+        if os.path.basename(filename) != filename:
+            # Never follow a manifest entry outside of the output directory
+            continue
+        try:
+            os.remove(os.path.join(output_dir, filename))
+        except FileNotFoundError:
+            continue
+        removed.append(filename)
+    return removed
+
+
+def writer(
+    file_map: dict[str, str],
+    output_dir: str,
+    skip_unchanged: bool = True,
+    jobs: int = 1,
+    atomic: bool = False,
+    fsync: str = 'none',
+    manifest: bool = False,
+) -> WriterOutput:
     """
     Writes the generated C# code to disk.
 
+    Files whose content did not change are left untouched, so their modification
+    time is preserved and incremental builds of the generated code stay warm.
+
+    With `manifest`, the writer records the files it produced in MANIFEST_FILENAME
+    and removes files listed by the previous generation that are no longer emitted.
+
     Args:
         file_map (Dict[str, str]): A mapping from filenames to their C# code content.
         output_dir (str): The directory to output the C# code.
+        skip_unchanged (bool): Do not rewrite files that already hold the same content.
+        jobs (int): Number of threads writing files concurrently.
+        atomic (bool): Replace every file atomically through a temporary file.
+        fsync (str): When to force the written data to disk, one of FSYNC_POLICIES.
+        manifest (bool): Maintain the generation manifest and clean up stale files.
+
+    Returns:
+        WriterOutput: The names of the written, skipped and removed files.
     """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f'Unknown fsync policy: {fsync}, expected one of {FSYNC_POLICIES}')
+    if jobs < 1:
+        raise ValueError(f'Number of writer jobs must be positive, got {jobs}')
+
     os.makedirs(output_dir, exist_ok=True)
-    for filename, content in file_map.items():
+    previous_manifest = read_manifest(output_dir) if manifest else {}
+
+    def write(item: tuple[str, str]) -> tuple[bool, dict | None]:
+        filename, content = item
         file_path = os.path.join(output_dir, filename)
-        with open(file_path, 'w') as file:
-            file.write(content)
-    return file_map
+        data = content.encode()
+        data_hash = content_hash(data) if manifest else None
+        entry = previous_manifest.get(filename)
+        if entry is not None and entry.get('sha256') != data_hash:
+            entry = None
+        was_written = not (skip_unchanged and is_up_to_date(file_path, data, entry))
+        if was_written:
+            write_file(file_path, data, atomic=atomic, fsync=fsync)
+        if not manifest:
+            return was_written, None
+        stat = os.stat(file_path)
+        return was_written, {'sha256': data_hash, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    if jobs == 1:
+        results = list(map(write, file_map.items()))
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(write, file_map.items()))
+
+    output = WriterOutput()
+    for filename, (was_written, _) in zip(file_map, results):
+        (output.written if was_written else output.skipped).append(filename)
+
+    if manifest:
+        output.removed = remove_stale_files(output_dir, [name for name in previous_manifest if name not in file_map])
+        entries = {filename: entry for filename, (_, entry) in zip(file_map, results)}
+        if entries != previous_manifest:
+            # The manifest is replaced last, so it always describes a complete generation
+            data = json.dumps({'version': MANIFEST_VERSION, 'files': entries}, indent=2).encode()
+            write_file(os.path.join(output_dir, MANIFEST_FILENAME), data, atomic=True, fsync=fsync)
+
+    if fsync == 'full' and (output.written or output.removed):
+        fsync_directory(output_dir)
+
+    return output
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from compiler.artifacts import ARTIFACT_STAGES, artifact_path, dump_artifact, load_artifact, parse_artifact
+from compiler.default import compiler
+from compiler.errors import ArtifactError
+from compiler.models import XmlElement
+from compiler.sinks import MemorySink
+
+
+INPUT = """
+<root>
+    <kitten Name="Whiskers">
+        <parent>
+            <cat Name="The Garfield"/>
+        </parent>
+    </kitten>
+    <cars>
+        <car1 Name="Lightning"/>
+        <car2 Name="Sally"/>
+    </cars>
+</root>
+"""
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / 'input.xml'
+    path.write_text(INPUT)
+    return str(path)
+
+
+def test_artifacts_round_trip(tmp_path, input_file):
+    artifacts_dir = str(tmp_path / 'artifacts')
+    compiler(input_file, 'unused', 'writer', sink=MemorySink(), artifacts_dir=artifacts_dir)
+    assert sorted(os.listdir(artifacts_dir)) == sorted(f'{stage}.artifact' for stage in ARTIFACT_STAGES)
+
+    for stage in ARTIFACT_STAGES:
+        expected = compiler(input_file, 'unused', stage)
+        assert load_artifact(artifact_path(artifacts_dir, stage), stage) == expected
+
+
+@pytest.mark.parametrize('stage', ARTIFACT_STAGES)
+def test_resume_from_artifact(tmp_path, input_file, stage):
+    artifacts_dir = str(tmp_path / 'artifacts')
+    full = MemorySink()
+    compiler(input_file, 'unused', 'writer', sink=full, artifacts_dir=artifacts_dir)
+
+    resumed = MemorySink()
+    compiler(artifact_path(artifacts_dir, stage), 'unused', 'writer', sink=resumed, start_from=stage)
+    assert resumed.files == full.files
+
+
+def test_artifact_stage_mismatch():
+    data = dump_artifact('parser', XmlElement('root'))
+    with pytest.raises(ArtifactError):
+        parse_artifact(data, 'code_gen')
+    with pytest.raises(ArtifactError):
+        parse_artifact(b'<root> </root>', 'parser')
+    with pytest.raises(ArtifactError):
+        dump_artifact('scanner', [])
+
+
+def test_resume_from_invalid_stage(tmp_path, input_file):
+    assert compiler(input_file, 'unused', 'writer', sink=MemorySink(), start_from='scanner') is None
@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+from compiler.batch import batch_compiler, expand_inputs, input_root, is_batch_input, output_dirs
+from compiler.sinks import MemorySink
+
+
+CAT = '<root> <cat Name="Whiskers"/> </root>'
+DOG = '<root> <dog Name="Rex" Age="3"/> </root>'
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    corpus = tmp_path / 'corpus'
+    (corpus / 'pets').mkdir(parents=True)
+    (corpus / 'cat.xml').write_text(CAT)
+    (corpus / 'pets' / 'dog.xml').write_text(DOG)
+    (corpus / 'pets' / 'broken.xml').write_text('<root> <cat Name="Tom"> </root>')
+    (corpus / 'notes.txt').write_text('not xml')
+    return corpus
+
+
+@pytest.mark.parametrize(
+    'path, expected',
+    [
+        ('input.xml', False),
+        ('corpus/*.xml', True),
+        ('corpus/**/cat?.xml', True),
+        ('corpus/[ab].xml', True),
+    ],
+)
+def test_is_batch_input(path, expected):
+    assert is_batch_input(path) == expected
+
+
+def test_is_batch_input_directory(corpus):
+    assert is_batch_input(str(corpus))
+
+
+def test_expand_inputs(corpus):
+    expected = [str(corpus / 'cat.xml'), str(corpus / 'pets' / 'broken.xml'), str(corpus / 'pets' / 'dog.xml')]
+    assert expand_inputs([str(corpus)]) == expected
+    assert expand_inputs([str(corpus / '**' / '*.xml')]) == expected
+    assert expand_inputs([str(corpus / 'cat.xml'), str(corpus / '*.xml')]) == [str(corpus / 'cat.xml')]
+
+
+def test_output_dirs(corpus):
+    files = [str(corpus / 'cat.xml'), str(corpus / 'pets' / 'dog.xml')]
+    assert output_dirs(files, 'out') == {
+        files[0]: os.path.join('out', 'cat'),
+        files[1]: os.path.join('out', 'pets', 'dog'),
+    }
+    assert output_dirs([], 'out') == {}
+
+
+@pytest.mark.parametrize(
+    'inputs, expected',
+    [
+        (['corpus'], 'corpus'),
+        (['corpus/cat.xml'], 'corpus'),
+        (['corpus/**/*.xml'], 'corpus'),
+        (['corpus/pets/*.xml', 'corpus/cat.xml'], 'corpus'),
+        (['*.xml'], ''),
+    ],
+)
+def test_input_root(corpus, monkeypatch, inputs, expected):
+    monkeypatch.chdir(corpus.parent)
+    assert input_root(inputs) == os.path.abspath(expected)
+    files = [str(corpus / 'pets' / 'dog.xml')]
+    assert output_dirs(files, 'out', root=str(corpus)) == {files[0]: os.path.join('out', 'pets', 'dog')}
+
+
+def test_output_dirs_collision(tmp_path):
+    (tmp_path / 'cat.xml').write_text(CAT)
+    (tmp_path / 'cat.json').write_text(CAT)
+    with pytest.raises(ValueError, match='would both be compiled into'):
+        output_dirs([str(tmp_path / 'cat.json'), str(tmp_path / 'cat.xml')], 'out')
+    output_dir = tmp_path / 'out'
+    with pytest.raises(ValueError):
+        batch_compiler([str(tmp_path / '*')], str(output_dir))
+    assert not output_dir.exists()
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_compiler(corpus, tmp_path, jobs):
+    output_dir = tmp_path / 'out'
+    streamed = []
+    summary = batch_compiler([str(corpus)], str(output_dir), jobs=jobs, on_result=streamed.append)
+
+    assert streamed == summary.results
+    assert (summary.succeeded, summary.failed) == (2, 1)
+    results = {os.path.basename(result.input_file): result for result in summary.results}
+    assert results['broken.xml'].error is not None
+    assert results['broken.xml'].output is None
+    assert results['cat.xml'].error is None
+    assert sorted(results['cat.xml'].output.written) == ['Class1.cs', 'Main.cs']
+    assert (output_dir / 'cat' / 'Main.cs').exists()
+    assert (output_dir / 'pets' / 'dog' / 'Class1.cs').exists()
+    assert not (output_dir / 'pets' / 'broken').exists()
+
+
+def test_batch_compiler_artifacts(corpus, tmp_path):
+    artifacts_dir = tmp_path / 'artifacts'
+    batch_compiler([str(corpus / 'pets' / 'dog.xml')], str(tmp_path / 'out'), artifacts_dir=str(artifacts_dir))
+    assert (artifacts_dir / 'dog' / 'parser.artifact').exists()
+
+
+def test_batch_compiler_invalid_options(corpus, tmp_path):
+    with pytest.raises(ValueError):
+        batch_compiler([str(corpus)], str(tmp_path), jobs=0)
+    with pytest.raises(ValueError):
+        batch_compiler([str(corpus)], str(tmp_path), start_from='parser')
+
+
+@pytest.mark.parametrize('sink', ['zip', 'tar', 'memory', '-', MemorySink()])
+def test_batch_compiler_rejects_other_sinks(corpus, tmp_path, sink):
+    with pytest.raises(ValueError):
+        batch_compiler([str(corpus)], str(tmp_path / 'out'), sink=sink)
+    assert not (tmp_path / 'out').exists()
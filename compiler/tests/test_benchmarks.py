@@ -0,0 +1,93 @@
+from dataclasses import replace
+
+import pytest
+
+from compiler.benchmarks.generator import SHAPES, generate_document
+from compiler.benchmarks.models import DocumentShape
+from compiler.benchmarks.suite import BENCHMARKS, benchmark_document, compare_reports, run_suite
+from compiler.code_gen import code_gen
+from compiler.inter_code_gen import inter_code_gen
+from compiler.parser import parser
+from compiler.scanner import scanner
+from compiler.semantic_analyzer import semantic_analyzer
+
+
+def compile_text(text: str) -> tuple:
+    ast = parser(scanner(text))
+    semantic_output = semantic_analyzer(ast)
+    return ast, semantic_output, code_gen(inter_code_gen(semantic_output))
+
+
+@pytest.mark.parametrize('shape_name', list(SHAPES))
+def test_shapes_compile(shape_name):
+    # Smaller versions of the shapes, with the same proportions of the other knobs
+    shape = SHAPES[shape_name]
+    shape = replace(shape, children=min(shape.children, 20), depth=min(shape.depth, 5))
+    _, semantic_output, file_map = compile_text(generate_document(shape))
+    assert len(semantic_output.types) == min(shape.types, shape.children)
+    assert len(file_map) == len(semantic_output.types) + 1
+
+
+@pytest.mark.parametrize(
+    'knobs, children, elements',
+    [
+        ({'children': 7}, 7, 8),
+        ({'children': 4, 'depth': 3}, 4, 1 + 4 * 5),
+        ({'children': 4, 'list_size': 3}, 4, 1 + 2 + 2 * 4),
+        ({'children': 0}, 0, 1),
+    ],
+)
+def test_knobs(knobs, children, elements):
+    ast, _, _ = compile_text(generate_document(**knobs))
+    assert len(ast.children or []) == children
+
+    def count(element):
+        return 1 + sum(count(child) for child in element.children or [])
+
+    assert count(ast) == elements
+
+
+def test_deterministic():
+    shape = DocumentShape(children=10, string_length=30, seed=3)
+    assert generate_document(shape) == generate_document(shape)
+    assert generate_document(shape) != generate_document(shape, seed=4)
+    assert 'T0_A4=' in generate_document(shape, attributes=5)
+    assert len(generate_document(shape, string_length=100)) > len(generate_document(shape)) + 10 * 3 * 60
+
+
+@pytest.mark.parametrize('knobs', [{'types': 0}, {'depth': 0}])
+def test_invalid_shape(knobs):
+    with pytest.raises(ValueError):
+        generate_document(**knobs)
+
+
+def test_benchmark_document(tmp_path):
+    text = generate_document(children=5)
+    results = benchmark_document(text, 'small', repeat=2, work_dir=str(tmp_path))
+    assert [result.benchmark for result in results] == list(BENCHMARKS)
+    assert all(len(result.times) == 2 and result.best <= result.median for result in results)
+    assert all(result.shape == 'small' and result.input_size == len(text) for result in results)
+    # Every run of the writer and of the whole compilation has its own output directory
+    assert len([path for path in tmp_path.iterdir() if path.is_dir()]) == 4
+
+    with pytest.raises(ValueError):
+        benchmark_document(text, 'small', benchmarks=('lexer',))
+
+
+def test_compare_reports():
+    report = run_suite({'tiny': DocumentShape(children=2)}, benchmarks=('scanner', 'parser'), repeat=1, label='head')
+    assert report['label'] == 'head'
+    assert [(result['benchmark'], result['shape']) for result in report['results']] == [
+        ('scanner', 'tiny'),
+        ('parser', 'tiny'),
+    ]
+    baseline = {'results': [dict(report['results'][0], median=report['results'][0]['median'] / 2)]}
+    assert compare_reports(baseline, report) == [
+        {
+            'benchmark': 'scanner',
+            'shape': 'tiny',
+            'baseline': report['results'][0]['median'] / 2,
+            'median': report['results'][0]['median'],
+            'ratio': 2.0,
+        }
+    ]
@@ -0,0 +1,101 @@
+import contextlib
+import os
+
+from compiler import default
+from compiler.cache import BuildCache
+from compiler.sinks import MemorySink
+
+
+def test_cache_key():
+    cache = BuildCache('unused')
+    key = cache.key(b'<root> </root>', {'infer_types': False})
+    assert key == cache.key(b'<root> </root>', {'infer_types': False})
+    assert key != cache.key(b'<root>  </root>', {'infer_types': False})
+    assert key != cache.key(b'<root> </root>', {'infer_types': True})
+
+
+def test_cache_round_trip(tmp_path):
+    cache = BuildCache(str(tmp_path))
+    assert cache.get('abc') is None
+    cache.put('abc', {'Main.cs': 'main'})
+    assert cache.get('abc') == {'Main.cs': 'main'}
+
+
+def test_cache_corrupted_entry(tmp_path):
+    cache = BuildCache(str(tmp_path))
+    (tmp_path / 'abc.json').write_text('{"Main.cs": ')
+    assert cache.get('abc') is None
+    assert not (tmp_path / 'abc.json').exists()
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = BuildCache(str(tmp_path), max_size=250)
+    content = {'Main.cs': 'x' * 80}
+    for i, key in enumerate(['a', 'b']):
+        cache.put(key, content)
+        os.utime(tmp_path / f'{key}.json', ns=(i * 10**9, i * 10**9))
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get('a') == content
+    cache.put('c', content)
+    assert sorted(os.listdir(tmp_path)) == ['a.json', 'c.json']
+
+
+def test_cache_entries_removed_concurrently(tmp_path, monkeypatch):
+    # Batch workers share the cache, any of them may remove an entry another one is using
+    cache = BuildCache(str(tmp_path), max_size=150)
+    content = {'Main.cs': 'x' * 80}
+    cache.put('a', content)
+
+    def utime_after_removal(path, *args, **kwargs):
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, 'utime', utime_after_removal)
+        assert cache.get('a') == content
+
+    (tmp_path / 'b.json').write_text('{"Main.cs": ')
+    real_remove = os.remove
+
+    def remove_twice(path):
+        real_remove(path)
+        real_remove(path)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, 'remove', remove_twice)
+        assert cache.get('b') is None
+
+    real_scandir = os.scandir
+
+    def scandir_then_remove(path):
+        with real_scandir(path) as it:
+            entries = list(it)
+        real_remove(os.path.join(path, 'c.json'))
+        return contextlib.nullcontext(entries)
+
+    (tmp_path / 'c.json').write_text('{}')
+    cache.put('d', content)
+    with monkeypatch.context() as patch:
+        patch.setattr(os, 'scandir', scandir_then_remove)
+        cache.put('e', content)
+    assert sorted(os.listdir(tmp_path)) == ['e.json']
+
+
+def test_compiler_cache_hit_skips_pipeline(tmp_path, monkeypatch):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text('<root> <cat Name="Whiskers"/> </root>')
+    cache_dir = str(tmp_path / 'cache')
+
+    first = MemorySink()
+    default.compiler(str(input_file), 'unused', 'writer', sink=first, cache_dir=cache_dir)
+
+    def failing_scanner(chars):
+        raise AssertionError('The scanner must not run on a cache hit')
+
+    monkeypatch.setattr(default, 'scanner', failing_scanner)
+    second = MemorySink()
+    default.compiler(str(input_file), 'unused', 'writer', sink=second, cache_dir=cache_dir)
+    assert second.files == first.files
+    assert default.compiler(str(input_file), 'unused', 'code_gen', cache_dir=cache_dir) == first.files
+    # Without the cache the patched scanner runs and the compilation fails
+    assert default.compiler(str(input_file), 'unused', 'code_gen') is None
@@ -1,6 +1,6 @@
 import pytest
 
-from compiler.code_gen import code_gen
+from compiler.code_gen import code_gen, csharp_string_literal, generate_class_code
 from compiler.models import (
     IntermediateCode,
     Class,
@@ -131,7 +131,10 @@ from compiler.models import (
                     '    }\n\n'
                     '    public override bool Equals(object obj)\n'
                     '    {\n'
-                    '        throw new NotImplementedException();\n'
+                    '        return obj is Class1 other\n'
+                    '            && Equals(Parent, other.Parent)\n'
+                    '            && Name == other.Name\n'
+                    '            && Equals(Bestfriend, other.Bestfriend);\n'
                     '    }\n\n'
                     '    protected override void Finalize()\n'
                     '    {\n'
@@ -139,7 +142,7 @@ from compiler.models import (
                     '    }\n\n'
                     '    public override int GetHashCode()\n'
                     '    {\n'
-                    '        throw new NotImplementedException();\n'
+                    '        return HashCode.Combine(Parent, Name, Bestfriend);\n'
                     '    }\n\n'
                     '    protected object MemberwiseClone()\n'
                     '    {\n'
@@ -223,13 +226,15 @@ from compiler.models import (
                     '        Parent = parent;\n'
                     '    }\n\n'
                     '    public override bool Equals(object obj)\n    {\n'
-                    '        throw new NotImplementedException();\n'
+                    '        return obj is Class1 other\n'
+                    '            && Name == other.Name\n'
+                    '            && Equals(Parent, other.Parent);\n'
                     '    }\n\n'
                     '    protected override void Finalize()\n    {\n'
                     '        // Finalize resources if necessary\n'
                     '    }\n\n'
                     '    public override int GetHashCode()\n    {\n'
-                    '        throw new NotImplementedException();\n'
+                    '        return HashCode.Combine(Name, Parent);\n'
                     '    }\n\n'
                     '    protected object MemberwiseClone()\n    {\n'
                     '        throw new NotImplementedException();\n'
@@ -246,13 +251,14 @@ from compiler.models import (
                     '        Kind = kind;\n'
                     '    }\n\n'
                     '    public override bool Equals(object obj)\n    {\n'
-                    '        throw new NotImplementedException();\n'
+                    '        return obj is Class2 other\n'
+                    '            && Kind == other.Kind;\n'
                     '    }\n\n'
                     '    protected override void Finalize()\n    {\n'
                     '        // Finalize resources if necessary\n'
                     '    }\n\n'
                     '    public override int GetHashCode()\n    {\n'
-                    '        throw new NotImplementedException();\n'
+                    '        return HashCode.Combine(Kind);\n'
                     '    }\n\n'
                     '    protected object MemberwiseClone()\n    {\n'
                     '        throw new NotImplementedException();\n'
@@ -274,3 +280,181 @@ from compiler.models import (
 def test_code_gen_class3(inter_code: IntermediateCode, expected: dict[str, str]):
     result = code_gen(inter_code)
     assert result == expected
+
+
+def test_code_gen_constant_pool():
+    inter_code = IntermediateCode(
+        types=[Class(name='Class1', attributes=[ClassAttribute(name='Country', attribute_type='string')])],
+        declarations=[
+            Declaration(
+                id='0', instance_name='a', class_name='Class1', attributes=[InstanceAttribute('Country', 'PL')]
+            ),
+            Declaration(
+                id='1', instance_name='b', class_name='Class1', attributes=[InstanceAttribute('Country', 'PL')]
+            ),
+            Declaration(
+                id='2', instance_name='c', class_name='Class1', attributes=[InstanceAttribute('Country', 'ES')]
+            ),
+        ],
+        constants={'PL': 'Str0'},
+    )
+    result = code_gen(inter_code)
+    assert result['Constants.cs'] == (
+        'using System;\n\npublic static class Constants\n{\n    public static readonly string Str0 = "PL";\n}'
+    )
+    assert result['Main.cs'] == (
+        'Class1 a = new Class1(Constants.Str0);\nClass1 b = new Class1(Constants.Str0);\nClass1 c = new Class1("ES");'
+    )
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        ('plain', '"plain"'),
+        ('C:\\path', '"C:\\\\path"'),
+        ('say "hi"', '"say \\"hi\\""'),
+        ('tab\there', '"tab\\there"'),
+        ('bell\x07', '"bell\\a"'),
+        ('\x1b', '"\\u001b"'),
+        ('Zażółć', '"Zażółć"'),
+    ],
+)
+def test_csharp_string_literal(value, expected):
+    assert csharp_string_literal(value) == expected
+
+
+def test_code_gen_shared_declarations():
+    inter_code = IntermediateCode(
+        types=[Class(name='Class1', attributes=[ClassAttribute(name='Name', attribute_type='string')])],
+        declarations=[
+            Declaration(id='0', instance_name='car1', class_name='Class1', attributes=[InstanceAttribute('Name', 'S')]),
+            Declaration(
+                id='2',
+                instance_name='cars',
+                class_name='Class1',
+                attributes=[InstanceAttribute('car1', ref='0'), InstanceAttribute('car2', ref='0')],
+                is_list=True,
+            ),
+            Declaration(id='3', instance_name='sally', class_name='Class1', ref='0'),
+        ],
+    )
+    result = code_gen(inter_code)
+    assert result['Main.cs'] == (
+        'Class1 car1 = new Class1("S");\n'
+        'List<Class1> cars = new List<Class1>();\n'
+        'cars.add(car1);\n'
+        'cars.add(car1);\n'
+        'Class1 sally = car1;'
+    )
+
+
+def test_code_gen_shared_base():
+    inter_code = IntermediateCode(
+        types=[Class(name='Class1', attributes=[ClassAttribute(name='kind', attribute_type='string')])],
+        declarations=[
+            Declaration(
+                id='0', instance_name='flower', class_name='Class1', attributes=[InstanceAttribute('kind', 'I')]
+            ),
+        ],
+    )
+    result = code_gen(inter_code, shared_base=True)
+    assert result['Class1.cs'] == (
+        'using System;\n\npublic class Class1 : GeneratedBase\n{\n'
+        '    public string Kind { get; set; }\n\n'
+        '    public Class1(string kind)\n    {\n'
+        '        Kind = kind;\n'
+        '    }\n\n'
+        '    public override bool Equals(object obj)\n    {\n'
+        '        return obj is Class1 other\n'
+        '            && Kind == other.Kind;\n'
+        '    }\n\n'
+        '    public override int GetHashCode()\n    {\n'
+        '        return HashCode.Combine(Kind);\n'
+        '    }\n'
+        '}'
+    )
+    assert result['GeneratedBase.cs'] == (
+        'using System;\n\npublic abstract class GeneratedBase\n{\n'
+        '    protected override void Finalize()\n    {\n'
+        '        // Finalize resources if necessary\n'
+        '    }\n\n'
+        '    protected object MemberwiseClone()\n    {\n'
+        '        throw new NotImplementedException();\n'
+        '    }\n\n'
+        '    public override string ToString()\n    {\n'
+        '        throw new NotImplementedException();\n'
+        '    }\n'
+        '}'
+    )
+    assert result['Main.cs'] == 'Class1 flower = new Class1("I");'
+    assert code_gen(IntermediateCode(types=[], declarations=[]), shared_base=True) == {'Main.cs': ''}
+
+
+@pytest.mark.parametrize(
+    'attributes, expected_equals, expected_hash',
+    [
+        # Test Case 1: No properties
+        ([], '        return obj is Class1 other;', '        return 0;'),
+        # Test Case 2: Up to eight properties fit in a single HashCode.Combine
+        (
+            [ClassAttribute(f'p{i}', 'string') for i in range(8)],
+            '        return obj is Class1 other\n'
+            + '\n'.join(f'            && P{i} == other.P{i}' for i in range(8))
+            + ';',
+            '        return HashCode.Combine(P0, P1, P2, P3, P4, P5, P6, P7);',
+        ),
+        # Test Case 3: More than eight properties are combined in chunks
+        (
+            [ClassAttribute(f'p{i}', 'Class2') for i in range(10)],
+            '        return obj is Class1 other\n'
+            + '\n'.join(f'            && Equals(P{i}, other.P{i})' for i in range(10))
+            + ';',
+            '        return HashCode.Combine('
+            'HashCode.Combine(P0, P1, P2, P3, P4, P5, P6, P7), HashCode.Combine(P8, P9));',
+        ),
+    ],
+)
+def test_generate_equality_members(attributes, expected_equals, expected_hash):
+    class_code = generate_class_code('Class1', attributes)
+    assert f'    public override bool Equals(object obj)\n    {{\n{expected_equals}\n    }}' in class_code
+    assert f'    public override int GetHashCode()\n    {{\n{expected_hash}\n    }}' in class_code
+
+
+def test_code_gen_typed_attributes():
+    inter_code = IntermediateCode(
+        types=[
+            Class(
+                name='Class1',
+                attributes=[
+                    ClassAttribute(name='Name', attribute_type='string'),
+                    ClassAttribute(name='Age', attribute_type='int'),
+                    ClassAttribute(name='Population', attribute_type='long'),
+                    ClassAttribute(name='Height', attribute_type='double'),
+                    ClassAttribute(name='Active', attribute_type='bool'),
+                ],
+            )
+        ],
+        declarations=[
+            Declaration(
+                id='0',
+                instance_name='alice',
+                class_name='Class1',
+                attributes=[
+                    InstanceAttribute('Active', 'true'),
+                    InstanceAttribute('Height', '170'),
+                    InstanceAttribute('Population', '+12'),
+                    InstanceAttribute('Age', '30'),
+                    InstanceAttribute('Name', '30'),
+                ],
+            ),
+            Declaration(id='1', instance_name='bob', class_name='Class1', attributes=[InstanceAttribute('Age', '30')]),
+        ],
+        constants={'30': 'Str0'},
+    )
+    result = code_gen(inter_code)
+    assert '    public int Age { get; set; }\n' in result['Class1.cs']
+    assert '            && Age == other.Age\n' in result['Class1.cs']
+    assert '            && Height.Equals(other.Height)\n' in result['Class1.cs']
+    assert result['Main.cs'] == (
+        'Class1 alice = new Class1(Constants.Str0, 30, 12L, 170.0, true);\nClass1 bob = new Class1(30);'
+    )
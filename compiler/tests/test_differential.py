@@ -0,0 +1,47 @@
+import pytest
+
+from compiler.benchmarks.differential import (
+    REFERENCE_ENGINE,
+    corpus,
+    engines,
+    mutations,
+    run_engine,
+    throughput,
+)
+
+DOCUMENTS = corpus(mutations_per_document=5)
+
+
+def test_corpus():
+    assert 'example1.xml' in DOCUMENTS
+    assert 'deep' in DOCUMENTS and 'deep~4' in DOCUMENTS
+    outputs = [run_engine(engines()[REFERENCE_ENGINE], text) for text in DOCUMENTS.values()]
+    # Both valid and invalid documents
+    assert any(isinstance(output, dict) for output in outputs)
+    assert {'InvalidTransitionError', 'SemanticError'} <= {output for output in outputs if isinstance(output, str)}
+
+
+def test_mutations():
+    text = '<root> <cat Name="Tom"/> </root>'
+    assert mutations(text, 20, seed=1) == mutations(text, 20, seed=1)
+    assert mutations(text, 20, seed=1) != mutations(text, 20, seed=2)
+    assert all(abs(len(mutated) - len(text)) <= 20 for mutated in mutations(text, 20))
+
+
+@pytest.fixture(scope='module')
+def reference_outputs():
+    reference = engines()[REFERENCE_ENGINE]
+    return {name: run_engine(reference, text) for name, text in DOCUMENTS.items()}
+
+
+@pytest.mark.parametrize('engine_name', [name for name in engines() if name != REFERENCE_ENGINE])
+def test_engine_matches_reference(engine_name, reference_outputs):
+    engine = engines()[engine_name]
+    for name, text in DOCUMENTS.items():
+        assert run_engine(engine, text) == reference_outputs[name], name
+
+
+def test_throughput():
+    results = throughput({'example': '<root> <cat Name="Tom"/> </root>', 'invalid': '<root>'}, repeat=1)
+    assert set(results) == set(engines())
+    assert all(chars_per_second > 0 for chars_per_second in results.values())
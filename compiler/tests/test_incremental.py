@@ -0,0 +1,98 @@
+import pytest
+
+from compiler import incremental
+from compiler.default import compiler
+from compiler.incremental import IncrementalCompiler, element_fingerprint
+from compiler.models import ElementAttribute, XmlElement
+
+# Successive versions of one document, each one a typical edit of the previous one
+VERSIONS = [
+    '<root> <tom Name="Tom" Age="3"/> <garfield Name="Garfield"> <owner> <jon Name="Jon" Age="30"/> </owner>'
+    ' </garfield> <cars> <car1 Brand="Fiat"/> <car2 Brand="Audi"/> </cars> </root>',
+    # A value changes
+    '<root> <tom Name="Tom" Age="4"/> <garfield Name="Garfield"> <owner> <jon Name="Jon" Age="30"/> </owner>'
+    ' </garfield> <cars> <car1 Brand="Fiat"/> <car2 Brand="Audi"/> </cars> </root>',
+    # A child with a new type is added
+    '<root> <tom Name="Tom" Age="4"/> <garfield Name="Garfield"> <owner> <jon Name="Jon" Age="30"/> </owner>'
+    ' </garfield> <cars> <car1 Brand="Fiat"/> <car2 Brand="Audi"/> </cars> <boat Length="12.5" Sails="true"/> </root>',
+    # An attribute is added to an existing type
+    '<root> <tom Name="Tom" Age="4" Color="Black"/> <garfield Name="Garfield"> <owner> <jon Name="Jon" Age="30"/>'
+    ' </owner> </garfield> <cars> <car1 Brand="Fiat"/> <car2 Brand="Audi"/> </cars> <boat Length="12.5" Sails="true"/>'
+    ' </root>',
+    # Children are reordered and removed
+    '<root> <boat Length="12.5" Sails="true"/> <tom Name="Tom" Age="4" Color="Black"/> </root>',
+    '<root> </root>',
+]
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        {},
+        {'infer_types': True},
+        {'shared_base': True},
+        {'deduplicate': True, 'constant_pool': True},
+    ],
+)
+def test_matches_full_rebuild(tmp_path, options):
+    input_file = str(tmp_path / 'input.xml')
+    engine = IncrementalCompiler(**options)
+    for version in VERSIONS:
+        with open(input_file, 'w') as file:
+            file.write(version)
+        ast = compiler(input_file, 'unused', 'parser')
+        assert engine.compile(ast) == compiler(input_file, 'unused', 'code_gen', **options)
+
+
+def test_regenerates_only_affected_parts(tmp_path, monkeypatch):
+    input_file = str(tmp_path / 'input.xml')
+    engine = IncrementalCompiler()
+    generated = []
+    generate_main = incremental.generate_main
+
+    def counting_generate_main(declarations, types, constants=None):
+        generated.append([decl.instance_name for decl in declarations])
+        return generate_main(declarations, types, constants)
+
+    monkeypatch.setattr(incremental, 'generate_main', counting_generate_main)
+
+    def compile_version(version):
+        with open(input_file, 'w') as file:
+            file.write(version)
+        generated.clear()
+        return engine.compile(compiler(input_file, 'unused', 'parser'))
+
+    compile_version(VERSIONS[0])
+    assert len(generated) == 3
+    assert sorted(engine.changed) == ['Class1.cs', 'Class2.cs', 'Class3.cs', 'Main.cs']
+
+    compile_version(VERSIONS[1])
+    assert generated == [['tom']]
+    assert engine.changed == ['Main.cs']
+
+    compile_version(VERSIONS[1])
+    assert generated == []
+    assert engine.changed == []
+
+    compile_version(VERSIONS[4])
+    assert engine.removed == ['Class3.cs']
+
+
+def test_element_fingerprint_covers_children():
+    first = XmlElement('a', children=[XmlElement('b', [ElementAttribute('x', '1')])])
+    second = XmlElement('a', children=[XmlElement('b', [ElementAttribute('x', '2')])])
+    assert first == second
+    assert element_fingerprint(first) != element_fingerprint(second)
+
+
+def test_compiler_with_incremental_engine(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(VERSIONS[0])
+    engine = IncrementalCompiler()
+    output_dir = tmp_path / 'out'
+    output = compiler(str(input_file), str(output_dir), 'writer', incremental=engine, raise_errors=True)
+    assert sorted(output.written) == ['Class1.cs', 'Class2.cs', 'Class3.cs', 'Main.cs']
+
+    input_file.write_text(VERSIONS[1])
+    output = compiler(str(input_file), str(output_dir), 'writer', incremental=engine, raise_errors=True)
+    assert output.written == ['Main.cs']
@@ -0,0 +1,85 @@
+import pytest
+
+from compiler.errors import InvalidTransitionError, QuoteFollowedByNonWhitespaceError
+from compiler.incremental_parser import IncrementalParser, parse_with_offsets
+from compiler.parser import parser
+from compiler.scanner import scanner
+
+ROOT = '<root Kind="pets">'
+TOM = '\n  <tom Name="Tom" Age="3"/>'
+GARFIELD = '\n  <garfield Name="Garfield"> <owner> <jon Name="Jon"/> </owner> </garfield>'
+CARS = '\n  <cars> <car1 Brand="Fiat"/> <car2 Brand="Audi"/> </cars>'
+END = '\n</root>\n'
+
+
+@pytest.mark.parametrize(
+    'versions, reparsed',
+    [
+        # A value changes in the middle, at the start and at the end
+        ([TOM + GARFIELD + CARS, TOM + GARFIELD.replace('Jon', 'Liz') + CARS], [3, 1]),
+        ([TOM + GARFIELD + CARS, TOM.replace('3', '4') + GARFIELD + CARS], [3, 1]),
+        ([TOM + GARFIELD + CARS, TOM + GARFIELD + CARS.replace('Audi', 'Opel')], [3, 1]),
+        # Children are added, removed and reordered
+        ([TOM + CARS, TOM + GARFIELD + CARS, GARFIELD + CARS, CARS + GARFIELD], [2, 1, 0, 2]),
+        ([TOM, TOM + TOM + TOM, TOM], [1, 2, 0]),
+        ([TOM + GARFIELD, '', TOM + GARFIELD], [2, 0, 2]),
+        # Nothing changes, or only the whitespace between the children
+        ([TOM + CARS, TOM + CARS, TOM + '\n' + CARS], [2, 0, 0]),
+        # A child is inserted right after another, on the same line
+        ([TOM + CARS, TOM.replace('/>', '/> <jerry Name="Jerry"/>') + CARS], [2, 1]),
+    ],
+)
+def test_matches_full_parse(versions, reparsed):
+    incremental_parser = IncrementalParser()
+    for version, expected_reparsed in zip(versions, reparsed):
+        text = ROOT + version + END
+        ast = incremental_parser.parse(text)
+        assert repr(ast) == repr(parser(scanner(text)))
+        assert incremental_parser.reparsed == expected_reparsed
+        assert len(incremental_parser.fingerprints) == len(ast.children or [])
+
+
+@pytest.mark.parametrize(
+    'edited',
+    [
+        # The start tag of the root and the text after the last child are parsed as a whole
+        '<root Kind="toys">' + TOM + CARS + END,
+        ROOT + TOM + CARS + '\n</root>',
+        '<other>' + TOM + CARS + '\n</other>',
+    ],
+)
+def test_falls_back_to_full_parse(edited):
+    incremental_parser = IncrementalParser()
+    incremental_parser.parse(ROOT + TOM + CARS + END)
+    ast = incremental_parser.parse(edited)
+    assert repr(ast) == repr(parser(scanner(edited)))
+    assert incremental_parser.reparsed == 2
+
+
+@pytest.mark.parametrize(
+    'invalid, expected_error',
+    [
+        (ROOT + TOM + '\n  <cars> <car1 Brand="Fiat"/> </car> </cars>' + END, InvalidTransitionError),
+        # A string starting in the changed child and ending in the next one
+        (ROOT + TOM.replace('"Tom"', '"Tom') + CARS + END, QuoteFollowedByNonWhitespaceError),
+        (ROOT + TOM + ' <tom' + CARS + END, InvalidTransitionError),
+    ],
+)
+def test_errors_match_full_parse(invalid, expected_error):
+    incremental_parser = IncrementalParser()
+    incremental_parser.parse(ROOT + TOM + CARS + END)
+    with pytest.raises(expected_error):
+        parser(scanner(invalid))
+    with pytest.raises(expected_error):
+        incremental_parser.parse(invalid)
+    # The last valid version is still the one reparsed from
+    text = ROOT + TOM + GARFIELD + CARS + END
+    assert repr(incremental_parser.parse(text)) == repr(parser(scanner(text)))
+    assert incremental_parser.reparsed == 1
+
+
+def test_parse_with_offsets():
+    text = ROOT + TOM + CARS + END
+    _, root_end, child_ends = parse_with_offsets(text)
+    assert text[:root_end] == ROOT
+    assert child_ends == [len(ROOT + TOM), len(ROOT + TOM + CARS)]
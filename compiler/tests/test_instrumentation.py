@@ -0,0 +1,152 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from compiler.benchmarks.startup import python_environment
+from compiler.default import compiler
+from compiler.incremental import IncrementalCompiler
+from compiler.instrumentation import Instrumentation, count_items
+from compiler.models import IntermediateCode, StageStats, WriterOutput, XmlElement
+
+XML = (
+    '<root> <tom Name="Tom" Age="3"/> <garfield Name="Garfield"> <owner> <jon Name="Jon" Age="30"/> </owner>'
+    ' </garfield> </root>'
+)
+
+
+@pytest.mark.parametrize(
+    'output, expected',
+    [
+        (XmlElement('a', children=[XmlElement('b', children=[XmlElement('c')]), XmlElement('d')]), 4),
+        (IntermediateCode([], []), 0),
+        (WriterOutput(written=['Main.cs'], skipped=['Class1.cs']), 2),
+        ({'Main.cs': ''}, 1),
+        (list('<a/>'), 4),
+        (None, 0),
+    ],
+)
+def test_count_items(output, expected):
+    assert count_items(output) == expected
+
+
+def test_measures_every_stage(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    measured = []
+    instrumentation = Instrumentation(trace_memory=True, hooks=[measured.append])
+
+    output = compiler(
+        str(input_file), str(tmp_path / 'out'), 'writer', instrumentation=instrumentation, raise_errors=True
+    )
+
+    assert sorted(output.written) == ['Class1.cs', 'Class2.cs', 'Main.cs']
+    assert measured == instrumentation.stages
+    assert [(stats.stage, stats.items, stats.unit) for stats in measured] == [
+        ('source_reader', len(XML), 'chars'),
+        ('scanner', 39, 'tokens'),
+        ('parser', 5, 'elements'),
+        ('semantic_analyzer', 2, 'types'),
+        ('inter_code_gen', 3, 'declarations'),
+        ('code_gen', 3, 'files'),
+        ('writer', 3, 'files'),
+    ]
+    assert all(stats.wall_time >= 0 and stats.cpu_time >= 0 and stats.peak_memory >= 0 for stats in measured)
+    assert any(stats.peak_memory > 0 for stats in measured)
+
+
+# Prints whether the module of the last stage is imported once the first stage is measured
+STAGES_IMPORTED = """
+import sys
+from compiler.default import compiler
+from compiler.instrumentation import Instrumentation
+
+imported = []
+instrumentation = Instrumentation(hooks=[lambda stats: imported.append('compiler.code_gen' in sys.modules)])
+compiler(sys.argv[1], sys.argv[2], 'writer', instrumentation=instrumentation, raise_errors=True)
+print(imported[0])
+"""
+
+
+def test_stage_imports_not_measured(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    command = [sys.executable, '-c', STAGES_IMPORTED, str(input_file), str(tmp_path / 'out')]
+    output = subprocess.run(command, env=python_environment(), capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == 'True'
+
+
+def test_measures_incremental_engine(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    instrumentation = Instrumentation(trace_memory=False)
+    compiler(
+        str(input_file),
+        str(tmp_path / 'out'),
+        'writer',
+        incremental=IncrementalCompiler(),
+        instrumentation=instrumentation,
+        raise_errors=True,
+    )
+    assert [(stats.stage, stats.items, stats.peak_memory) for stats in instrumentation.stages] == [
+        ('parser', 5, 0),
+        ('code_gen', 3, 0),
+        ('writer', 3, 0),
+    ]
+
+
+def test_report(tmp_path):
+    instrumentation = Instrumentation()
+    instrumentation.stages = [
+        StageStats('scanner', 0.5, 0.25, 100, 10, 'tokens'),
+        StageStats('parser', 1.5, 1.25, 300, 2, 'elements'),
+    ]
+    path = tmp_path / 'stats.json'
+    instrumentation.save(str(path))
+    report = json.loads(path.read_text())
+    assert report['total'] == {'wall_time': 2.0, 'cpu_time': 1.5, 'peak_memory': 300}
+    assert report['stages'][1] == {
+        'stage': 'parser',
+        'wall_time': 1.5,
+        'cpu_time': 1.25,
+        'peak_memory': 300,
+        'items': 2,
+        'unit': 'elements',
+    }
+
+
+def test_counts_transitions(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    instrumentation = Instrumentation(trace_memory=False, count_transitions=True)
+    compiler(str(input_file), str(tmp_path / 'out'), 'parser', instrumentation=instrumentation, raise_errors=True)
+
+    scanner_counters, parser_counters = instrumentation.counters['scanner'], instrumentation.counters['parser']
+    # One transition per character, and one more for the end of the input
+    assert sum(scanner_counters.transitions.values()) == len(XML) + 1
+    assert sum(scanner_counters.tokens.values()) == 39
+    assert scanner_counters.tokens['String'] == 5
+    assert scanner_counters.transitions['string_input -> string_end'] == 5
+    assert sum(parser_counters.transitions.values()) == 39
+    assert parser_counters.tokens == {'StartToken': 3, 'SelfClosingToken': 2, 'EndToken': 3}
+    assert parser_counters.transitions['attribute_set_value -> element_attr_set'] == 5
+
+    counters = instrumentation.report()['counters']
+    assert list(counters) == ['scanner', 'parser']
+    transitions = list(counters['scanner']['transitions'].values())
+    assert transitions == sorted(transitions, reverse=True)
+
+
+def test_no_counters_by_default():
+    assert 'counters' not in Instrumentation().report()
+
+
+def test_memory_not_traced_by_default(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    instrumentation = Instrumentation()
+    compiler(str(input_file), str(tmp_path / 'out'), 'parser', instrumentation=instrumentation, raise_errors=True)
+    assert [stats.peak_memory for stats in instrumentation.stages] == [0, 0, 0]
+    assert instrumentation.report()['trace_memory'] is False
+    assert Instrumentation(trace_memory=True).report()['trace_memory'] is True
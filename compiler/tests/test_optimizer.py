@@ -0,0 +1,213 @@
+import pytest
+
+from compiler.code_gen import code_gen
+from compiler.optimizer import pool_constants, deduplicate_declarations
+from compiler.models import IntermediateCode, Class, ClassAttribute, Declaration, InstanceAttribute
+
+
+# Long enough for two occurrences to be worth a field
+SPAIN = 'Kingdom of Spain, ' * 4
+POLAND = 'Republic of Poland, ' * 4
+TYPES = [Class(name='Class1', attributes=[ClassAttribute(name='Country', attribute_type='string')])]
+
+
+@pytest.mark.parametrize(
+    'declarations, min_occurrences, expected_constants',
+    [
+        # Test Case 1: No repeated values
+        (
+            [
+                Declaration('0', 'a', 'Class1', [InstanceAttribute('Country', POLAND)]),
+                Declaration('1', 'b', 'Class1', [InstanceAttribute('Country', SPAIN)]),
+            ],
+            2,
+            {},
+        ),
+        # Test Case 2: Repeated values are pooled in order of first appearance
+        (
+            [
+                Declaration('0', 'a', 'Class1', [InstanceAttribute('Country', SPAIN)]),
+                Declaration('1', 'b', 'Class1', [InstanceAttribute('Country', POLAND)]),
+                Declaration('2', 'c', 'Class1', [InstanceAttribute('Country', POLAND)]),
+                Declaration('3', 'd', 'Class1', [InstanceAttribute('Country', SPAIN)]),
+            ],
+            2,
+            {SPAIN: 'Str0', POLAND: 'Str1'},
+        ),
+        # Test Case 3: Threshold is respected
+        (
+            [
+                Declaration('0', 'a', 'Class1', [InstanceAttribute('Country', SPAIN)]),
+                Declaration('1', 'b', 'Class1', [InstanceAttribute('Country', POLAND)]),
+                Declaration('2', 'c', 'Class1', [InstanceAttribute('Country', POLAND)]),
+                Declaration('3', 'd', 'Class1', [InstanceAttribute('Country', POLAND)]),
+                Declaration('4', 'e', 'Class1', [InstanceAttribute('Country', SPAIN)]),
+            ],
+            3,
+            {POLAND: 'Str0'},
+        ),
+        # Test Case 4: Short values cost more as fields than as literals
+        (
+            [Declaration(str(i), f'a{i}', 'Class1', [InstanceAttribute('Country', 'PL')]) for i in range(10)],
+            2,
+            {},
+        ),
+        # Test Case 5: Longer values pay off once they repeat often enough
+        (
+            [
+                Declaration(str(i), f'a{i}', 'Class1', [InstanceAttribute('Country', 'Republic of Poland')])
+                for i in range(5)
+            ],
+            2,
+            {},
+        ),
+        (
+            [
+                Declaration(str(i), f'a{i}', 'Class1', [InstanceAttribute('Country', 'Republic of Poland')])
+                for i in range(20)
+            ],
+            2,
+            {'Republic of Poland': 'Str0'},
+        ),
+        # Test Case 6: References and list members are never pooled
+        (
+            [
+                Declaration('0', 'a', 'Class1', [InstanceAttribute('Country', SPAIN)]),
+                Declaration('1', 'b', 'Class1', [InstanceAttribute('Parent', ref='0')]),
+                Declaration('2', 'c', 'Class1', [InstanceAttribute('Parent', ref='0')]),
+                Declaration('3', 'l', 'Class1', [InstanceAttribute('a', ref='0')], is_list=True),
+                Declaration('4', 'k', 'Class1', [InstanceAttribute('a', ref='0')], is_list=True),
+            ],
+            2,
+            {},
+        ),
+    ],
+)
+def test_pool_constants(declarations, min_occurrences, expected_constants):
+    result = pool_constants(IntermediateCode(TYPES, declarations), min_occurrences=min_occurrences)
+    assert result.constants == expected_constants
+    assert result.declarations == declarations
+
+
+def test_pool_constants_only_strings():
+    types = [
+        Class(
+            name='Class1',
+            attributes=[ClassAttribute(name='Name', attribute_type='string'), ClassAttribute('Age', 'int')],
+        )
+    ]
+    declarations = [
+        Declaration('0', 'a', 'Class1', [InstanceAttribute('Name', '30'), InstanceAttribute('Age', '30')]),
+        Declaration('1', 'b', 'Class1', [InstanceAttribute('Name', 'Bob'), InstanceAttribute('Age', '30')]),
+    ]
+    result = pool_constants(IntermediateCode(types, declarations))
+    assert result.constants == {}
+
+
+@pytest.mark.parametrize(
+    'declarations, expected_declarations',
+    [
+        # Test Case 1: Nothing to share
+        (
+            [
+                Declaration('0', 'a', 'Class1', [InstanceAttribute('Name', 'Tom')]),
+                Declaration('1', 'b', 'Class1', [InstanceAttribute('Name', 'Jerry')]),
+            ],
+            [
+                Declaration('0', 'a', 'Class1', [InstanceAttribute('Name', 'Tom')]),
+                Declaration('1', 'b', 'Class1', [InstanceAttribute('Name', 'Jerry')]),
+            ],
+        ),
+        # Test Case 2: Repeated parent subgraph is built once and references are redirected
+        (
+            [
+                Declaration('0', 'cat', 'Class1', [InstanceAttribute('Name', 'Garfield')]),
+                Declaration(
+                    '1', 'tom', 'Class1', [InstanceAttribute('Name', 'Tom'), InstanceAttribute('parent', ref='0')]
+                ),
+                Declaration('2', 'cat2', 'Class1', [InstanceAttribute('Name', 'Garfield')]),
+                Declaration(
+                    '3', 'sam', 'Class1', [InstanceAttribute('Name', 'Sam'), InstanceAttribute('parent', ref='2')]
+                ),
+            ],
+            [
+                Declaration('0', 'cat', 'Class1', [InstanceAttribute('Name', 'Garfield')]),
+                Declaration(
+                    '1', 'tom', 'Class1', [InstanceAttribute('Name', 'Tom'), InstanceAttribute('parent', ref='0')]
+                ),
+                Declaration(
+                    '3', 'sam', 'Class1', [InstanceAttribute('Name', 'Sam'), InstanceAttribute('parent', ref='0')]
+                ),
+            ],
+        ),
+        # Test Case 3: Whole identical subgraphs collapse, named top-level duplicates become aliases
+        (
+            [
+                Declaration('0', 'cat', 'Class1', [InstanceAttribute('Name', 'Garfield')]),
+                Declaration(
+                    '1', 'tom', 'Class1', [InstanceAttribute('Name', 'Tom'), InstanceAttribute('parent', ref='0')]
+                ),
+                Declaration('2', 'cat2', 'Class1', [InstanceAttribute('Name', 'Garfield')]),
+                Declaration(
+                    '3', 'tom2', 'Class1', [InstanceAttribute('parent', ref='2'), InstanceAttribute('Name', 'Tom')]
+                ),
+            ],
+            [
+                Declaration('0', 'cat', 'Class1', [InstanceAttribute('Name', 'Garfield')]),
+                Declaration(
+                    '1', 'tom', 'Class1', [InstanceAttribute('Name', 'Tom'), InstanceAttribute('parent', ref='0')]
+                ),
+                Declaration('3', 'tom2', 'Class1', ref='1'),
+            ],
+        ),
+        # Test Case 4: Lists are kept, their members are redirected
+        (
+            [
+                Declaration('0', 'car1', 'Class1', [InstanceAttribute('Name', 'Sally')]),
+                Declaration('1', 'car2', 'Class1', [InstanceAttribute('Name', 'Sally')]),
+                Declaration(
+                    '2',
+                    'cars',
+                    'Class1',
+                    [InstanceAttribute('car1', ref='0'), InstanceAttribute('car2', ref='1')],
+                    True,
+                ),
+            ],
+            [
+                Declaration('0', 'car1', 'Class1', [InstanceAttribute('Name', 'Sally')]),
+                Declaration(
+                    '2',
+                    'cars',
+                    'Class1',
+                    [InstanceAttribute('car1', ref='0'), InstanceAttribute('car2', ref='0')],
+                    True,
+                ),
+            ],
+        ),
+        # Test Case 5: Same values in different classes are not shared
+        (
+            [
+                Declaration('0', 'a', 'Class1', [InstanceAttribute('Name', 'Tom')]),
+                Declaration('1', 'b', 'Class2', [InstanceAttribute('Name', 'Tom')]),
+            ],
+            [
+                Declaration('0', 'a', 'Class1', [InstanceAttribute('Name', 'Tom')]),
+                Declaration('1', 'b', 'Class2', [InstanceAttribute('Name', 'Tom')]),
+            ],
+        ),
+    ],
+)
+def test_deduplicate_declarations(declarations, expected_declarations):
+    result = deduplicate_declarations(IntermediateCode(TYPES, declarations))
+    assert result.declarations == expected_declarations
+
+
+def test_deduplicate_declarations_aliases_instances():
+    declarations = [
+        Declaration('0', 'a', 'Class1', [InstanceAttribute('Country', 'Spain')]),
+        Declaration('1', 'b', 'Class1', [InstanceAttribute('Country', 'Spain')]),
+    ]
+    result = code_gen(deduplicate_declarations(IntermediateCode(TYPES, declarations)), init_only=True)
+    # The shared instance cannot be changed through `b` behind the back of `a`
+    assert result['Main.cs'] == 'Class1 a = new Class1("Spain");\nClass1 b = a;'
+    assert '    public string Country { get; init; }\n' in result['Class1.cs']
@@ -0,0 +1,68 @@
+import pstats
+import tracemalloc
+
+import pytest
+
+from compiler.default import compiler
+from compiler.instrumentation import Instrumentation
+from compiler.profiling import StageProfiler
+
+XML = '<root> <tom Name="Tom" Age="3"/> <jerry Name="Jerry" Age="2"/> </root>'
+STAGES = ['source_reader', 'scanner', 'parser', 'semantic_analyzer', 'inter_code_gen', 'code_gen', 'writer']
+
+
+def test_profiles_every_stage(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    profile_dir = tmp_path / 'profiles'
+
+    output = compiler(
+        str(input_file), str(tmp_path / 'out'), 'writer', profiler=StageProfiler(str(profile_dir)), raise_errors=True
+    )
+
+    assert sorted(output.written) == ['Class1.cs', 'Main.cs']
+    assert sorted(path.name for path in profile_dir.iterdir()) == sorted(
+        name for stage in STAGES for name in (f'{stage}.pstats', f'{stage}.allocations.txt')
+    )
+    functions = {function_name for _, _, function_name in pstats.Stats(str(profile_dir / 'parser.pstats')).stats}
+    assert '__call__' in functions
+    functions = {
+        function_name for _, _, function_name in pstats.Stats(str(profile_dir / 'semantic_analyzer.pstats')).stats
+    }
+    assert 'verify_and_build_typed_ast' in functions
+    allocations = (profile_dir / 'scanner.allocations.txt').read_text()
+    assert allocations.startswith('Top 25 allocations of scanner\n')
+    assert 'scanner.py' in allocations
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiles_without_allocations(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    profile_dir = tmp_path / 'profiles'
+    profiler = StageProfiler(str(profile_dir), trace_allocations=False)
+    compiler(str(input_file), str(tmp_path / 'out'), 'parser', profiler=profiler, raise_errors=True)
+    assert sorted(path.name for path in profile_dir.iterdir()) == sorted(f'{stage}.pstats' for stage in STAGES[:3])
+    assert not tracemalloc.is_tracing()
+
+
+def test_rejects_instrumentation(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    with pytest.raises(ValueError):
+        compiler(
+            str(input_file),
+            str(tmp_path / 'out'),
+            'parser',
+            instrumentation=Instrumentation(),
+            profiler=StageProfiler(str(tmp_path / 'profiles')),
+        )
+    assert not (tmp_path / 'profiles').exists()
+
+
+def test_top_allocations(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(XML)
+    profiler = StageProfiler(str(tmp_path / 'profiles'), top=3)
+    compiler(str(input_file), str(tmp_path / 'out'), 'parser', profiler=profiler, raise_errors=True)
+    assert len((tmp_path / 'profiles' / 'parser.allocations.txt').read_text().splitlines()) <= 4
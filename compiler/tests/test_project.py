@@ -0,0 +1,89 @@
+import pytest
+
+from compiler.project import main_filename, main_filenames, project_compiler
+from compiler.sinks import MemorySink
+
+
+CATS = (
+    '<root> <tom Name="Tom" Age="3"/> <garfield Name="Garfield"> <owner> <jon Name="Jon"/> </owner> </garfield> </root>'
+)
+DOGS = '<root> <rex Name="Rex" Age="5"/> <tom Name="Tom" Age="3"/> </root>'
+
+
+@pytest.fixture
+def input_files(tmp_path):
+    (tmp_path / 'pets').mkdir()
+    (tmp_path / 'cats.xml').write_text(CATS)
+    (tmp_path / 'pets' / 'dogs.xml').write_text(DOGS)
+    return [str(tmp_path / 'cats.xml'), str(tmp_path / 'pets' / 'dogs.xml')]
+
+
+@pytest.mark.parametrize(
+    'relative_path, expected',
+    [
+        ('cats', 'cats.Main.cs'),
+        ('pets/dogs', 'pets.dogs.Main.cs'),
+    ],
+)
+def test_main_filename(relative_path, expected):
+    assert main_filename(relative_path) == expected
+
+
+def test_main_filenames_collision(tmp_path):
+    (tmp_path / 'pets').mkdir()
+    (tmp_path / 'pets' / 'dogs.xml').write_text(DOGS)
+    (tmp_path / 'pets.dogs.xml').write_text(CATS)
+    input_files = [str(tmp_path / 'pets' / 'dogs.xml'), str(tmp_path / 'pets.dogs.xml')]
+    with pytest.raises(ValueError, match='pets.dogs.Main.cs'):
+        main_filenames(input_files)
+    sink = MemorySink()
+    with pytest.raises(ValueError):
+        project_compiler(input_files, 'unused', sink=sink, raise_errors=True)
+    assert sink.files == {}
+
+
+def test_project_compiler(input_files):
+    sink = MemorySink()
+    output = project_compiler(input_files, 'unused', sink=sink, raise_errors=True)
+
+    assert sorted(output.written) == ['Class1.cs', 'Class2.cs', 'cats.Main.cs', 'pets.dogs.Main.cs']
+    # The same shape in both files is built from the same class
+    assert 'Class1 tom = new Class1("3", "Tom");' in sink.files['cats.Main.cs']
+    assert 'Class1 tom = new Class1("3", "Tom");' in sink.files['pets.dogs.Main.cs']
+    assert 'Class1 rex = new Class1("5", "Rex");' in sink.files['pets.dogs.Main.cs']
+
+
+def test_project_compiler_constant_pool(tmp_path):
+    # The description repeats only across the files, and is long enough to be pooled
+    description = 'A cat who likes lasagna and hates Mondays, drawn since 1978 by Jim Davis'
+    (tmp_path / 'cats.xml').write_text(f'<root> <tom Name="Tom" Note="{description}"/> </root>')
+    (tmp_path / 'dogs.xml').write_text(f'<root> <rex Name="Rex" Note="{description}"/> </root>')
+    sink = MemorySink()
+    project_compiler(
+        [str(tmp_path / 'cats.xml'), str(tmp_path / 'dogs.xml')],
+        'unused',
+        constant_pool=True,
+        sink=sink,
+        raise_errors=True,
+    )
+
+    assert f'"{description}"' in sink.files['Constants.cs']
+    assert 'new Class1("Tom", Constants.Str0)' in sink.files['cats.Main.cs']
+    assert 'new Class1("Rex", Constants.Str0)' in sink.files['dogs.Main.cs']
+
+
+def test_project_compiler_many_types(tmp_path):
+    # More than ten types, referenced from attributes of other types
+    elements = ' '.join(
+        f'<holder{i} Id{i}="{i}"> <value{i}> <item{i} Attr{i}="{i}"/> </value{i}> </holder{i}>' for i in range(12)
+    )
+    (tmp_path / 'many.xml').write_text(f'<root> {elements} </root>')
+    sink = MemorySink()
+    project_compiler([str(tmp_path / 'many.xml')], 'unused', sink=sink, raise_errors=True)
+    assert len([filename for filename in sink.files if filename.startswith('Class')]) == 24
+
+
+def test_project_compiler_error(tmp_path, capsys):
+    (tmp_path / 'broken.xml').write_text('<root> <cat Name="Tom"> </root>')
+    assert project_compiler([str(tmp_path / 'broken.xml')], 'unused', sink=MemorySink()) is None
+    assert 'Exception occurred' in capsys.readouterr().out
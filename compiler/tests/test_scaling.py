@@ -0,0 +1,52 @@
+import pytest
+
+from compiler.benchmarks.models import DocumentShape, ScalingResult
+from compiler.benchmarks.scaling import (
+    DEFAULT_MAX_EXPONENT,
+    SCALING_SHAPES,
+    measure_scaling,
+    scaled_shape,
+    scaling_violations,
+)
+
+
+@pytest.mark.parametrize(
+    'times, expected',
+    [
+        ([1.0, 2.0, 4.0, 8.0], 1.0),
+        ([1.0, 4.0, 16.0, 64.0], 2.0),
+        ([3.0, 3.0, 3.0, 3.0], 0.0),
+    ],
+)
+def test_exponent(times, expected):
+    assert ScalingResult('wide', 'parser', [100, 200, 400, 800], times).exponent == pytest.approx(expected)
+
+
+def test_scaled_shape():
+    shape = DocumentShape(children=10, types=5, string_length=3)
+    assert scaled_shape(shape, ('children', 'types'), 4) == DocumentShape(children=40, types=20, string_length=3)
+
+
+def test_scaling_violations():
+    results = [
+        ScalingResult('wide', 'parser', [1, 2], [1.0, 2.0]),
+        ScalingResult('wide', 'code_gen', [1, 2], [1.0, 4.0]),
+        # Known to be superlinear on wide documents, but not on deep ones
+        ScalingResult('wide', 'semantic_analyzer', [1, 2], [1.0, 3.0]),
+        ScalingResult('deep', 'semantic_analyzer', [1, 2], [1.0, 3.0]),
+    ]
+    assert scaling_violations(results) == [
+        f'code_gen grows as size^2.00 on wide documents, above the bound of {DEFAULT_MAX_EXPONENT}',
+        f'semantic_analyzer grows as size^1.58 on deep documents, above the bound of {DEFAULT_MAX_EXPONENT}',
+    ]
+
+
+@pytest.mark.timing
+@pytest.mark.parametrize('shape_name', list(SCALING_SHAPES))
+def test_scaling(shape_name):
+    violations = scaling_violations(measure_scaling(shape_name))
+    if violations:
+        # Timings are noisy, only a stage exceeding its bound twice in a row fails
+        stages = tuple(violation.split()[0] for violation in violations)
+        violations = scaling_violations(measure_scaling(shape_name, stages=stages))
+    assert not violations
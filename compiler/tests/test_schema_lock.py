@@ -0,0 +1,97 @@
+import json
+import os
+
+import pytest
+
+from compiler.default import compiler
+from compiler.errors import SchemaLockError
+from compiler.models import ClassAttribute, XmlElement
+from compiler.schema_lock import SchemaLock
+from compiler.semantic_analyzer import SemanticAnalyzer
+from compiler.sinks import MemorySink
+
+
+@pytest.mark.parametrize(
+    'classes, signatures, expected_names',
+    [
+        # Test Case 1: Empty lock numbers the classes in order
+        ({}, [('Age', 'Name'), ('Name',)], ['Class1', 'Class2']),
+        # Test Case 2: Locked names are reused, new ones follow the highest number
+        (
+            {('Age', 'Name'): 'Class3', ('Owner',): 'Class1'},
+            [('Color',), ('Age', 'Name')],
+            ['Class4', 'Class3'],
+        ),
+    ],
+)
+def test_assign(classes, signatures, expected_names):
+    lock = SchemaLock(classes)
+    assert lock.assign(signatures) == expected_names
+    assert lock.active == set(expected_names)
+    assert lock.assign(signatures) == expected_names
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'schema.lock')
+    assert SchemaLock.load(path).classes == {}
+
+    lock = SchemaLock({('Owner',): 'Class1'})
+    lock.assign([('Age', 'Name')])
+    lock.save(path)
+    loaded = SchemaLock.load(path)
+    # Retired classes stay reserved
+    assert loaded.classes == {('Owner',): 'Class1', ('Age', 'Name'): 'Class2'}
+    assert loaded.active == {'Class2'}
+
+    os.utime(path, ns=(0, 0))
+    loaded.save(path)
+    assert os.stat(path).st_mtime_ns == 0
+
+
+@pytest.mark.parametrize('content', ['{"version": ', json.dumps({'version': 99, 'classes': []})])
+def test_load_invalid(tmp_path, content):
+    path = tmp_path / 'schema.lock'
+    path.write_text(content)
+    with pytest.raises(SchemaLockError):
+        SchemaLock.load(str(path))
+
+
+def test_minimization_skipped_when_locked():
+    lock = SchemaLock({('a',): 'Class1', ('a', 'b'): 'Class2'}, active={'Class1', 'Class2'})
+    analyzer = SemanticAnalyzer(XmlElement('root'), schema_lock=lock)
+    analyzer.identified_types = [
+        {ClassAttribute('a', 'string')},
+        {ClassAttribute('a', 'string'), ClassAttribute('b', '0')},
+    ]
+    analyzer.minimize_types()
+    assert len(analyzer.identified_types) == 2
+
+    analyzer = SemanticAnalyzer(XmlElement('root'), schema_lock=SchemaLock())
+    analyzer.identified_types = [
+        {ClassAttribute('a', 'string')},
+        {ClassAttribute('a', 'string'), ClassAttribute('b', '0')},
+    ]
+    analyzer.minimize_types()
+    assert len(analyzer.identified_types) == 1
+
+
+def test_compiler_keeps_class_names(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    lock_path = str(tmp_path / 'schema.lock')
+
+    def compile_with(content, **options):
+        input_file.write_text(content)
+        sink = MemorySink()
+        compiler(str(input_file), 'unused', 'writer', sink=sink, raise_errors=True, **options)
+        return sink.files
+
+    cats = '<root> <tom Name="Tom"/> </root>'
+    # The new type sorts before the existing one
+    cats_and_cars = '<root> <tom Name="Tom"/> <car Brand="Fiat" Age="3"/> </root>'
+
+    assert compile_with(cats)['Main.cs'] == compile_with(cats, schema_lock=lock_path)['Main.cs']
+    assert 'Class2 tom' in compile_with(cats_and_cars)['Main.cs']
+    files = compile_with(cats_and_cars, schema_lock=lock_path)
+    assert 'Class1 tom' in files['Main.cs']
+    assert 'Class2 car' in files['Main.cs']
+    assert sorted(SchemaLock.load(lock_path).classes.values()) == ['Class1', 'Class2']
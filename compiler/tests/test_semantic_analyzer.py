@@ -3,7 +3,7 @@ from compiler.semantic_analyzer import SemanticAnalyzer
 from compiler.models import XmlElement, TypedXmlElement
 from compiler.models import ClassAttribute, ElementAttribute
 from compiler.errors import SemanticError
-from compiler.semantic_analyzer import semantic_analyzer
+from compiler.semantic_analyzer import semantic_analyzer, infer_value_type, widen_type, project_semantic_analyzer
 
 
 @pytest.mark.parametrize(
@@ -463,3 +463,157 @@ def test_semantic_analyzer_output_types(input_xml_element, expected_types):
     actual_types = output.types
     # Convert sets to sets of frozensets for comparison
     assert set(frozenset(t) for t in actual_types) == set(frozenset(t) for t in expected_types)
+
+
+@pytest.mark.parametrize(
+    'value, expected_type',
+    [
+        ('42', 'int'),
+        ('-7', 'int'),
+        ('2147483648', 'long'),
+        ('-9223372036854775808', 'long'),
+        ('9223372036854775808', 'string'),
+        ('2.5', 'double'),
+        ('.5', 'double'),
+        ('1e10', 'double'),
+        ('true', 'bool'),
+        ('True', 'string'),
+        ('nan', 'string'),
+        ('inf', 'string'),
+        ('1_000', 'string'),
+        ('', 'string'),
+        ('Tom', 'string'),
+        # Values the generated literal would not read back as
+        ('00501', 'string'),
+        ('007', 'string'),
+        ('+12', 'string'),
+        ('-0', 'string'),
+        ('0', 'int'),
+        ('+2.5', 'string'),
+        ('007.5', 'string'),
+        ('0.5', 'double'),
+        ('3.14159265358979323846', 'string'),
+        ('1e-400', 'string'),
+    ],
+)
+def test_infer_value_type(value, expected_type):
+    assert infer_value_type(value) == expected_type
+
+
+@pytest.mark.parametrize(
+    'first, second, expected_type',
+    [
+        ('int', 'int', 'int'),
+        ('int', 'long', 'long'),
+        ('double', 'int', 'double'),
+        ('long', 'double', 'double'),
+        ('bool', 'bool', 'bool'),
+        ('bool', 'int', 'string'),
+        ('string', 'int', 'string'),
+    ],
+)
+def test_widen_type(first, second, expected_type):
+    assert widen_type(first, second) == expected_type
+
+
+def test_semantic_analyzer_infer_types():
+    input_xml_element = XmlElement(
+        element_name='root',
+        children=[
+            XmlElement(
+                element_name='person1',
+                attributes=[
+                    ElementAttribute(name='name', value='Alice'),
+                    ElementAttribute(name='age', value='30'),
+                    ElementAttribute(name='height', value='170'),
+                    ElementAttribute(name='active', value='true'),
+                ],
+                children=[
+                    XmlElement(
+                        element_name='parent',
+                        children=[
+                            XmlElement(
+                                element_name='bob',
+                                attributes=[
+                                    ElementAttribute(name='name', value='Bob'),
+                                    ElementAttribute(name='height', value='181.5'),
+                                ],
+                            )
+                        ],
+                    )
+                ],
+            ),
+            XmlElement(
+                element_name='person2',
+                attributes=[
+                    ElementAttribute(name='age', value='4000000000'),
+                    ElementAttribute(name='active', value='1'),
+                ],
+            ),
+        ],
+    )
+    output = semantic_analyzer(input_xml_element, infer_types=True)
+    assert len(output.types) == 1
+    assert {(attr.name, attr.attribute_type) for attr in output.types[0]} == {
+        ('name', 'string'),
+        ('age', 'long'),
+        ('height', 'double'),
+        ('active', 'string'),
+        ('parent', '0'),
+    }
+
+    untyped = semantic_analyzer(input_xml_element)
+    assert {attr.attribute_type for attr in untyped.types[0] if attr.name != 'parent'} == {'string'}
+
+
+@pytest.mark.parametrize(
+    'values, expected_type',
+    [
+        (['1.5', '9007199254740992'], 'double'),
+        (['9007199254740993', '1.5'], 'string'),
+        (['1.5', '12345678901234567'], 'string'),
+        (['12345678901234567', '3'], 'long'),
+    ],
+)
+def test_semantic_analyzer_infer_widened_double(values, expected_type):
+    # Integers widened to double must keep their exact value
+    input_xml_element = XmlElement(
+        element_name='root',
+        children=[
+            XmlElement(element_name=f'item{i}', attributes=[ElementAttribute(name='id', value=value)])
+            for i, value in enumerate(values)
+        ],
+    )
+    output = semantic_analyzer(input_xml_element, infer_types=True)
+    assert [(attr.name, attr.attribute_type) for attr in output.types[0]] == [('id', expected_type)]
+
+
+def test_project_semantic_analyzer():
+    first = XmlElement(
+        element_name='root',
+        children=[
+            XmlElement(element_name='cat', attributes=[ElementAttribute(name='name', value='Tom')]),
+        ],
+    )
+    second = XmlElement(
+        element_name='root',
+        children=[
+            # Element names repeat across files, types are shared and widened across them
+            XmlElement(element_name='cat', attributes=[ElementAttribute(name='name', value='Tom')]),
+            XmlElement(
+                element_name='dog',
+                attributes=[ElementAttribute(name='name', value='Rex'), ElementAttribute(name='age', value='3')],
+            ),
+        ],
+    )
+    outputs = project_semantic_analyzer([first, second], infer_types=True)
+    assert len(outputs) == 2
+    assert outputs[0].types is outputs[1].types
+    assert [{(attr.name, attr.attribute_type) for attr in attrs} for attrs in outputs[0].types] == [
+        {('name', 'string'), ('age', 'int')}
+    ]
+    assert [child.identified_type for child in outputs[0].typed_ast.children] == [0]
+    assert [child.identified_type for child in outputs[1].typed_ast.children] == [0, 0]
+
+    with pytest.raises(SemanticError):
+        project_semantic_analyzer([second, XmlElement(element_name='root', children=[second.children[0]] * 2)])
@@ -0,0 +1,113 @@
+import pickle
+
+import pytest
+
+from compiler.errors import SerializationError
+from compiler.models import (
+    Class,
+    ClassAttribute,
+    Declaration,
+    ElementAttribute,
+    InstanceAttribute,
+    IntermediateCode,
+    SemanticAnalyzerOutput,
+    TypedXmlElement,
+    XmlElement,
+)
+from compiler.serialization import dumps, load, loads, save
+
+
+# The equality of XmlElement ignores children, so the values are compared by their full repr
+@pytest.mark.parametrize(
+    'value',
+    [
+        XmlElement('root'),
+        XmlElement('root', [], []),
+        XmlElement(
+            'root',
+            children=[
+                XmlElement('kitten', [ElementAttribute('Name', 'Whiskers'), ElementAttribute('Flag', None)]),
+                XmlElement('cars', children=[XmlElement('car', [ElementAttribute('Name', 'Zażółć \ud800 \x00')])]),
+            ],
+        ),
+        TypedXmlElement(
+            'root',
+            -1,
+            'root',
+            children=[
+                TypedXmlElement('kitten', 0, 'declaration', attributes=[ElementAttribute('Name', 'Tom')]),
+                TypedXmlElement('cars', 'string', 'variable', children=[], is_list=True),
+                TypedXmlElement('car', 1, None, identified_class=Class('Class1', [ClassAttribute('Name', 'int')])),
+            ],
+        ),
+        IntermediateCode(
+            types=[Class('Class0', [ClassAttribute('Name', 'string'), ClassAttribute('Age', 'int')])],
+            declarations=[
+                Declaration('0', 'cat', 'Class0', [InstanceAttribute('Name', 'Tom'), InstanceAttribute('Age', '3')]),
+                Declaration('1', 'cats', 'Class0', [InstanceAttribute('cat', ref='0', is_list=True)], True),
+                Declaration('2', 'alias', 'Class0', ref='0'),
+            ],
+            constants={'Tom': 'Str0'},
+        ),
+        IntermediateCode([], []),
+        {'Class0.cs': 'public class Class0 {}', 'Main.cs': ''},
+        {},
+    ],
+)
+def test_round_trip(value):
+    assert repr(loads(dumps(value))) == repr(value)
+
+
+def test_round_trip_semantic_analyzer_output():
+    value = SemanticAnalyzerOutput(
+        typed_ast=TypedXmlElement('root', -1, 'root', children=[TypedXmlElement('cat', 0, 'declaration')]),
+        types=[{ClassAttribute('Name', 'string'), ClassAttribute('parent', '1')}, set()],
+    )
+    result = loads(dumps(value))
+    assert repr(result.typed_ast) == repr(value.typed_ast)
+    assert [{(a.name, a.attribute_type) for a in attrs} for attrs in result.types] == [
+        {(a.name, a.attribute_type) for a in attrs} for attrs in value.types
+    ]
+
+
+def test_large_ints_round_trip():
+    value = TypedXmlElement('root', 1 << 40, 'root')
+    assert loads(dumps(value)).identified_type == 1 << 40
+
+
+def test_smaller_than_pickle():
+    value = XmlElement(
+        'root',
+        children=[
+            XmlElement(f'cat{i}', [ElementAttribute('Name', f'Cat {i % 10}'), ElementAttribute('Country', 'Poland')])
+            for i in range(1000)
+        ],
+    )
+    assert len(dumps(value)) * 2 < len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_save_load(tmp_path):
+    path = tmp_path / 'ast.bin'
+    value = XmlElement('root', [ElementAttribute('Name', 'Tom')])
+    save(str(path), value)
+    assert repr(load(str(path))) == repr(value)
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'',
+        b'not serialized data at all',
+        dumps(XmlElement('root'))[:-1],
+        # Unknown kind of value
+        dumps(XmlElement('root'))[:9] + b'\x63' + dumps(XmlElement('root'))[10:],
+    ],
+)
+def test_invalid_data(data):
+    with pytest.raises(SerializationError):
+        loads(data)
+
+
+def test_unsupported_value():
+    with pytest.raises(SerializationError):
+        dumps([XmlElement('root')])
@@ -0,0 +1,80 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from compiler.default import compiler
+from compiler.models import WriterOutput
+from compiler.sinks import FileSystemSink, MemorySink, TarSink, ZipSink, make_sink
+
+
+FILE_MAP = {'Class1.cs': 'public class Class1 {}', 'Main.cs': 'Class1 cat = new Class1();'}
+
+
+def test_memory_sink():
+    sink = MemorySink()
+    assert sink.write(FILE_MAP) == WriterOutput(written=['Class1.cs', 'Main.cs'])
+    assert sink.files == FILE_MAP
+
+
+def test_filesystem_sink(tmp_path):
+    sink = FileSystemSink(str(tmp_path), manifest=True)
+    assert sink.write(FILE_MAP).written == ['Class1.cs', 'Main.cs']
+    assert sink.write(FILE_MAP).skipped == ['Class1.cs', 'Main.cs']
+    assert (tmp_path / 'Main.cs').read_text() == FILE_MAP['Main.cs']
+
+
+def test_zip_sink():
+    buffer = io.BytesIO()
+    ZipSink(buffer).write(FILE_MAP)
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as archive:
+        assert {name: archive.read(name).decode() for name in archive.namelist()} == FILE_MAP
+
+
+@pytest.mark.parametrize('compression', ['', 'gz', 'xz'])
+def test_tar_sink(compression):
+    buffer = io.BytesIO()
+    TarSink(buffer, compression=compression).write(FILE_MAP)
+    with tarfile.open(fileobj=io.BytesIO(buffer.getvalue()), mode=f'r:{compression}') as archive:
+        assert {member.name: archive.extractfile(member).read().decode() for member in archive} == FILE_MAP
+
+
+def test_tar_sink_to_stdout(capsysbinary):
+    TarSink('-').write(FILE_MAP)
+    with tarfile.open(fileobj=io.BytesIO(capsysbinary.readouterr().out)) as archive:
+        assert sorted(archive.getnames()) == sorted(FILE_MAP)
+
+
+def test_streamed_compilation_error(tmp_path, capsys):
+    (tmp_path / 'broken.xml').write_text('<root> <cat Name="Tom"> </root>')
+    assert compiler(str(tmp_path / 'broken.xml'), '-', 'writer', sink='tar') is None
+    output = capsys.readouterr()
+    # The error would corrupt the archive streamed to the standard output
+    assert output.out == ''
+    assert 'Exception occurred' in output.err
+
+
+def test_archives_are_reproducible(tmp_path):
+    first, second = tmp_path / 'first.zip', tmp_path / 'second.zip'
+    make_sink('zip', str(first)).write(FILE_MAP)
+    os.utime(tmp_path, (0, 0))
+    make_sink('zip', str(second)).write(FILE_MAP)
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_make_sink_unknown():
+    with pytest.raises(ValueError):
+        make_sink('ftp', 'generated')
+
+
+def test_compiler_with_memory_sink(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text('<root> <cat Name="Whiskers"/> </root>')
+    sink = MemorySink()
+
+    compiler(str(input_file), output_dir=str(tmp_path / 'unused'), max_func='writer', sink=sink)
+
+    assert sink.files['Main.cs'] == 'Class1 cat = new Class1("Whiskers");'
+    assert os.listdir(tmp_path) == ['input.xml']
@@ -0,0 +1,98 @@
+import subprocess
+import sys
+
+import pytest
+
+from compiler.benchmarks.startup import (
+    STARTUP_BUDGET,
+    heavy_imports,
+    imported_modules,
+    python_environment,
+    startup_time,
+)
+from compiler.settings import OPTIONS, changed_options, load_settings, parse_plain_arguments, settings_class
+
+PLAIN_ARGUMENTS = [
+    ['a.xml'],
+    ['a.xml', '--output_dir', 'out'],
+    ['--output_dir=-', 'a.xml', '--sink', 'tar'],
+    ['a.xml', '--constant_pool', 'YES', '--deduplicate=0', '--infer_types', 'on'],
+    ['a.xml', '--constant_pool_min_occurrences', '-3', '--cache_max_size', '+12'],
+    ['a.xml', '--watch_interval', '1e-2', '--cache_dir', 'cache'],
+    ['a.xml', '--constant_pool', 'off', '--constant_pool', 'on'],
+    ['--', 'a.xml'],
+]
+# Command lines left to pydantic: help, errors, and values only pydantic understands
+OTHER_ARGUMENTS = [
+    [],
+    ['-h'],
+    ['a.xml', '--help'],
+    ['a.xml', 'out'],
+    ['a.xml', '--infer_types'],
+    ['a.xml', '--infer_types', '2'],
+    ['a.xml', '--infer-types', '1'],
+    ['a.xml', '--out', 'x'],
+    ['a.xml', '--jobs', '1_0'],
+    ['a.xml', '--cache_dir', 'null'],
+    ['a.xml', '--watch_interval', 'inf'],
+    ['a.xml', '--jobs', '\u0663'],
+    ['a.xml', '--watch_interval', '\u0661.5'],
+]
+
+
+@pytest.mark.parametrize('argv', PLAIN_ARGUMENTS)
+def test_plain_arguments(argv):
+    settings = parse_plain_arguments(argv)
+    assert settings is not None
+    assert set(vars(settings)) == {'input_file', *OPTIONS}
+    assert settings.input_file == 'a.xml'
+
+
+def test_plain_values():
+    settings = parse_plain_arguments(PLAIN_ARGUMENTS[3] + ['--watch_interval', '.5', '--jobs', '4'])
+    assert (settings.constant_pool, settings.deduplicate, settings.infer_types) == (True, False, True)
+    assert (settings.watch_interval, settings.jobs, settings.cache_dir) == (0.5, 4, None)
+    assert load_settings(['a.xml', '--output_dir', 'out']).output_dir == 'out'
+
+
+@pytest.mark.parametrize('argv', OTHER_ARGUMENTS)
+def test_other_arguments(argv):
+    assert parse_plain_arguments(argv) is None
+
+
+def test_environment_variables(monkeypatch):
+    monkeypatch.setenv('OUTPUT_DIR', 'out')
+    assert parse_plain_arguments(['a.xml']) is None
+
+
+@pytest.mark.parametrize('argv', PLAIN_ARGUMENTS)
+def test_same_settings_as_pydantic(argv):
+    pytest.importorskip('pydantic_settings')
+    assert vars(parse_plain_arguments(argv)) == settings_class()(_cli_parse_args=argv).model_dump()
+
+
+def test_lazy_stages():
+    code = 'import sys, compiler.default; print(" ".join(sorted(sys.modules)))'
+    output = subprocess.run(
+        [sys.executable, '-c', code], env=python_environment(), capture_output=True, text=True, check=True
+    )
+    modules = set(output.stdout.split())
+    assert 'compiler.default' in modules
+    assert not modules & {'compiler.scanner', 'compiler.parser', 'compiler.semantic_analyzer', 'compiler.code_gen'}
+
+
+def test_plain_invocation_imports():
+    modules = imported_modules()
+    assert {'compiler.scanner', 'compiler.code_gen', 'compiler.sinks'} <= modules
+    assert heavy_imports(modules) == []
+
+
+@pytest.mark.timing
+def test_startup_budget():
+    # Timings are noisy, only exceeding the budget twice in a row fails
+    assert startup_time() < STARTUP_BUDGET or startup_time() < STARTUP_BUDGET
+
+
+def test_changed_options():
+    settings = parse_plain_arguments(['a.xml', '--cache_dir', 'cache', '--max_function', 'writer', '--jobs', '2'])
+    assert changed_options(settings, ('max_function', 'cache_dir', 'artifacts_dir', 'jobs')) == ['cache_dir', 'jobs']
@@ -0,0 +1,79 @@
+import os
+import threading
+
+from compiler.watch import Watcher
+
+
+CATS = '<root> <tom Name="Tom"/> </root>'
+DOGS = '<root> <rex Name="Rex" Age="3"/> </root>'
+
+
+def test_watcher_recompiles_changed_files(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(CATS)
+    output_dir = tmp_path / 'out'
+    watcher = Watcher([str(input_file)], str(output_dir))
+
+    results = watcher.poll()
+    assert [result.input_file for result in results] == [str(input_file)]
+    assert results[0].error is None
+    assert 'Class1 tom' in (output_dir / 'Main.cs').read_text()
+
+    # Nothing changed
+    assert watcher.poll() == []
+
+    # Saved again without changes
+    input_file.write_text(CATS)
+    os.utime(input_file, ns=(1, 1))
+    assert watcher.poll() == []
+
+    input_file.write_text(DOGS)
+    os.utime(input_file, ns=(2, 2))
+    results = watcher.poll()
+    assert len(results) == 1
+    assert 'Class1 rex' in (output_dir / 'Main.cs').read_text()
+
+
+def test_watcher_directory(tmp_path):
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    (corpus / 'cats.xml').write_text(CATS)
+    watcher = Watcher([str(corpus)], str(tmp_path / 'out'))
+    assert len(watcher.poll()) == 1
+
+    # New files are picked up, broken ones are reported
+    (corpus / 'dogs.xml').write_text(DOGS)
+    (corpus / 'broken.xml').write_text('<root> <tom Name="Tom"> </root>')
+    results = {os.path.basename(result.input_file): result for result in watcher.poll()}
+    assert sorted(results) == ['broken.xml', 'dogs.xml']
+    assert results['broken.xml'].error is not None
+    assert (tmp_path / 'out' / 'dogs' / 'Main.cs').exists()
+
+
+def test_watcher_stable_destinations(tmp_path):
+    corpus = tmp_path / 'corpus'
+    (corpus / 'a').mkdir(parents=True)
+    (corpus / 'b').mkdir()
+    (corpus / 'a' / 'cats.xml').write_text(CATS)
+    watcher = Watcher([str(corpus / '**' / '*.xml')], str(tmp_path / 'out'))
+    watcher.poll()
+    assert (tmp_path / 'out' / 'a' / 'cats' / 'Main.cs').exists()
+
+    # Adding a file does not move the output of the others
+    (corpus / 'b' / 'dogs.xml').write_text(DOGS)
+    assert [result.output_dir for result in watcher.poll()] == [str(tmp_path / 'out' / 'b' / 'dogs')]
+    assert watcher.destinations()[str(corpus / 'a' / 'cats.xml')] == str(tmp_path / 'out' / 'a' / 'cats')
+
+
+def test_watcher_run_until_stopped(tmp_path):
+    input_file = tmp_path / 'input.xml'
+    input_file.write_text(CATS)
+    stop = threading.Event()
+    results = []
+
+    def on_result(result):
+        results.append(result)
+        stop.set()
+
+    Watcher([str(input_file)], str(tmp_path / 'out'), on_result=on_result).run(interval=0.01, stop=stop)
+    assert len(results) == 1
@@ -1,16 +1,138 @@
 import os
 
+import pytest
 
-def writer(file_map: dict[str, str], output_dir: str) -> None:
-    """
-    Writes the generated C# code to disk.
+from compiler.models import WriterOutput
+from compiler.writer import FSYNC_POLICIES, MANIFEST_FILENAME, changed_files, read_manifest, writer
 
-    Args:
-        file_map (Dict[str, str]): A mapping from filenames to their C# code content.
-        output_dir (str): The directory to output the C# code.
-    """
-    os.makedirs(output_dir, exist_ok=True)
+
+def test_writer_creates_files(tmp_path):
+    output_dir = tmp_path / 'generated'
+    result = writer({'Class1.cs': 'class', 'Main.cs': 'main'}, output_dir=str(output_dir))
+    assert result == WriterOutput(written=['Class1.cs', 'Main.cs'], skipped=[])
+    assert (output_dir / 'Class1.cs').read_text() == 'class'
+    assert (output_dir / 'Main.cs').read_text() == 'main'
+
+
+def test_writer_skips_unchanged_files(tmp_path):
+    writer({'Class1.cs': 'class', 'Main.cs': 'main'}, output_dir=str(tmp_path))
+    os.utime(tmp_path / 'Class1.cs', (0, 0))
+    os.utime(tmp_path / 'Main.cs', (0, 0))
+
+    result = writer({'Class1.cs': 'class', 'Main.cs': 'main2'}, output_dir=str(tmp_path))
+
+    assert result == WriterOutput(written=['Main.cs'], skipped=['Class1.cs'])
+    assert os.path.getmtime(tmp_path / 'Class1.cs') == 0
+    assert (tmp_path / 'Main.cs').read_text() == 'main2'
+
+
+def test_writer_detects_same_size_changes(tmp_path):
+    writer({'Main.cs': 'aaaa'}, output_dir=str(tmp_path))
+    result = writer({'Main.cs': 'bbbb'}, output_dir=str(tmp_path))
+    assert result.written == ['Main.cs']
+    assert (tmp_path / 'Main.cs').read_text() == 'bbbb'
+
+
+def test_writer_no_op_rewrite(tmp_path):
+    file_map = {'Class1.cs': 'class', 'Main.cs': 'main'}
+    writer(file_map, output_dir=str(tmp_path))
+    assert writer(file_map, output_dir=str(tmp_path)).written == []
+    assert writer(file_map, output_dir=str(tmp_path), skip_unchanged=False).written == ['Class1.cs', 'Main.cs']
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+@pytest.mark.parametrize('atomic', [False, True])
+@pytest.mark.parametrize('fsync', FSYNC_POLICIES)
+def test_writer_modes(tmp_path, jobs, atomic, fsync):
+    file_map = {f'Class{i}.cs': f'class {i}' for i in range(20)}
+    result = writer(file_map, output_dir=str(tmp_path), jobs=jobs, atomic=atomic, fsync=fsync)
+    assert result.written == list(file_map)
+    assert sorted(os.listdir(tmp_path)) == sorted(file_map)
     for filename, content in file_map.items():
-        file_path = os.path.join(output_dir, filename)
-        with open(file_path, 'w') as file:
-            file.write(content)
+        assert (tmp_path / filename).read_text() == content
+
+
+def test_writer_atomic_failure_keeps_old_file(tmp_path, monkeypatch):
+    writer({'Main.cs': 'old'}, output_dir=str(tmp_path))
+
+    def failing_replace(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        writer({'Main.cs': 'new'}, output_dir=str(tmp_path), atomic=True)
+
+    assert os.listdir(tmp_path) == ['Main.cs']
+    assert (tmp_path / 'Main.cs').read_text() == 'old'
+
+
+@pytest.mark.parametrize('kwargs', [{'fsync': 'sometimes'}, {'jobs': 0}])
+def test_writer_invalid_options(tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        writer({'Main.cs': ''}, output_dir=str(tmp_path), **kwargs)
+
+
+def test_writer_manifest_removes_stale_files(tmp_path):
+    (tmp_path / 'notes.txt').write_text('not generated')
+    writer({'Class1.cs': 'a', 'Class2.cs': 'b', 'Main.cs': 'main'}, output_dir=str(tmp_path), manifest=True)
+
+    result = writer({'Class1.cs': 'a', 'Main.cs': 'main2'}, output_dir=str(tmp_path), manifest=True)
+
+    assert result == WriterOutput(written=['Main.cs'], skipped=['Class1.cs'], removed=['Class2.cs'])
+    assert sorted(os.listdir(tmp_path)) == sorted(['Class1.cs', 'Main.cs', 'notes.txt', MANIFEST_FILENAME])
+    manifest = read_manifest(str(tmp_path))
+    assert set(manifest) == {'Class1.cs', 'Main.cs'}
+    assert manifest['Main.cs']['size'] == len('main2')
+
+
+def test_writer_manifest_detects_external_changes(tmp_path):
+    writer({'Main.cs': 'main'}, output_dir=str(tmp_path), manifest=True)
+    (tmp_path / 'Main.cs').write_text('edit')
+
+    result = writer({'Main.cs': 'main'}, output_dir=str(tmp_path), manifest=True)
+
+    assert result.written == ['Main.cs']
+    assert (tmp_path / 'Main.cs').read_text() == 'main'
+
+
+def test_changed_files(tmp_path):
+    writer({'Class1.cs': 'a', 'Main.cs': 'main'}, output_dir=str(tmp_path), manifest=True)
+    assert changed_files({'Class1.cs': 'a', 'Class2.cs': 'b', 'Main.cs': 'main2'}, str(tmp_path)) == [
+        'Class2.cs',
+        'Main.cs',
+    ]
+
+
+def test_writer_ignores_broken_manifest(tmp_path):
+    (tmp_path / 'Class9.cs').write_text('old')
+    (tmp_path / MANIFEST_FILENAME).write_text('{"version": 1, "files": {"../Class9.cs": {}, "Class9.cs": {}')
+    result = writer({'Main.cs': 'main'}, output_dir=str(tmp_path), manifest=True)
+    assert result.removed == []
+    assert (tmp_path / 'Class9.cs').exists()
+
+
+@pytest.mark.parametrize(
+    'manifest',
+    [
+        '[]',
+        '{"version": 2, "files": {}}',
+        '{"version": 1, "files": []}',
+        '{"version": 1, "files": {"Main.cs": "abc"}}',
+        '{"version": 1, "files": {"Main.cs": {}, "Class1.cs": null}}',
+    ],
+)
+def test_read_manifest_rejects_invalid_structure(tmp_path, manifest):
+    (tmp_path / MANIFEST_FILENAME).write_text(manifest)
+    assert read_manifest(str(tmp_path)) == {}
+    assert changed_files({'Main.cs': 'main'}, str(tmp_path)) == ['Main.cs']
+    assert writer({'Main.cs': 'main'}, output_dir=str(tmp_path), manifest=True).written == ['Main.cs']
+
+
+def test_writer_manifest_stays_in_output_dir(tmp_path):
+    output_dir = tmp_path / 'generated'
+    output_dir.mkdir()
+    (tmp_path / 'outside.cs').write_text('keep')
+    (output_dir / MANIFEST_FILENAME).write_text('{"version": 1, "files": {"../outside.cs": {}}}')
+    result = writer({'Main.cs': 'main'}, output_dir=str(output_dir), manifest=True)
+    assert result.removed == []
+    assert (tmp_path / 'outside.cs').exists()
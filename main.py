@@ -1,11 +1,133 @@
+import sys
+
+from compiler.batch import batch_compiler, expand_inputs, is_batch_input
 from compiler.default import compiler
-from compiler.settings import Settings
+from compiler.models import BatchResult
+from compiler.settings import changed_options, load_settings
+
+# Options of the single file compilation that project mode has no use for
+PROJECT_UNSUPPORTED_OPTIONS = ('max_function', 'cache_dir', 'artifacts_dir', 'start_from')
+# Measurements of a single file compilation, the batch, project and watch modes do not report them
+MEASUREMENT_OPTIONS = ('stats', 'stats_memory', 'count_transitions', 'profile_dir', 'profile_allocations')
+# Options of the other modes that watch mode does not support
+WATCH_UNSUPPORTED_OPTIONS = ('project', 'jobs', 'artifacts_dir')
+# Options only adding to the stats report
+STATS_OPTIONS = ('stats_memory', 'count_transitions')
+
+
+def print_batch_result(result: BatchResult) -> None:
+    if result.error is not None:
+        print(f'{result.input_file}: Exception occurred: {result.error}', flush=True)
+    else:
+        print(f'{result.input_file}: {result.output} ({result.duration:.3f}s)', flush=True)
+
+
+def reject_options(settings, context: str, names: tuple[str, ...]) -> None:
+    options = changed_options(settings, names)
+    if options:
+        sys.exit(f'{", ".join(f"--{name}" for name in options)} cannot be used {context}')
+
+
+def exit_streaming_error(settings, result) -> None:
+    # A failed compilation returns None, the pipe reading the stream has to see it failed
+    if result is None and settings.output_dir == '-':
+        sys.exit(1)
 
 
 def main():
-    settings = Settings()
-    result = compiler(input_file=settings.input_file, output_dir=settings.output_dir, max_func=settings.max_function)
-    print(result)
+    # The modules of the other modes are only imported when they are used
+    settings = load_settings()
+    options = dict(
+        max_func=settings.max_function,
+        constant_pool=settings.constant_pool,
+        constant_pool_min_occurrences=settings.constant_pool_min_occurrences,
+        deduplicate=settings.deduplicate,
+        shared_base=settings.shared_base,
+        infer_types=settings.infer_types,
+        writer_jobs=settings.writer_jobs,
+        atomic_write=settings.atomic_write,
+        fsync=settings.fsync,
+        manifest=settings.manifest,
+        sink=settings.sink,
+        cache_dir=settings.cache_dir,
+        cache_max_size=settings.cache_max_size,
+        artifacts_dir=settings.artifacts_dir,
+        start_from=settings.start_from,
+        schema_lock=settings.schema_lock,
+    )
+    if settings.watch:
+        reject_options(settings, 'with --watch', WATCH_UNSUPPORTED_OPTIONS + MEASUREMENT_OPTIONS)
+        from compiler.watch import Watcher
+
+        watcher = Watcher([settings.input_file], settings.output_dir, on_result=print_batch_result, **options)
+        print(f'Watching {settings.input_file}, press Ctrl+C to stop', flush=True)
+        try:
+            watcher.run(interval=settings.watch_interval)
+        except KeyboardInterrupt:
+            pass
+        return
+    if settings.project:
+        reject_options(settings, 'with --project', PROJECT_UNSUPPORTED_OPTIONS + MEASUREMENT_OPTIONS)
+        from compiler.project import project_compiler
+
+        result = project_compiler(
+            expand_inputs([settings.input_file]),
+            settings.output_dir,
+            constant_pool=settings.constant_pool,
+            constant_pool_min_occurrences=settings.constant_pool_min_occurrences,
+            deduplicate=settings.deduplicate,
+            shared_base=settings.shared_base,
+            infer_types=settings.infer_types,
+            sink=settings.sink,
+            schema_lock=settings.schema_lock,
+            jobs=settings.writer_jobs,
+            atomic=settings.atomic_write,
+            fsync=settings.fsync,
+            manifest=settings.manifest,
+        )
+        exit_streaming_error(settings, result)
+        print(result, file=sys.stderr if settings.output_dir == '-' else sys.stdout)
+        return
+    if is_batch_input(settings.input_file):
+        reject_options(settings, 'with a batch of input files', MEASUREMENT_OPTIONS)
+        summary = batch_compiler(
+            [settings.input_file], settings.output_dir, jobs=settings.jobs, on_result=print_batch_result, **options
+        )
+        print(f'Compiled {summary.succeeded} files, {summary.failed} failed in {summary.duration:.3f}s')
+        if summary.failed:
+            sys.exit(1)
+        return
+    instrumentation = None
+    if settings.profile_dir is not None:
+        # The profiler would inflate the measured times
+        reject_options(settings, 'with --profile_dir', ('stats',))
+    else:
+        reject_options(settings, 'without --profile_dir', ('profile_allocations',))
+    if settings.stats is not None:
+        from compiler.instrumentation import Instrumentation
+
+        instrumentation = Instrumentation(
+            trace_memory=settings.stats_memory, count_transitions=settings.count_transitions
+        )
+    else:
+        reject_options(settings, 'without --stats', STATS_OPTIONS)
+    profiler = None
+    if settings.profile_dir is not None:
+        from compiler.profiling import StageProfiler
+
+        profiler = StageProfiler(settings.profile_dir, trace_allocations=settings.profile_allocations)
+    result = compiler(
+        input_file=settings.input_file,
+        output_dir=settings.output_dir,
+        instrumentation=instrumentation,
+        profiler=profiler,
+        **options,
+    )
+    exit_streaming_error(settings, result)
+    # Keep standard output clean when an archive is streamed to it
+    print(result, file=sys.stderr if settings.output_dir == '-' else sys.stdout)
+    if instrumentation is not None:
+        instrumentation.save(settings.stats)
 
 
 if __name__ == '__main__':